@@ -0,0 +1,92 @@
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '082a112a69a5'
+down_revision: Union[str, Sequence[str], None] = 'e1558a952693'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Уникальные частичные индексы не создадутся, если в данных уже есть
+    # дубликаты: оставляем у профиля только самую свежую активную сессию и поиск
+    op.execute(
+        """
+        UPDATE chat_roulette_sessions AS s
+        SET status = 'CANCELLED', ended_at = now(), end_reason = 'duplicate'
+        WHERE s.status = 'ACTIVE' AND EXISTS (
+            SELECT 1 FROM chat_roulette_sessions AS newer
+            WHERE newer.status = 'ACTIVE'
+              AND newer.created_at > s.created_at
+              AND (
+                  newer.profile1_id IN (s.profile1_id, s.profile2_id)
+                  OR newer.profile2_id IN (s.profile1_id, s.profile2_id)
+              )
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE chat_roulette_searches AS s
+        SET is_active = false
+        WHERE s.is_active AND EXISTS (
+            SELECT 1 FROM chat_roulette_searches AS newer
+            WHERE newer.is_active
+              AND newer.profile_id = s.profile_id
+              AND (newer.search_started_at, newer.id) > (s.search_started_at, s.id)
+        )
+        """
+    )
+
+    # CONCURRENTLY не блокирует запись в таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_chat_roulette_sessions_waiting_created_at',
+            'chat_roulette_sessions',
+            ['created_at', 'profile1_id'],
+            postgresql_where=sa.text("status = 'WAITING' AND profile2_id IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'uq_chat_roulette_sessions_active_profile1_id',
+            'chat_roulette_sessions',
+            ['profile1_id'],
+            unique=True,
+            postgresql_where=sa.text("status = 'ACTIVE'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'uq_chat_roulette_sessions_active_profile2_id',
+            'chat_roulette_sessions',
+            ['profile2_id'],
+            unique=True,
+            postgresql_where=sa.text("status = 'ACTIVE'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'uq_chat_roulette_searches_active_profile_id',
+            'chat_roulette_searches',
+            ['profile_id'],
+            unique=True,
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_room_participants_profile_id',
+            'room_participants',
+            ['profile_id'],
+            postgresql_concurrently=True,
+        )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_room_participants_profile_id', table_name='room_participants', postgresql_concurrently=True)
+        op.drop_index('uq_chat_roulette_searches_active_profile_id', table_name='chat_roulette_searches', postgresql_concurrently=True)
+        op.drop_index('uq_chat_roulette_sessions_active_profile2_id', table_name='chat_roulette_sessions', postgresql_concurrently=True)
+        op.drop_index('uq_chat_roulette_sessions_active_profile1_id', table_name='chat_roulette_sessions', postgresql_concurrently=True)
+        op.drop_index('ix_chat_roulette_sessions_waiting_created_at', table_name='chat_roulette_sessions', postgresql_concurrently=True)
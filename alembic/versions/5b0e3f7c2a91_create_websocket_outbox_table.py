@@ -0,0 +1,40 @@
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5b0e3f7c2a91'
+down_revision: Union[str, Sequence[str], None] = '082a112a69a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'websocket_outbox',
+        sa.Column('id', sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column('target', sa.String(length=20), nullable=False),
+        sa.Column('method', sa.String(length=64), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('dispatched_at', sa.DateTime(timezone=True), nullable=True),
+    )
+
+    op.create_index('ix_websocket_outbox_created_at', 'websocket_outbox', ['created_at'])
+    op.create_index(
+        'ix_websocket_outbox_pending',
+        'websocket_outbox',
+        ['id'],
+        postgresql_where=sa.text("dispatched_at IS NULL"),
+    )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_websocket_outbox_pending', table_name='websocket_outbox')
+    op.drop_index('ix_websocket_outbox_created_at', table_name='websocket_outbox')
+
+    op.drop_table('websocket_outbox')
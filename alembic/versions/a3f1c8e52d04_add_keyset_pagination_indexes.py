@@ -0,0 +1,33 @@
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f1c8e52d04'
+down_revision: Union[str, Sequence[str], None] = '9c4d2e6f1b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset-пагинация сортирует по (created_at, id): без составного индекса
+    # каждая страница требует полного сканирования и сортировки таблицы
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_created_at_id',
+            'users',
+            ['created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_profiles_created_at_id',
+            'profiles',
+            ['created_at', 'id'],
+            postgresql_concurrently=True,
+        )
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_profiles_created_at_id', table_name='profiles', postgresql_concurrently=True)
+        op.drop_index('ix_users_created_at_id', table_name='users', postgresql_concurrently=True)
@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from fastapi import Depends, Header
+from fastapi import Depends, Header, Query
 
 from app.core.auth import decode_jwt, oauth2_scheme
 from app.core.config import settings
@@ -17,20 +17,20 @@ from app.services import (
 )
 from app.services.websocket.chat_roulette import WebSocketChatRouletteService
 from app.services.websocket.room import WebSocketRoomService
-from app.utils.object_storage import ObjectStorageService
+from app.utils.interest_catalog import interest_catalog
+from app.utils.object_storage import ObjectStorageService, object_storage_service
 
 
 async def get_unit_of_work() -> UnitOfWork:
     return UnitOfWork()
 
 
+async def get_read_only_unit_of_work() -> UnitOfWork:
+    return UnitOfWork(read_only=True)
+
+
 async def get_object_storage_service() -> ObjectStorageService:
-    return ObjectStorageService(
-        endpoint_url=settings.S3_ENDPOINT_URL,
-        access_key_id=settings.S3_ACCESS_KEY_ID,
-        secret_access_key=settings.S3_SECRET_ACCESS_KEY,
-        bucket_name=settings.S3_BUCKET_NAME,
-    )
+    return object_storage_service
 
 
 async def get_websocket_room_service() -> WebSocketRoomService:
@@ -53,9 +53,9 @@ async def get_profile_service(
 
 
 async def get_interest_service(
-    uow: UnitOfWork = Depends(get_unit_of_work),
+    uow: UnitOfWork = Depends(get_read_only_unit_of_work),
 ) -> InterestService:
-    return InterestService(uow)
+    return InterestService(uow, interest_catalog)
 
 
 async def get_room_service(
@@ -102,3 +102,13 @@ async def get_current_profile(
 
 async def get_accept_language(accept_language: str = Header(default="en")):
     return accept_language
+
+
+async def get_avatar_variant(
+    avatar_size: int = Query(settings.AVATAR_DEFAULT_SIZE, ge=1, le=4096),
+    avatar_format: str = Query(settings.AVATAR_DEFAULT_FORMAT, pattern="^(webp|jpg)$"),
+) -> str:
+    # Берётся ближайший хранимый размер не меньше запрошенного
+    sizes = sorted(settings.AVATAR_SIZES)
+    size = next((size for size in sizes if size >= avatar_size), sizes[-1])
+    return f"{size}.{avatar_format}"
@@ -3,4 +3,5 @@ from app.api.endpoints.chat_roulette import chat_roulette_router
 from app.api.endpoints.interests import interests_router
 from app.api.endpoints.profiles import profiles_router
 from app.api.endpoints.rooms import rooms_router
+from app.api.endpoints.storage import storage_router
 from app.api.endpoints.users import users_router
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Response, status
 
 from app.api.dependencies import (
     get_accept_language,
@@ -10,22 +10,50 @@ from app.services.interest import InterestService
 interests_router = APIRouter(prefix="/interests", tags=["Интересы"])
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # Для If-None-Match используется слабое сравнение: префикс W/ игнорируется
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
 @interests_router.get("/", response_model=list[InterestResponse])
 async def get_interests(
     interest_service: InterestService = Depends(get_interest_service),
     accept_language: str = Depends(get_accept_language),
-) -> list[InterestResponse]:
+    if_none_match: str | None = Header(default=None),
+) -> Response:
     """
     Возвращает список всех интересов с локализованными названиями.
 
+    Ответ берётся из каталога в памяти уже сериализованным и снабжается
+    ETag: если клиент передал его в `If-None-Match`, возвращается 304
+    без тела.
+
     Args:
         interest_service: Сервис для работы с интересами (инъекция зависимости)
         accept_language: Код языка для локализации (например, 'ru', 'en')
+        if_none_match: ETag ранее полученного ответа
 
     Returns:
-        list[InterestResponse]: Список интересов с переведёнными названиями
+        Response: Список интересов с переведёнными названиями или 304
     """
-    return await interest_service.get_interests(accept_language)
+    interests = await interest_service.get_interests(accept_language)
+    headers = {
+        "ETag": interests.etag,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Language",
+    }
+
+    if _etag_matches(if_none_match, interests.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(interests.body, media_type="application/json", headers=headers)
 
 
 @interests_router.post("/batch", response_model=list[InterestResponse])
@@ -33,18 +61,19 @@ async def get_interests_batch(
     interest_batch: InterestBatch,
     interest_service: InterestService = Depends(get_interest_service),
     accept_language: str = Depends(get_accept_language),
-) -> list[InterestResponse]:
+) -> Response:
     """
     Возвращает список интересов по переданным идентификаторам с локализованными названиями.
 
     Args:
-        request: Тело запроса со списком interest_ids
+        interest_batch: Тело запроса со списком interest_ids
         interest_service: Сервис работы с интересами (инъекция зависимости)
         accept_language: Код языка для локализации (например, 'ru', 'en')
 
     Returns:
-        list[InterestResponse]: Список интересов с переведёнными названиями
+        Response: Список интересов с переведёнными названиями
     """
-    return await interest_service.get_interests_by_ids(
+    body = await interest_service.get_interests_by_ids(
         interest_batch.interest_ids, accept_language
     )
+    return Response(body, media_type="application/json")
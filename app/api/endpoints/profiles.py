@@ -1,10 +1,11 @@
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, UploadFile, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, File, Query, Response, UploadFile, status
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.api.dependencies import (
     get_accept_language,
+    get_avatar_variant,
     get_current_profile,
     get_current_user,
     get_profile_service,
@@ -27,20 +28,62 @@ profiles_router = APIRouter(prefix="/profiles", tags=["Профили"])
 
 @profiles_router.get("/", response_model=list[ProfileResponse])
 async def get_profiles(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, max_length=200),
+    avatar_variant: str = Depends(get_avatar_variant),
     profile_service: ProfileService = Depends(get_profile_service),
     _: UUID = Depends(get_current_user),
 ) -> list[ProfileResponse]:
     """
-    Возвращает список всех профилей в системе.
+    Возвращает страницу профилей в системе.
 
     Args:
+        response: Ответ, в заголовок которого записывается курсор следующей страницы
+        limit: Максимальное количество профилей на странице
+        cursor: Курсор из заголовка `X-Next-Cursor` предыдущего ответа
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         profile_service: Сервис для управления профилями (инъекция зависимости)
         _: Идентификатор текущего пользователя (требуется аутентификация)
 
     Returns:
         list[ProfileResponse]: Список профилей с аватарками
+
+    Notes:
+        - Если есть следующая страница, её курсор возвращается в заголовке `X-Next-Cursor`.
+    """
+    profiles, next_cursor = await profile_service.get_profiles(
+        limit, cursor, avatar_variant
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return profiles
+
+
+@profiles_router.get("/export", response_class=StreamingResponse)
+async def export_profiles(
+    profile_service: ProfileService = Depends(get_profile_service),
+    _: UUID = Depends(get_current_user),
+) -> StreamingResponse:
+    """
+    Выгружает все профили в формате NDJSON (один JSON-объект на строку).
+
+    Args:
+        profile_service: Сервис для управления профилями (инъекция зависимости)
+        _: Идентификатор текущего пользователя (требуется аутентификация)
+
+    Returns:
+        StreamingResponse: Поток профилей с аватарками
+
+    Notes:
+        - Строки отправляются по мере чтения из базы, объём памяти не зависит от числа профилей.
     """
-    return await profile_service.get_profiles()
+
+    async def generate_lines():
+        async for profile in profile_service.stream_profiles():
+            yield profile.model_dump_json() + "\n"
+
+    return StreamingResponse(generate_lines(), media_type="application/x-ndjson")
 
 
 @profiles_router.post(
@@ -72,6 +115,7 @@ async def create_profile(
 
 @profiles_router.get("/me", response_model=list[ProfileResponse])
 async def get_user_profiles(
+    avatar_variant: str = Depends(get_avatar_variant),
     profile_service: ProfileService = Depends(get_profile_service),
     user_id: UUID = Depends(get_current_user),
 ) -> list[ProfileResponse]:
@@ -79,17 +123,19 @@ async def get_user_profiles(
     Возвращает все профили, принадлежащие текущему пользователю.
 
     Args:
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         profile_service: Сервис для управления профилями (инъекция зависимости)
         user_id: Идентификатор текущего пользователя (инъекция зависимости)
 
     Returns:
         list[ProfileResponse]: Список профилей пользователя
     """
-    return await profile_service.get_user_profiles(user_id)
+    return await profile_service.get_user_profiles(user_id, avatar_variant)
 
 
 @profiles_router.get("/current", response_model=ProfileResponse)
 async def get_current_profile_by_token(
+    avatar_variant: str = Depends(get_avatar_variant),
     user_profile: UserProfile = Depends(get_current_profile),
     profile_service: ProfileService = Depends(get_profile_service),
 ) -> ProfileResponse:
@@ -97,18 +143,22 @@ async def get_current_profile_by_token(
     Возвращает текущий профиль пользователя по токену.
 
     Args:
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         user_profile: Текущий профиль пользователя (инъекция зависимости)
         profile_service: Сервис для управления профилями (инъекция зависимости)
 
     Returns:
         ProfileResponse: Данные текущего профиля пользователя
     """
-    return await profile_service.get_profile(profile_id=user_profile.profile_id)
+    return await profile_service.get_profile(
+        profile_id=user_profile.profile_id, avatar_variant=avatar_variant
+    )
 
 
 @profiles_router.post("/batch", response_model=list[ProfileResponse])
 async def get_profiles_batch(
     profile_batch: ProfileBatch,
+    avatar_variant: str = Depends(get_avatar_variant),
     profile_service: ProfileService = Depends(get_profile_service),
     _: UUID = Depends(get_current_user),
 ) -> list[ProfileResponse]:
@@ -117,18 +167,22 @@ async def get_profiles_batch(
 
     Args:
         profile_batch: Тело запроса со списком profile_ids
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         profile_service: Сервис профилей
         _: Текущий пользователь (требуется аутентификация)
 
     Returns:
         list[ProfileResponse]: Список профилей с URL аватарок
     """
-    return await profile_service.get_profiles_by_ids(profile_batch.profile_ids)
+    return await profile_service.get_profiles_by_ids(
+        profile_batch.profile_ids, avatar_variant
+    )
 
 
 @profiles_router.get("/by-id/{profile_id}", response_model=ProfileResponse)
 async def get_profile_by_id(
     profile_id: UUID,
+    avatar_variant: str = Depends(get_avatar_variant),
     profile_service: ProfileService = Depends(get_profile_service),
     _: UUID = Depends(get_current_user),
 ) -> ProfileResponse:
@@ -137,18 +191,20 @@ async def get_profile_by_id(
 
     Args:
         profile_id: UUID профиля
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         profile_service: Сервис профилей
         _: Текущий пользователь (требуется аутентификация)
 
     Returns:
         ProfileResponse: Данные профиля с URL аватарки
     """
-    return await profile_service.get_profile(profile_id)
+    return await profile_service.get_profile(profile_id, avatar_variant)
 
 
 @profiles_router.patch("/me", response_model=ProfileResponse)
 async def update_profile(
     profile_update: ProfileUpdate,
+    avatar_variant: str = Depends(get_avatar_variant),
     profile_service: ProfileService = Depends(get_profile_service),
     user_profile: UserProfile = Depends(get_current_profile),
 ) -> ProfileResponse:
@@ -157,13 +213,16 @@ async def update_profile(
 
     Args:
         profile_update: Данные для обновления (биография, интересы и др.)
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         profile_service: Сервис для управления профилями (инъекция зависимости)
         user_profile: Текущий профиль пользователя (инъекция зависимости)
 
     Returns:
         ProfileResponse: Обновлённая информация о профиле
     """
-    return await profile_service.update_profile(user_profile.profile_id, profile_update)
+    return await profile_service.update_profile(
+        user_profile.profile_id, profile_update, avatar_variant
+    )
 
 
 @profiles_router.delete("/me")
@@ -188,6 +247,7 @@ async def delete_profile(
 @profiles_router.post("/me/avatar", response_model=ProfileAvatarResponse)
 async def upload_avatar_to_me(
     file: UploadFile = File(),
+    avatar_variant: str = Depends(get_avatar_variant),
     profile_service: ProfileService = Depends(get_profile_service),
     user_profile: UserProfile = Depends(get_current_profile),
 ) -> ProfileAvatarResponse:
@@ -196,6 +256,7 @@ async def upload_avatar_to_me(
 
     Args:
         file: Файл аватарки (ожидается изображение)
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         profile_service: Сервис для управления профилями (инъекция зависимости)
         user_profile: Текущий профиль пользователя (инъекция зависимости)
 
@@ -203,15 +264,13 @@ async def upload_avatar_to_me(
         ProfileAvatarResponse: URL загруженной аватарки
 
     Notes:
-        - Поддерживаются изображения до 5MB.
+        - Поддерживаются изображения до 5MB, файл читается по частям.
         - Возвращает предподписанный URL для доступа к аватарке.
     """
-    file_data = await file.read()
-
     return await profile_service.upload_avatar(
         profile_id=user_profile.profile_id,
-        file_data=file_data,
-        content_type=file.content_type,
+        file=file,
+        avatar_variant=avatar_variant,
     )
 
 
@@ -219,6 +278,7 @@ async def upload_avatar_to_me(
 async def upload_avatar_by_username(
     username: str,
     file: UploadFile = File(),
+    avatar_variant: str = Depends(get_avatar_variant),
     profile_service: ProfileService = Depends(get_profile_service),
     user_id: UUID = Depends(get_current_user),
 ) -> ProfileAvatarResponse:
@@ -228,6 +288,7 @@ async def upload_avatar_by_username(
     Args:
         username: Имя профиля
         file: Файл аватарки (ожидается изображение)
+        avatar_variant: Вариант аватарки в ответе (параметры `avatar_size` и `avatar_format`)
         profile_service: Сервис для управления профилями (инъекция зависимости)
         _: Идентификатор текущего пользователя (требуется аутентификация)
 
@@ -239,13 +300,11 @@ async def upload_avatar_by_username(
         UnsupportedMediaTypeError: Если файл не является изображением
         FileTooLargeError: Если размер файла превышает 5MB
     """
-    file_data = await file.read()
-
     return await profile_service.upload_avatar(
         username=username,
         user_id=user_id,
-        file_data=file_data,
-        content_type=file.content_type,
+        file=file,
+        avatar_variant=avatar_variant,
     )
 
 
@@ -0,0 +1,45 @@
+import time
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse
+
+from app.api.dependencies import get_object_storage_service
+from app.core.exceptions.object_storage import ObjectNotFoundError
+from app.utils.object_storage import LocalObjectStorageService, ObjectStorageService
+
+storage_router = APIRouter(prefix="/storage", tags=["Хранилище"])
+
+
+@storage_router.get("/{key:path}", response_class=FileResponse)
+async def get_stored_object(
+    key: str,
+    expires: int = Query(),
+    signature: str = Query(max_length=64),
+    oss: ObjectStorageService = Depends(get_object_storage_service),
+) -> FileResponse:
+    """
+    Отдаёт объект локального хранилища по подписанной ссылке
+    (см. `LocalObjectStorageService`).
+
+    Args:
+        key: Ключ объекта (например, 'users/{profile_id}/256.webp')
+        expires: Время истечения ссылки (Unix-время)
+        signature: Подпись ссылки
+        oss: Сервис объектного хранилища (инъекция зависимости)
+
+    Returns:
+        FileResponse: Содержимое объекта
+
+    Raises:
+        ObjectNotFoundError: Если хранилище не локальное, ссылка недействительна
+            или истекла, или объекта нет
+    """
+    if not isinstance(oss, LocalObjectStorageService):
+        raise ObjectNotFoundError(key)
+
+    path = oss.resolve_signed_key(key, expires, signature)
+    if path is None:
+        raise ObjectNotFoundError(key)
+
+    max_age = max(expires - int(time.time()), 0)
+    return FileResponse(path, headers={"Cache-Control": f"private, max-age={max_age}"})
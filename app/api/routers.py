@@ -6,8 +6,10 @@ from app.api.endpoints import (
     interests_router,
     profiles_router,
     rooms_router,
+    storage_router,
     users_router,
 )
+from app.api.websockets.gateway import ws_gateway_router
 from app.api.websockets.room_chat import ws_rooms_router
 from app.api.websockets.roulette_chat import ws_chat_roulette_router
 
@@ -20,6 +22,8 @@ api_router.include_router(profiles_router)
 api_router.include_router(interests_router)
 api_router.include_router(rooms_router)
 api_router.include_router(chat_roulette_router)
+api_router.include_router(storage_router)
 
 ws_router.include_router(ws_rooms_router)
 ws_router.include_router(ws_chat_roulette_router)
+ws_router.include_router(ws_gateway_router)
@@ -0,0 +1,82 @@
+import asyncio
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+
+from app.api.websockets.gateway_connection import GatewayConnection
+from app.api.websockets.heartbeat import websocket_heartbeat
+from app.api.websockets.protocol import negotiate_protocol
+from app.core.logger import app_logger
+from app.core.websocket.auth import authenticate_websocket
+from app.core.websocket.gateway_events import GatewayEventType
+
+ws_gateway_router = APIRouter(tags=["WebSocket: Шлюз"])
+
+
+@ws_gateway_router.websocket("/gateway")
+async def websocket_gateway(
+    websocket: WebSocket,
+    token: str = Query(...),
+):
+    """
+    Единый WebSocket-шлюз для каналов комнат и чат-рулетки.
+
+    Heartbeat учитывает только кадры клиента: без подписок и сообщений
+    клиент всё равно отправляет `{"type": "ping"}` не реже раза
+    в `WS_HEARTBEAT_INTERVAL_SECONDS` (см. `WebSocketHeartbeat`).
+    """
+    app_logger.info("Попытка подключения WebSocket к шлюзу")
+    websocket = negotiate_protocol(websocket)
+
+    auth_result = await authenticate_websocket(websocket, token)
+    if not auth_result:
+        return
+
+    _, profile_id = auth_result
+
+    connection = GatewayConnection(websocket, profile_id)
+
+    try:
+        await websocket.accept()
+        await connection.send_event(
+            GatewayEventType.CONNECTION_ESTABLISHED,
+            {
+                "profile_id": str(profile_id),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+
+        websocket_heartbeat.register(websocket, connection.send_ping)
+
+        app_logger.info(f"Профиль {profile_id} подключился к шлюзу WebSocket")
+
+        while True:
+            try:
+                data = await websocket.receive_json()
+                websocket_heartbeat.touch(websocket)
+            except WebSocketDisconnect:
+                app_logger.info(f"WebSocket шлюза отключен: профиль={profile_id}")
+                break
+            except Exception as e:
+                app_logger.error(f"Ошибка получения сообщения WebSocket шлюза: {e}")
+                break
+
+            if not isinstance(data, dict):
+                await connection.send_event(
+                    GatewayEventType.ERROR, {"message": "Frame must be a JSON object"}
+                )
+                continue
+
+            await connection.handle_frame(data)
+
+    except WebSocketDisconnect:
+        app_logger.info(f"WebSocket шлюза отключен: профиль={profile_id}")
+    except asyncio.CancelledError:
+        if not websocket_heartbeat.consume_reaped(websocket):
+            raise
+        app_logger.info(f"WebSocket шлюза закрыт по heartbeat: профиль={profile_id}")
+    except Exception as e:
+        app_logger.error(f"Непредвиденная ошибка WebSocket шлюза: {e}")
+    finally:
+        websocket_heartbeat.unregister(websocket)
+        await connection.close()
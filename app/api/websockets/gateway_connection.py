@@ -0,0 +1,383 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from fastapi import WebSocket
+
+from app.api.websockets.protocol import BroadcastMessage
+from app.api.websockets.room_chat import validate_room_access
+from app.api.websockets.room_connection_manager import room_connection_manager
+from app.api.websockets.room_handlers import RoomWebSocketHandler
+from app.api.websockets.roulette_chat import validate_session_access
+from app.api.websockets.roulette_connection_manager import roulette_connection_manager
+from app.api.websockets.roulette_handlers import ChatRouletteWebSocketHandler
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.core.websocket.chat_roulette_events import (
+    ChatRouletteEventType,
+    ChatRouletteWebSocketMessage,
+)
+from app.core.websocket.gateway_events import GatewayEventType, GatewayWebSocketMessage
+from app.core.websocket.room_events import RoomEventType, RoomWebSocketMessage
+
+ROOM_CHANNEL = "room"
+ROULETTE_CHANNEL = "roulette"
+
+
+def parse_channel(channel: Any) -> tuple[str, UUID]:
+    if not isinstance(channel, str) or ":" not in channel:
+        raise ValueError("Invalid channel format, expected '<kind>:<id>'")
+
+    kind, _, raw_id = channel.partition(":")
+    if kind not in (ROOM_CHANNEL, ROULETTE_CHANNEL):
+        raise ValueError(f"Unknown channel kind: {kind}")
+
+    try:
+        return kind, UUID(raw_id)
+    except ValueError:
+        raise ValueError("Invalid channel id format")
+
+
+class ChannelWebSocket:
+    """
+    Канал мультиплексированного сокета, который менеджеры соединений
+    используют как обычный WebSocket.
+
+    Все события канала уходят в общий сокет клиента с полем `channel`,
+    а закрытие канала (например, при замене соединения) снимает подписку,
+    не закрывая сам сокет.
+    """
+
+    def __init__(self, connection: "GatewayConnection", channel: str):
+        self.connection = connection
+        self.channel = channel
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message: dict[str, Any] | BroadcastMessage):
+        # Поле channel у каждого канала своё, поэтому общий закодированный
+        # payload рассылки здесь не переиспользуется
+        if isinstance(message, BroadcastMessage):
+            message = message.message
+        await self.connection.send_json({**message, "channel": self.channel})
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        if self.connection.drop_subscription(self.channel, self):
+            await self.connection.send_event(
+                GatewayEventType.UNSUBSCRIBED,
+                {"reason": reason or "Channel closed"},
+                channel=self.channel,
+            )
+
+
+class ChannelSubscription:
+    def __init__(
+        self,
+        kind: str,
+        target_id: UUID,
+        websocket: ChannelWebSocket,
+        handler: RoomWebSocketHandler | ChatRouletteWebSocketHandler,
+    ):
+        self.kind = kind
+        self.target_id = target_id
+        self.websocket = websocket
+        self.handler = handler
+
+
+class GatewayConnection:
+    """
+    Один аутентифицированный сокет клиента, подписанный на набор каналов
+    комнат и сессии чат-рулетки.
+    """
+
+    def __init__(self, websocket: WebSocket, profile_id: UUID):
+        self.websocket = websocket
+        self.profile_id = profile_id
+        self.subscriptions: dict[str, ChannelSubscription] = {}
+        self._send_lock = asyncio.Lock()
+
+    async def send_json(self, message: dict[str, Any]):
+        async with self._send_lock:
+            await self.websocket.send_json(message)
+
+    async def send_event(
+        self,
+        event_type: GatewayEventType,
+        data: dict[str, Any],
+        channel: str | None = None,
+    ):
+        event = GatewayWebSocketMessage(
+            type=event_type,
+            data=data,
+            timestamp=datetime.now(timezone.utc),
+            channel=channel,
+        )
+        try:
+            await self.send_json(event.to_dict())
+        except Exception as e:
+            app_logger.error(
+                f"Ошибка отправки события шлюза профилю {self.profile_id}: {e}"
+            )
+
+    async def send_ping(self):
+        event = GatewayWebSocketMessage(
+            type=GatewayEventType.PING,
+            data={"timestamp": datetime.now(timezone.utc).isoformat()},
+            timestamp=datetime.now(timezone.utc),
+        )
+        await self.send_json(event.to_dict())
+
+    def drop_subscription(self, channel: str, websocket: ChannelWebSocket) -> bool:
+        subscription = self.subscriptions.get(channel)
+        if subscription is None or subscription.websocket is not websocket:
+            return False
+
+        del self.subscriptions[channel]
+        return True
+
+    async def handle_frame(self, data: dict[str, Any]):
+        action = data.get("action")
+        channel = data.get("channel")
+
+        try:
+            if action == "subscribe":
+                await self.subscribe(channel, data.get("last_seq"))
+            elif action == "unsubscribe":
+                await self.unsubscribe(channel)
+            elif action is not None:
+                raise ValueError(f"Unknown action: {action}")
+            elif channel is not None:
+                await self.handle_channel_message(channel, data)
+            elif data.get("type") == "ping":
+                await self.send_event(
+                    GatewayEventType.PONG,
+                    {"timestamp": datetime.now(timezone.utc).isoformat()},
+                )
+            else:
+                raise ValueError("Frame must contain either action or channel")
+
+        except ValueError as e:
+            app_logger.warning(f"Ошибка валидации сообщения шлюза: {e}")
+            await self.send_event(
+                GatewayEventType.ERROR,
+                {"message": str(e)},
+                channel=channel if isinstance(channel, str) else None,
+            )
+
+        except Exception as e:
+            app_logger.error(f"Ошибка обработки сообщения шлюза: {e}")
+            await self.send_event(
+                GatewayEventType.ERROR,
+                {"message": "Internal server error"},
+                channel=channel if isinstance(channel, str) else None,
+            )
+
+    async def subscribe(self, channel: Any, last_seq: Any = None):
+        kind, target_id = parse_channel(channel)
+
+        if last_seq is not None and (
+            not isinstance(last_seq, int) or isinstance(last_seq, bool)
+        ):
+            raise ValueError("last_seq must be an integer")
+
+        if channel in self.subscriptions:
+            raise ValueError("Already subscribed to this channel")
+
+        if len(self.subscriptions) >= settings.WS_GATEWAY_MAX_SUBSCRIPTIONS:
+            raise ValueError("Too many subscriptions for one connection")
+
+        websocket = ChannelWebSocket(self, channel)
+
+        if kind == ROOM_CHANNEL:
+            if not await validate_room_access(target_id, self.profile_id):
+                raise ValueError("No access to the room")
+
+            handler = RoomWebSocketHandler(target_id, self.profile_id)
+            self.subscriptions[channel] = ChannelSubscription(
+                kind, target_id, websocket, handler
+            )
+            await self.send_event(GatewayEventType.SUBSCRIBED, {}, channel=channel)
+
+            await room_connection_manager.connect(target_id, self.profile_id, websocket)
+            connection_event = await handler.create_connection_event()
+            await websocket.send_json(connection_event.to_dict())
+
+            if last_seq is not None:
+                await room_connection_manager.replay(
+                    target_id, self.profile_id, last_seq
+                )
+
+        else:
+            if not await validate_session_access(target_id, self.profile_id):
+                raise ValueError("No access to the session")
+
+            handler = ChatRouletteWebSocketHandler(target_id, self.profile_id)
+            self.subscriptions[channel] = ChannelSubscription(
+                kind, target_id, websocket, handler
+            )
+            await self.send_event(GatewayEventType.SUBSCRIBED, {}, channel=channel)
+
+            await roulette_connection_manager.connect(
+                target_id, self.profile_id, websocket
+            )
+            connection_event = await handler.create_connection_event()
+            await websocket.send_json(connection_event.to_dict())
+            await self._notify_roulette_partner(
+                target_id, ChatRouletteEventType.PARTNER_CONNECTED, notify_self=True
+            )
+
+        app_logger.info(
+            f"Профиль {self.profile_id} подписан на канал {channel} через шлюз"
+        )
+
+    async def unsubscribe(self, channel: Any, reason: str = "Unsubscribed"):
+        parse_channel(channel)
+
+        subscription = self.subscriptions.pop(channel, None)
+        if subscription is None:
+            raise ValueError("Not subscribed to this channel")
+
+        await self._release(subscription)
+        await self.send_event(
+            GatewayEventType.UNSUBSCRIBED, {"reason": reason}, channel=channel
+        )
+
+        app_logger.info(f"Профиль {self.profile_id} отписан от канала {channel}")
+
+    async def handle_channel_message(self, channel: Any, data: dict[str, Any]):
+        parse_channel(channel)
+
+        subscription = self.subscriptions.get(channel)
+        if subscription is None:
+            raise ValueError("Not subscribed to this channel")
+
+        if not self._is_registered(subscription):
+            del self.subscriptions[channel]
+            await self.send_event(
+                GatewayEventType.UNSUBSCRIBED,
+                {"reason": "Channel closed"},
+                channel=channel,
+            )
+            return
+
+        if subscription.kind == ROOM_CHANNEL:
+            await self._handle_room_message(subscription, data)
+        else:
+            await self._handle_roulette_message(subscription, data)
+
+    async def close(self):
+        subscriptions = list(self.subscriptions.values())
+        self.subscriptions.clear()
+
+        for subscription in subscriptions:
+            try:
+                await self._release(subscription)
+            except Exception as e:
+                app_logger.error(
+                    f"Ошибка освобождения канала {subscription.websocket.channel}: {e}"
+                )
+
+    async def _handle_room_message(
+        self, subscription: ChannelSubscription, data: dict[str, Any]
+    ):
+        try:
+            response_event = await subscription.handler.handle_message(data)
+
+            if response_event.type == RoomEventType.PONG:
+                await subscription.websocket.send_json(response_event.to_dict())
+            elif response_event.type in [
+                RoomEventType.TYPING_STARTED,
+                RoomEventType.TYPING_STOPPED,
+            ]:
+                await room_connection_manager.broadcast(
+                    response_event.to_dict(),
+                    subscription.target_id,
+                    exclude_profile_id=self.profile_id,
+                )
+
+        except ValueError as e:
+            app_logger.warning(f"Ошибка валидации WebSocket сообщения: {e}")
+            error_event = RoomWebSocketMessage(
+                type=RoomEventType.ERROR,
+                data={"message": str(e)},
+                timestamp=datetime.now(timezone.utc),
+            )
+            await subscription.websocket.send_json(error_event.to_dict())
+
+    async def _handle_roulette_message(
+        self, subscription: ChannelSubscription, data: dict[str, Any]
+    ):
+        try:
+            response_event = await subscription.handler.handle_message(data)
+
+            if response_event.type == ChatRouletteEventType.PONG:
+                await subscription.websocket.send_json(response_event.to_dict())
+
+        except ValueError as e:
+            app_logger.warning(f"Ошибка валидации WebSocket сообщения: {e}")
+            error_event = ChatRouletteWebSocketMessage(
+                type=ChatRouletteEventType.ERROR,
+                data={"message": str(e)},
+                timestamp=datetime.now(timezone.utc),
+            )
+            await subscription.websocket.send_json(error_event.to_dict())
+
+    def _is_registered(self, subscription: ChannelSubscription) -> bool:
+        if subscription.kind == ROOM_CHANNEL:
+            manager = room_connection_manager
+        else:
+            manager = roulette_connection_manager
+
+        return (
+            manager.get_connection(subscription.target_id, self.profile_id)
+            is subscription.websocket
+        )
+
+    async def _release(self, subscription: ChannelSubscription):
+        if not self._is_registered(subscription):
+            return
+
+        if subscription.kind == ROOM_CHANNEL:
+            await room_connection_manager.disconnect(
+                subscription.target_id, self.profile_id
+            )
+        else:
+            await self._notify_roulette_partner(
+                subscription.target_id, ChatRouletteEventType.PARTNER_DISCONNECTED
+            )
+            roulette_connection_manager.disconnect(
+                subscription.target_id, self.profile_id
+            )
+
+    async def _notify_roulette_partner(
+        self,
+        session_id: UUID,
+        event_type: ChatRouletteEventType,
+        notify_self: bool = False,
+    ):
+        partner_profile_id = roulette_connection_manager.get_partner_profile_id(
+            session_id, self.profile_id
+        )
+        if not partner_profile_id:
+            return
+
+        event = ChatRouletteWebSocketMessage(
+            type=event_type,
+            data={
+                "partner_profile_id": str(partner_profile_id),
+                "session_id": str(session_id),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+            timestamp=datetime.now(timezone.utc),
+            session_id=session_id,
+            sender_profile_id=self.profile_id,
+        )
+        await roulette_connection_manager.send_personal_message(
+            event.to_dict(), session_id, partner_profile_id
+        )
+        if notify_self:
+            await roulette_connection_manager.send_personal_message(
+                event.to_dict(), session_id, self.profile_id
+            )
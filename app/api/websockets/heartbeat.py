@@ -0,0 +1,163 @@
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from fastapi import WebSocket, status
+
+from app.core.config import settings
+from app.core.logger import app_logger
+
+
+class HeartbeatEntry:
+    __slots__ = ("websocket", "send_ping", "task", "last_seen", "slot", "reaped")
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        send_ping: Callable[[], Awaitable[None]],
+        task: asyncio.Task | None,
+        slot: int,
+    ):
+        self.websocket = websocket
+        self.send_ping = send_ping
+        self.task = task
+        self.last_seen = time.monotonic()
+        self.slot = slot
+        self.reaped = False
+
+
+class WebSocketHeartbeat:
+    """
+    Единый планировщик heartbeat для всех WebSocket-соединений процесса.
+
+    Соединения распределяются по слотам колеса, за один тик обходится один слот,
+    так что каждое соединение проверяется раз в `ping_interval` секунд.
+    Простаивающим соединениям отправляется ping, а соединения без входящих
+    кадров дольше `idle_timeout` или с ошибкой отправки закрываются пачкой:
+    задача обработчика отменяется, и он освобождает место в менеджерах.
+
+    Активность отмечается только входящими кадрами (`touch`): отправленный
+    ping её не продлевает, поэтому клиент, который только слушает, должен
+    сам отправлять кадр (например, `{"type": "ping"}`) раз в `ping_interval`.
+    """
+
+    def __init__(self, ping_interval: float, idle_timeout: float, slots: int):
+        self.ping_interval = ping_interval
+        self.idle_timeout = idle_timeout
+        self.slots = slots
+        self._wheel: list[dict[int, HeartbeatEntry]] = [{} for _ in range(slots)]
+        self._entries: dict[int, HeartbeatEntry] = {}
+        self._next_slot = 0
+        self._cursor = 0
+        self.reaped_total = 0
+
+    def register(
+        self, websocket: WebSocket, send_ping: Callable[[], Awaitable[None]]
+    ) -> None:
+        slot = self._next_slot
+        self._next_slot = (self._next_slot + 1) % self.slots
+
+        entry = HeartbeatEntry(websocket, send_ping, asyncio.current_task(), slot)
+        self._entries[id(websocket)] = entry
+        self._wheel[slot][id(websocket)] = entry
+
+    def unregister(self, websocket: WebSocket) -> None:
+        entry = self._entries.pop(id(websocket), None)
+        if entry is not None:
+            self._wheel[entry.slot].pop(id(websocket), None)
+
+    def touch(self, websocket: WebSocket) -> None:
+        entry = self._entries.get(id(websocket))
+        if entry is not None:
+            entry.last_seen = time.monotonic()
+
+    def consume_reaped(self, websocket: WebSocket) -> bool:
+        """
+        Проверяет, что отмена задачи обработчика вызвана закрытием соединения
+        по heartbeat, и снимает эту отмену с текущей задачи.
+        """
+        entry = self._entries.get(id(websocket))
+        if entry is None or not entry.reaped:
+            return False
+
+        task = asyncio.current_task()
+        if task is not None:
+            task.uncancel()
+        return True
+
+    def get_stats(self) -> dict[str, int]:
+        return {"connections": len(self._entries), "reaped_total": self.reaped_total}
+
+    async def run(self):
+        tick = self.ping_interval / self.slots
+
+        try:
+            while True:
+                await asyncio.sleep(tick)
+                try:
+                    await self.sweep()
+                except Exception as e:
+                    app_logger.error(f"Ошибка обхода heartbeat WebSocket: {e}")
+
+        except asyncio.CancelledError:
+            app_logger.info("Задача heartbeat WebSocket отменена")
+            raise
+
+    async def sweep(self) -> int:
+        slot = self._wheel[self._cursor]
+        self._cursor = (self._cursor + 1) % self.slots
+
+        now = time.monotonic()
+        to_ping: list[HeartbeatEntry] = []
+        to_reap: list[HeartbeatEntry] = []
+
+        for entry in slot.values():
+            idle = now - entry.last_seen
+            if idle >= self.idle_timeout:
+                to_reap.append(entry)
+            elif idle >= self.ping_interval:
+                to_ping.append(entry)
+
+        if to_ping:
+            results = await asyncio.gather(
+                *(entry.send_ping() for entry in to_ping), return_exceptions=True
+            )
+            to_reap.extend(
+                entry
+                for entry, result in zip(to_ping, results)
+                if isinstance(result, Exception)
+            )
+
+        if to_reap:
+            await asyncio.gather(*(self._reap(entry) for entry in to_reap))
+            self.reaped_total += len(to_reap)
+            app_logger.info(
+                f"Heartbeat: закрыто {len(to_reap)} неактивных WebSocket-соединений, "
+                f"активных: {len(self._entries)}"
+            )
+
+        return len(to_reap)
+
+    async def _reap(self, entry: HeartbeatEntry):
+        entry.reaped = True
+        self._wheel[entry.slot].pop(id(entry.websocket), None)
+
+        try:
+            await asyncio.wait_for(
+                entry.websocket.close(
+                    code=status.WS_1001_GOING_AWAY, reason="Heartbeat timeout"
+                ),
+                timeout=5,
+            )
+        except Exception:
+            pass
+
+        if entry.task is not None and not entry.task.done():
+            entry.task.cancel()
+
+
+websocket_heartbeat = WebSocketHeartbeat(
+    ping_interval=settings.WS_HEARTBEAT_INTERVAL_SECONDS,
+    idle_timeout=settings.WS_HEARTBEAT_IDLE_TIMEOUT_SECONDS,
+    slots=settings.WS_HEARTBEAT_WHEEL_SLOTS,
+)
@@ -0,0 +1,177 @@
+import json
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+import msgpack
+from fastapi import WebSocket, WebSocketDisconnect
+
+MSGPACK_SUBPROTOCOL = "commonground.msgpack.v1"
+
+COMPACT_ENVELOPE_KEYS = {
+    "type": "t",
+    "data": "d",
+    "timestamp": "ts",
+    "seq": "q",
+    "channel": "c",
+    "room_id": "r",
+    "session_id": "s",
+    "sender_profile_id": "p",
+}
+
+DEDUPLICATED_ENVELOPE_KEYS = {"room_id", "session_id", "sender_profile_id"}
+
+
+class JsonCodec:
+    subprotocol = None
+
+    def encode(self, message: dict[str, Any]) -> str:
+        return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+    def decode(self, payload: bytes | str) -> Any:
+        return json.loads(payload)
+
+    async def send(self, websocket: WebSocket, payload: str):
+        await websocket.send_text(payload)
+
+
+class MessagePackCodec:
+    """
+    Компактное бинарное представление событий WebSocket.
+
+    Ключи конверта сокращаются по `COMPACT_ENVELOPE_KEYS`, пустые поля
+    конверта и идентификаторы, дублирующие одноимённые значения из `data`,
+    опускаются.
+    Идентификаторы (`id` и `*_id`) передаются 16 байтами, а отметки времени
+    (`timestamp` и `*_at`) — стандартным расширением MessagePack Timestamp.
+    """
+
+    subprotocol = MSGPACK_SUBPROTOCOL
+
+    def encode(self, message: dict[str, Any]) -> bytes:
+        return msgpack.packb(self.compact(message), datetime=True, use_bin_type=True)
+
+    def decode(self, payload: bytes | str) -> Any:
+        if isinstance(payload, str):
+            payload = payload.encode()
+        return msgpack.unpackb(payload, raw=False)
+
+    async def send(self, websocket: WebSocket, payload: bytes):
+        await websocket.send_bytes(payload)
+
+    @classmethod
+    def compact(cls, message: dict[str, Any]) -> dict[str, Any]:
+        data = message.get("data") or {}
+        compacted = {}
+
+        for key, value in message.items():
+            if value is None:
+                continue
+            if key in DEDUPLICATED_ENVELOPE_KEYS and data.get(key) == value:
+                continue
+            compacted[COMPACT_ENVELOPE_KEYS.get(key, key)] = cls._pack_value(key, value)
+
+        return compacted
+
+    @classmethod
+    def _pack_value(cls, key: str, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {
+                item_key: cls._pack_value(item_key, item_value)
+                for item_key, item_value in value.items()
+            }
+        if isinstance(value, list):
+            return [cls._pack_value(key, item) for item in value]
+        if not isinstance(value, str):
+            return value
+
+        if key == "id" or key.endswith("_id"):
+            try:
+                return UUID(value).bytes
+            except ValueError:
+                return value
+
+        if key == "timestamp" or key.endswith("_at"):
+            try:
+                parsed = datetime.fromisoformat(value)
+            except ValueError:
+                return value
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return parsed
+
+        return value
+
+
+class BroadcastMessage:
+    """
+    Событие, которое рассылается нескольким соединениям.
+
+    Кодируется не более одного раза для каждого кодека, и результат
+    переиспользуется для всех получателей с тем же форматом. Конверт
+    создаётся на одну рассылку: словарь события после этого не изменяется.
+    """
+
+    def __init__(self, message: dict[str, Any]):
+        self.message = message
+        self._payloads: dict[JsonCodec | MessagePackCodec, str | bytes] = {}
+
+    def encode(self, codec: JsonCodec | MessagePackCodec) -> str | bytes:
+        payload = self._payloads.get(codec)
+        if payload is None:
+            payload = self._payloads[codec] = codec.encode(self.message)
+        return payload
+
+
+class EventWebSocket:
+    """
+    WebSocket с кодеком, выбранным при согласовании подпротокола.
+
+    Менеджеры соединений и обработчики работают с ним так же, как с обычным
+    `WebSocket`: `send_json` и `receive_json` прозрачно используют выбранный
+    формат, остальные атрибуты делегируются исходному соединению.
+    """
+
+    def __init__(self, websocket: WebSocket, codec: JsonCodec | MessagePackCodec):
+        self.websocket = websocket
+        self.codec = codec
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.websocket, name)
+
+    async def accept(self):
+        await self.websocket.accept(subprotocol=self.codec.subprotocol)
+
+    async def send_json(self, message: dict[str, Any] | BroadcastMessage):
+        if isinstance(message, BroadcastMessage):
+            payload = message.encode(self.codec)
+        else:
+            payload = self.codec.encode(message)
+        await self.codec.send(self.websocket, payload)
+
+    async def receive_json(self) -> Any:
+        message = await self.websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message["code"], message.get("reason"))
+
+        payload = message.get("bytes")
+        if payload is None:
+            payload = message.get("text")
+        return self.codec.decode(payload)
+
+    async def close(self, code: int = 1000, reason: str | None = None):
+        await self.websocket.close(code=code, reason=reason)
+
+
+_json_codec = JsonCodec()
+_msgpack_codec = MessagePackCodec()
+
+
+def negotiate_protocol(websocket: WebSocket) -> EventWebSocket:
+    """
+    Выбирает формат событий по заголовку `Sec-WebSocket-Protocol`.
+    Клиенты без подпротокола продолжают получать JSON.
+    """
+    if MSGPACK_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+        return EventWebSocket(websocket, _msgpack_codec)
+    return EventWebSocket(websocket, _json_codec)
@@ -4,6 +4,8 @@ from uuid import UUID
 
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
 
+from app.api.websockets.heartbeat import websocket_heartbeat
+from app.api.websockets.protocol import negotiate_protocol
 from app.api.websockets.room_connection_manager import room_connection_manager
 from app.api.websockets.room_handlers import RoomWebSocketHandler
 from app.core.logger import app_logger
@@ -18,9 +20,9 @@ ws_rooms_router = APIRouter(tags=["WebSocket: Комнаты"])
 
 async def validate_room_access(room_id: UUID, profile_id: UUID) -> bool:
     try:
-        async with UnitOfWork() as uow:
+        async with UnitOfWork(read_only=True) as uow:
             wrs = WebSocketRoomService()
-            room_service = RoomService(UnitOfWork(), wrs)
+            room_service = RoomService(UnitOfWork(read_only=True), wrs)
 
             await room_service.get_room(room_id, profile_id)
 
@@ -49,8 +51,17 @@ async def websocket_room_chat(
     websocket: WebSocket,
     room_id: UUID,
     token: str = Query(...),
+    last_seq: int | None = Query(None),
 ):
+    """
+    WebSocket-чат комнаты.
+
+    Клиент должен отправлять кадр (хотя бы `{"type": "ping"}`) не реже раза
+    в `WS_HEARTBEAT_INTERVAL_SECONDS`, даже если только слушает комнату:
+    ping сервера активностью не считается (см. `WebSocketHeartbeat`).
+    """
     app_logger.info(f"Попытка подключения WebSocket к комнате {room_id}")
+    websocket = negotiate_protocol(websocket)
 
     auth_result = await authenticate_websocket(websocket, token)
     if not auth_result:
@@ -67,31 +78,34 @@ async def websocket_room_chat(
 
     handler = RoomWebSocketHandler(room_id, profile_id)
 
+    async def send_ping():
+        ping_event = RoomWebSocketMessage(
+            type=RoomEventType.PING,
+            data={"timestamp": datetime.now(timezone.utc).isoformat()},
+            timestamp=datetime.now(timezone.utc),
+        )
+        await websocket.send_json(ping_event.to_dict())
+
     try:
         await room_connection_manager.connect(room_id, profile_id, websocket)
+        websocket_heartbeat.register(websocket, send_ping)
 
         connection_event = await handler.create_connection_event()
         await room_connection_manager.send_personal_message(
             connection_event.to_dict(), room_id, profile_id
         )
 
+        if last_seq is not None:
+            await room_connection_manager.replay(room_id, profile_id, last_seq)
+
         app_logger.info(
             f"Профиль {profile_id} присоединился к комнате {room_id} через WebSocket"
         )
 
         while True:
             try:
-                data = await asyncio.wait_for(websocket.receive_json(), timeout=300)
-            except asyncio.TimeoutError:
-                ping_event = RoomWebSocketMessage(
-                    type=RoomEventType.PING,
-                    data={"timestamp": datetime.now(timezone.utc).isoformat()},
-                    timestamp=datetime.now(timezone.utc),
-                )
-                await room_connection_manager.send_personal_message(
-                    ping_event.to_dict(), room_id, profile_id
-                )
-                continue
+                data = await websocket.receive_json()
+                websocket_heartbeat.touch(websocket)
             except WebSocketDisconnect:
                 app_logger.info(
                     f"WebSocket отключен: профиль={profile_id}, комната={room_id}"
@@ -140,7 +154,14 @@ async def websocket_room_chat(
 
     except WebSocketDisconnect:
         app_logger.info(f"WebSocket отключен: профиль={profile_id}, комната={room_id}")
+    except asyncio.CancelledError:
+        if not websocket_heartbeat.consume_reaped(websocket):
+            raise
+        app_logger.info(
+            f"WebSocket закрыт по heartbeat: профиль={profile_id}, комната={room_id}"
+        )
     except Exception as e:
         app_logger.error(f"Непредвиденная ошибка WebSocket: {e}")
     finally:
+        websocket_heartbeat.unregister(websocket)
         await room_connection_manager.disconnect(room_id, profile_id)
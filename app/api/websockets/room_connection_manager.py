@@ -4,14 +4,22 @@ from uuid import UUID
 
 from fastapi import WebSocket
 
+from app.api.websockets.protocol import BroadcastMessage
+from app.api.websockets.room_replay_log import RoomReplayLog
+from app.core.config import settings
 from app.core.logger import app_logger
-from app.core.websocket.room_events import RoomEventType, RoomWebSocketMessage
+from app.core.websocket.room_events import (
+    EPHEMERAL_ROOM_EVENTS,
+    RoomEventType,
+    RoomWebSocketMessage,
+)
 
 
 class RoomConnectionManager:
     def __init__(self):
         self.active_connections: dict[UUID, dict[UUID, WebSocket]] = {}
         self.profile_rooms: dict[UUID, set[UUID]] = {}
+        self.replay_log = RoomReplayLog(settings.WS_ROOM_REPLAY_BUFFER_SIZE)
 
     async def connect(self, room_id: UUID, profile_id: UUID, websocket: WebSocket):
         await websocket.accept()
@@ -117,19 +125,23 @@ class RoomConnectionManager:
     async def broadcast(
         self, message: dict, room_id: UUID, exclude_profile_id: UUID = None
     ):
+        if message.get("type") not in EPHEMERAL_ROOM_EVENTS:
+            self.replay_log.record(room_id, message)
+
         if room_id in self.active_connections:
             app_logger.debug(
                 f"WebSocket: рассылка в комнату {room_id}, исключая {exclude_profile_id}"
             )
 
             disconnected_profiles = []
+            envelope = BroadcastMessage(message)
 
             for pid, websocket in self.active_connections[room_id].items():
                 if pid == exclude_profile_id:
                     continue
 
                 try:
-                    await websocket.send_json(message)
+                    await websocket.send_json(envelope)
                 except Exception as e:
                     app_logger.error(f"Ошибка отправки сообщения профилю {pid}: {e}")
                     disconnected_profiles.append(pid)
@@ -137,11 +149,46 @@ class RoomConnectionManager:
             for pid in disconnected_profiles:
                 await self.disconnect(room_id, pid)
 
+    async def replay(self, room_id: UUID, profile_id: UUID, last_seq: int):
+        missed_events = self.replay_log.since(room_id, last_seq)
+
+        if missed_events is None:
+            event = RoomWebSocketMessage(
+                type=RoomEventType.RESYNC_REQUIRED,
+                data={
+                    "last_seq": last_seq,
+                    "current_seq": self.replay_log.get_last_seq(room_id),
+                },
+                timestamp=datetime.now(timezone.utc),
+                room_id=room_id,
+            )
+            await self.send_personal_message(event.to_dict(), room_id, profile_id)
+            app_logger.info(
+                f"WebSocket: профилю {profile_id} требуется ресинхронизация комнаты {room_id}"
+            )
+            return
+
+        for message in missed_events:
+            await self.send_personal_message(message, room_id, profile_id)
+
+        app_logger.debug(
+            f"WebSocket: профилю {profile_id} повторно доставлено {len(missed_events)} событий комнаты {room_id}"
+        )
+
+    def get_last_seq(self, room_id: UUID) -> int | None:
+        return self.replay_log.get_last_seq(room_id)
+
+    def clear_replay_log(self, room_id: UUID):
+        self.replay_log.clear(room_id)
+
     def get_room_participants(self, room_id: UUID) -> list[UUID]:
         if room_id in self.active_connections:
             return list(self.active_connections[room_id].keys())
         return []
 
+    def get_connection(self, room_id: UUID, profile_id: UUID) -> WebSocket | None:
+        return self.active_connections.get(room_id, {}).get(profile_id)
+
     def is_profile_connected(self, room_id: UUID, profile_id: UUID) -> bool:
         return (
             room_id in self.active_connections
@@ -5,6 +5,7 @@ from uuid import UUID
 from app.api.websockets.room_connection_manager import room_connection_manager
 from app.core.logger import app_logger
 from app.core.websocket.room_events import RoomEventType, RoomWebSocketMessage
+from app.db.instrumentation import track_queries
 from app.db.unit_of_work import UnitOfWork
 from app.schemas.room_message import RoomMessageCreate
 from app.services.room import RoomService
@@ -20,7 +21,8 @@ class RoomWebSocketHandler:
         message_type = data.get("type")
 
         if message_type == "send_message":
-            return await self._handle_send_message(data)
+            with track_queries(f"WS комната {self.room_id}: send_message"):
+                return await self._handle_send_message(data)
         elif message_type == "typing_started":
             return await self._handle_typing_started()
         elif message_type == "typing_stopped":
@@ -40,7 +42,7 @@ class RoomWebSocketHandler:
         if len(content) > 5000:
             raise ValueError("Message is too long (maximum 5000 characters)")
 
-        async with UnitOfWork() as uow:
+        async with UnitOfWork(read_only=True) as uow:
             wrs = WebSocketRoomService()
             room_service = RoomService(UnitOfWork(), wrs)
 
@@ -142,6 +144,7 @@ class RoomWebSocketHandler:
                 "online_count": room_connection_manager.get_room_online_count(
                     self.room_id
                 ),
+                "last_seq": room_connection_manager.get_last_seq(self.room_id),
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             },
             timestamp=datetime.now(timezone.utc),
@@ -0,0 +1,65 @@
+import time
+from collections import deque
+from typing import Any
+from uuid import UUID
+
+
+class RoomReplayLog:
+    """
+    Ограниченный журнал последних событий комнат для повторной доставки
+    при переподключении клиента.
+
+    Каждое записанное событие получает монотонно возрастающий номер `seq`
+    в пределах комнаты. Нумерация новой комнаты начинается с текущего времени
+    в миллисекундах, поэтому после перезапуска процесса номера не пересекаются
+    со старыми, и устаревший `last_seq` клиента приводит к ресинхронизации.
+    """
+
+    def __init__(self, max_events: int):
+        self.max_events = max_events
+        self._events: dict[UUID, deque[dict[str, Any]]] = {}
+        self._last_seq: dict[UUID, int] = {}
+        self._first_seq: dict[UUID, int] = {}
+
+    def record(self, room_id: UUID, message: dict[str, Any]) -> int:
+        if room_id not in self._last_seq:
+            base = int(time.time() * 1000)
+            self._last_seq[room_id] = base
+            self._first_seq[room_id] = base + 1
+            self._events[room_id] = deque(maxlen=self.max_events)
+
+        seq = self._last_seq[room_id] + 1
+        self._last_seq[room_id] = seq
+        message["seq"] = seq
+
+        events = self._events[room_id]
+        if len(events) == events.maxlen:
+            self._first_seq[room_id] = events[0]["seq"] + 1
+        events.append(message)
+
+        return seq
+
+    def get_last_seq(self, room_id: UUID) -> int | None:
+        return self._last_seq.get(room_id)
+
+    def since(self, room_id: UUID, last_seq: int) -> list[dict[str, Any]] | None:
+        """
+        Возвращает события комнаты с номером больше `last_seq`.
+
+        Returns:
+            list[dict] | None: Пропущенные события по порядку или None,
+            если разрыв не покрывается журналом и нужна полная ресинхронизация
+        """
+        current_seq = self._last_seq.get(room_id)
+        if current_seq is None:
+            return None
+
+        if last_seq > current_seq or last_seq < self._first_seq[room_id] - 1:
+            return None
+
+        return [event for event in self._events[room_id] if event["seq"] > last_seq]
+
+    def clear(self, room_id: UUID):
+        self._events.pop(room_id, None)
+        self._last_seq.pop(room_id, None)
+        self._first_seq.pop(room_id, None)
@@ -4,6 +4,8 @@ from uuid import UUID
 
 from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
 
+from app.api.websockets.heartbeat import websocket_heartbeat
+from app.api.websockets.protocol import negotiate_protocol
 from app.api.websockets.roulette_connection_manager import roulette_connection_manager
 from app.api.websockets.roulette_handlers import ChatRouletteWebSocketHandler
 from app.core.logger import app_logger
@@ -19,7 +21,7 @@ ws_chat_roulette_router = APIRouter(tags=["WebSocket: Чат-рулетка"])
 
 async def validate_session_access(session_id: UUID, profile_id: UUID) -> bool:
     try:
-        async with UnitOfWork() as uow:
+        async with UnitOfWork(read_only=True) as uow:
             session = await uow.chat_roulette_session.find_active_session_by_profile(
                 profile_id
             )
@@ -49,13 +51,43 @@ async def validate_session_access(session_id: UUID, profile_id: UUID) -> bool:
         return False
 
 
+async def notify_partner_disconnected(session_id: UUID, profile_id: UUID):
+    partner_profile_id = roulette_connection_manager.get_partner_profile_id(
+        session_id, profile_id
+    )
+
+    if partner_profile_id:
+        partner_disconnected_event = ChatRouletteWebSocketMessage(
+            type=ChatRouletteEventType.PARTNER_DISCONNECTED,
+            data={
+                "partner_profile_id": str(partner_profile_id),
+                "session_id": str(session_id),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+            timestamp=datetime.now(timezone.utc),
+            session_id=session_id,
+            sender_profile_id=profile_id,
+        )
+        await roulette_connection_manager.send_personal_message(
+            partner_disconnected_event.to_dict(), session_id, partner_profile_id
+        )
+
+
 @ws_chat_roulette_router.websocket("/chat-roulette/{session_id}")
 async def websocket_roulette_chat(
     websocket: WebSocket,
     session_id: UUID,
     token: str = Query(...),
 ):
+    """
+    WebSocket-чат сессии чат-рулетки.
+
+    Молчащее соединение закрывается по heartbeat, поэтому клиент отправляет
+    `{"type": "ping"}` не реже раза в `WS_HEARTBEAT_INTERVAL_SECONDS`
+    (см. `WebSocketHeartbeat`).
+    """
     app_logger.info(f"Попытка подключения WebSocket к сессии чат-рулетки {session_id}")
+    websocket = negotiate_protocol(websocket)
 
     auth_result = await authenticate_websocket(websocket, token)
     if not auth_result:
@@ -72,8 +104,17 @@ async def websocket_roulette_chat(
 
     handler = ChatRouletteWebSocketHandler(session_id, profile_id)
 
+    async def send_ping():
+        ping_event = ChatRouletteWebSocketMessage(
+            type=ChatRouletteEventType.PING,
+            data={"timestamp": datetime.now(timezone.utc).isoformat()},
+            timestamp=datetime.now(timezone.utc),
+        )
+        await websocket.send_json(ping_event.to_dict())
+
     try:
         await roulette_connection_manager.connect(session_id, profile_id, websocket)
+        websocket_heartbeat.register(websocket, send_ping)
 
         connection_event = await handler.create_connection_event()
         await roulette_connection_manager.send_personal_message(
@@ -109,44 +150,14 @@ async def websocket_roulette_chat(
 
         while True:
             try:
-                data = await asyncio.wait_for(websocket.receive_json(), timeout=300)
-            except asyncio.TimeoutError:
-                ping_event = ChatRouletteWebSocketMessage(
-                    type=ChatRouletteEventType.PING,
-                    data={"timestamp": datetime.now(timezone.utc).isoformat()},
-                    timestamp=datetime.now(timezone.utc),
-                )
-                await roulette_connection_manager.send_personal_message(
-                    ping_event.to_dict(), session_id, profile_id
-                )
-                continue
+                data = await websocket.receive_json()
+                websocket_heartbeat.touch(websocket)
             except WebSocketDisconnect:
                 app_logger.info(
                     f"WebSocket отключен: профиль={profile_id}, сессия={session_id}"
                 )
 
-                partner_profile_id = roulette_connection_manager.get_partner_profile_id(
-                    session_id, profile_id
-                )
-
-                if partner_profile_id:
-                    partner_disconnected_event = ChatRouletteWebSocketMessage(
-                        type=ChatRouletteEventType.PARTNER_DISCONNECTED,
-                        data={
-                            "partner_profile_id": str(partner_profile_id),
-                            "session_id": str(session_id),
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                        },
-                        timestamp=datetime.now(timezone.utc),
-                        session_id=session_id,
-                        sender_profile_id=profile_id,
-                    )
-                    await roulette_connection_manager.send_personal_message(
-                        partner_disconnected_event.to_dict(),
-                        session_id,
-                        partner_profile_id,
-                    )
-
+                await notify_partner_disconnected(session_id, profile_id)
                 break
             except Exception as e:
                 app_logger.error(f"Ошибка получения сообщения WebSocket: {e}")
@@ -187,27 +198,18 @@ async def websocket_roulette_chat(
             f"WebSocket отключен: профиль={profile_id}, сессия={session_id}"
         )
 
-        partner_profile_id = roulette_connection_manager.get_partner_profile_id(
-            session_id, profile_id
-        )
+        await notify_partner_disconnected(session_id, profile_id)
 
-        if partner_profile_id:
-            partner_disconnected_event = ChatRouletteWebSocketMessage(
-                type=ChatRouletteEventType.PARTNER_DISCONNECTED,
-                data={
-                    "partner_profile_id": str(partner_profile_id),
-                    "session_id": str(session_id),
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                },
-                timestamp=datetime.now(timezone.utc),
-                session_id=session_id,
-                sender_profile_id=profile_id,
-            )
-            await roulette_connection_manager.send_personal_message(
-                partner_disconnected_event.to_dict(), session_id, partner_profile_id
-            )
+    except asyncio.CancelledError:
+        if not websocket_heartbeat.consume_reaped(websocket):
+            raise
+        app_logger.info(
+            f"WebSocket закрыт по heartbeat: профиль={profile_id}, сессия={session_id}"
+        )
+        await notify_partner_disconnected(session_id, profile_id)
 
     except Exception as e:
         app_logger.error(f"Непредвиденная ошибка WebSocket: {e}")
     finally:
+        websocket_heartbeat.unregister(websocket)
         roulette_connection_manager.disconnect(session_id, profile_id)
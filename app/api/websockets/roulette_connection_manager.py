@@ -2,6 +2,7 @@ from uuid import UUID
 
 from fastapi import WebSocket
 
+from app.api.websockets.protocol import BroadcastMessage
 from app.core.logger import app_logger
 
 
@@ -75,13 +76,14 @@ class ChatRouletteConnectionManager:
             )
 
             disconnected_profiles = []
+            envelope = BroadcastMessage(message)
 
             for pid, websocket in self.active_connections[session_id].items():
                 if pid == exclude_profile_id:
                     continue
 
                 try:
-                    await websocket.send_json(message)
+                    await websocket.send_json(envelope)
                 except Exception as e:
                     app_logger.error(
                         f"Ошибка отправки сообщения профилю {pid} в сессии {session_id}: {e}"
@@ -104,6 +106,9 @@ class ChatRouletteConnectionManager:
             return list(self.active_connections[session_id].keys())
         return []
 
+    def get_connection(self, session_id: UUID, profile_id: UUID) -> WebSocket | None:
+        return self.active_connections.get(session_id, {}).get(profile_id)
+
     def is_profile_connected(self, session_id: UUID, profile_id: UUID) -> bool:
         return (
             session_id in self.active_connections
@@ -2,16 +2,16 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
-from app.core.config import settings
 from app.core.logger import app_logger
 from app.core.websocket.chat_roulette_events import (
     ChatRouletteEventType,
     ChatRouletteWebSocketMessage,
 )
+from app.db.instrumentation import track_queries
 from app.db.unit_of_work import UnitOfWork
 from app.services.chat_roulette import ChatRouletteService
 from app.services.websocket.chat_roulette import WebSocketChatRouletteService
-from app.utils.object_storage import ObjectStorageService
+from app.utils.object_storage import object_storage_service
 
 
 class ChatRouletteWebSocketHandler:
@@ -25,7 +25,8 @@ class ChatRouletteWebSocketHandler:
         message_type = data.get("type")
 
         if message_type == "send_message":
-            return await self._handle_send_message(data)
+            with track_queries(f"WS чат-рулетка {self.session_id}: send_message"):
+                return await self._handle_send_message(data)
         elif message_type == "ping":
             return await self._handle_ping()
         else:
@@ -42,15 +43,11 @@ class ChatRouletteWebSocketHandler:
         if len(content) > 5000:
             raise ValueError("Message is too long (maximum 5000 characters)")
 
-        async with UnitOfWork() as uow:
-            oss = ObjectStorageService(
-                endpoint_url=settings.S3_ENDPOINT_URL,
-                access_key_id=settings.S3_ACCESS_KEY_ID,
-                secret_access_key=settings.S3_SECRET_ACCESS_KEY,
-                bucket_name=settings.S3_BUCKET_NAME,
-            )
+        async with UnitOfWork(read_only=True) as uow:
             wcrs = WebSocketChatRouletteService()
-            chat_roulette_service = ChatRouletteService(UnitOfWork(), oss, wcrs)
+            chat_roulette_service = ChatRouletteService(
+                UnitOfWork(), object_storage_service, wcrs
+            )
 
             session = await uow.chat_roulette_session.find_active_session_by_profile(
                 self.profile_id
@@ -1,3 +1,6 @@
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
@@ -11,6 +14,152 @@ from app.schemas.auth import TokenResponse
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 
+class VerifiedTokenCache:
+    """
+    LRU-кэш проверенных access-токенов: SHA-256 токена → декодированные claims.
+
+    Клиент использует один access-токен все 15 минут его жизни, поэтому
+    повторная проверка подписи заменяется поиском по словарю. Запись живёт
+    до `exp` токена.
+
+    После `revoke_user` (удаление пользователя, смена пароля) все токены
+    пользователя, выпущенные до этого момента, отклоняются — и из кэша,
+    и при проверке подписи. Отзыв хранится в памяти процесса в течение
+    `revocation_ttl` (срок жизни самого долгого токена).
+
+    `iat` в JWT записывается целыми секундами, поэтому момент отзыва тоже
+    округляется до секунды, а отклоняются токены, выпущенные строго раньше:
+    иначе токен, полученный сразу после смены пароля, считался бы отозванным.
+    """
+
+    def __init__(self, max_size: int, revocation_ttl: float):
+        self.max_size = max_size
+        self.revocation_ttl = revocation_ttl
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self._revoked_users: dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, float]:
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "revoked_users": len(self._revoked_users),
+        }
+
+    def get(self, digest: bytes) -> dict | None:
+        payload = self._entries.get(digest)
+        if payload is None or payload["exp"] <= time.time():
+            self._entries.pop(digest, None)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return payload
+
+    def put(self, digest: bytes, payload: dict):
+        if self.max_size <= 0 or payload.get("type") != "access":
+            return
+
+        self._entries[digest] = payload
+        self._entries.move_to_end(digest)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def is_revoked(self, payload: dict) -> bool:
+        revoked_at = self._revoked_users.get(payload.get("sub"))
+        return revoked_at is not None and payload.get("iat", 0) < revoked_at
+
+    def revoke_user(self, user_id: UUID):
+        """Отзывает все токены пользователя, выпущенные до текущего момента"""
+
+        now = int(time.time())
+        for sub, revoked_at in list(self._revoked_users.items()):
+            if revoked_at + self.revocation_ttl <= now:
+                del self._revoked_users[sub]
+
+        sub = str(user_id)
+        self._revoked_users[sub] = now
+        for digest in [d for d, p in self._entries.items() if p.get("sub") == sub]:
+            del self._entries[digest]
+
+
+verified_token_cache = VerifiedTokenCache(
+    max_size=settings.JWT_CACHE_SIZE,
+    revocation_ttl=60
+    * max(settings.ACCESS_TOKEN_EXPIRE_MINUTES, settings.REFRESH_TOKEN_EXPIRE_MINUTES),
+)
+
+
+class ProfileOwnershipCache:
+    """
+    Кэш владельцев профилей: profile_id → user_id.
+
+    Профиль не меняет владельца, поэтому проверка принадлежности профиля
+    в `get_current_profile` после первого запроса не обращается к базе.
+    При удалении профиля или пользователя записи сбрасываются явно,
+    а TTL ограничивает время, на которое удаление в другом процессе
+    может остаться незамеченным.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._owners: OrderedDict[UUID, tuple[UUID, float]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict[str, float]:
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._owners),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+        }
+
+    def get(self, profile_id: UUID) -> UUID | None:
+        entry = self._owners.get(profile_id)
+        if entry is None or entry[1] <= time.monotonic():
+            self._owners.pop(profile_id, None)
+            self.misses += 1
+            return None
+
+        self._owners.move_to_end(profile_id)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, profile_id: UUID, user_id: UUID):
+        if self.max_size <= 0:
+            return
+
+        self._owners[profile_id] = (user_id, time.monotonic() + self.ttl_seconds)
+        self._owners.move_to_end(profile_id)
+        if len(self._owners) > self.max_size:
+            self._owners.popitem(last=False)
+
+    def invalidate(self, profile_id: UUID):
+        self._owners.pop(profile_id, None)
+
+    def invalidate_user(self, user_id: UUID):
+        for profile_id in [
+            p for p, (owner, _) in self._owners.items() if owner == user_id
+        ]:
+            del self._owners[profile_id]
+
+
+profile_ownership_cache = ProfileOwnershipCache(
+    max_size=settings.PROFILE_OWNERSHIP_CACHE_SIZE,
+    ttl_seconds=settings.PROFILE_OWNERSHIP_CACHE_TTL_SECONDS,
+)
+
+
 def create_tokens(
     user_id: UUID,
     profile_id: UUID | None = None,
@@ -47,22 +196,43 @@ def refresh_tokens(refresh_token: str) -> TokenResponse:
 
 
 def decode_jwt(token: str) -> dict:
+    digest = _token_digest(token)
+    payload = verified_token_cache.get(digest)
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
             token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
     except jwt.ExpiredSignatureError:
         raise ExpiredTokenError()
     except jwt.InvalidTokenError:
         raise InvalidTokenError()
 
+    if verified_token_cache.is_revoked(payload):
+        raise InvalidTokenError()
+
+    verified_token_cache.put(digest, payload)
+    return payload
+
+
+def revoke_user_tokens(user_id: UUID):
+    """Отзывает все ранее выпущенные токены пользователя"""
+
+    verified_token_cache.revoke_user(user_id)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
 
 def _encode_jwt(data: dict, time_expires: int, token_type: str) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=time_expires)
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=time_expires)
 
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": now})
     to_encode.update({"type": token_type})
 
     encoded_jwt = jwt.encode(
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from dotenv import find_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,16 +16,78 @@ class Settings(BaseSettings):
     DB_NAME: str
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
+    STORAGE_BACKEND: Literal["s3", "local"] = "s3"
+    LOCAL_STORAGE_ROOT: str = "storage"
+    LOCAL_STORAGE_BASE_URL: str = "/api/storage"
+    LOCAL_STORAGE_SIGNING_KEY: str | None = None
     S3_ACCESS_KEY_ID: str
     S3_SECRET_ACCESS_KEY: str
     S3_ENDPOINT_URL: str
     S3_BUCKET_NAME: str
+    S3_MAX_POOL_CONNECTIONS: int = 20
+    S3_KEEPALIVE_TIMEOUT_SECONDS: float = 30.0
+    S3_PRESIGNED_URL_EXPIRES_SECONDS: int = 3600
+    S3_PRESIGNED_URL_REFRESH_MARGIN_SECONDS: int = 300
+    S3_PRESIGNED_URL_CACHE_SIZE: int = 10000
+    AVATAR_SIZES: list[int] = [64, 256, 512]
+    AVATAR_DEFAULT_SIZE: int = 256
+    AVATAR_DEFAULT_FORMAT: str = "webp"
+    AVATAR_PROCESS_WORKERS: int = 2
+    AVATAR_MAX_PIXELS: int = 40_000_000
+    AVATAR_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+    AVATAR_UPLOAD_CHUNK_SIZE: int = 64 * 1024
+    AVATAR_WEBP_QUALITY: int = 80
+    AVATAR_JPEG_QUALITY: int = 85
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7
+    JWT_CACHE_SIZE: int = 10000
+    PROFILE_OWNERSHIP_CACHE_SIZE: int = 10000
+    PROFILE_OWNERSHIP_CACHE_TTL_SECONDS: float = 300.0
+    AUTH_CACHE_STATS_LOG_INTERVAL_SECONDS: float = 300.0
+    WS_GATEWAY_MAX_SUBSCRIPTIONS: int = 100
+    WS_ROOM_REPLAY_BUFFER_SIZE: int = 200
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = 30.0
+    WS_HEARTBEAT_IDLE_TIMEOUT_SECONDS: float = 120.0
+    WS_HEARTBEAT_WHEEL_SLOTS: int = 10
+    DB_REPLICA_HOSTS: str = ""
+    DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS: float = 10.0
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+    DB_QUERY_CACHE_SIZE: int = 1200
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SQL_INSTRUMENTATION_HEADERS: bool = False
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+    SQL_SLOW_REQUEST_MS: float = 200.0
+    REQUEST_IDENTITY_CACHE_ENABLED: bool = True
+    WS_OUTBOX_BATCH_SIZE: int = 100
+    WS_OUTBOX_POLL_INTERVAL_SECONDS: float = 1.0
+    WS_OUTBOX_MAX_ATTEMPTS: int = 5
+    WS_OUTBOX_RETENTION_SECONDS: float = 3600.0
+    WS_OUTBOX_LAG_WARNING_MS: float = 500.0
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32
+    ARGON2_TIME_COST: int = 2
+    ARGON2_MEMORY_COST: int = 102400
+    ARGON2_PARALLELISM: int = 8
 
     @property
     def ASYNC_DATABASE_URL(self):
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_REPLICA_DATABASE_URLS(self) -> list[str]:
+        urls = []
+        for host in self.DB_REPLICA_HOSTS.split(","):
+            host = host.strip()
+            if not host:
+                continue
+            if ":" not in host:
+                host = f"{host}:{self.DB_PORT}"
+            urls.append(
+                f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASS}@{host}/{self.DB_NAME}"
+            )
+        return urls
+
 
 settings = Settings()
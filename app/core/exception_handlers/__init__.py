@@ -6,6 +6,7 @@ from app.core.exception_handlers.auth import (
     expired_token_handler,
     invalid_token_handler,
     missing_token_handler,
+    password_hasher_busy_handler,
 )
 from app.core.exception_handlers.chat_roulette import (
     already_in_search_handler,
@@ -30,6 +31,7 @@ from app.core.exception_handlers.interest import interest_not_found_handler
 from app.core.exception_handlers.object_storage import (
     object_delete_handler,
     object_list_get_handler,
+    object_not_found_handler,
     object_upload_handler,
 )
 from app.core.exception_handlers.profile import (
@@ -55,6 +57,7 @@ from app.core.exception_handlers.room import (
 )
 from app.core.exception_handlers.system import (
     general_exception_handler,
+    invalid_cursor_handler,
     sqlalchemy_exception_handler,
     validation_exception_handler,
 )
@@ -67,7 +70,9 @@ from app.core.exceptions.auth import (
     ExpiredTokenError,
     InvalidTokenError,
     MissingTokenError,
+    PasswordHasherBusyError,
 )
+from app.core.exceptions.base import InvalidCursorError
 from app.core.exceptions.chat_roulette import (
     AlreadyInSearchError,
     AlreadyInSessionError,
@@ -88,6 +93,7 @@ from app.core.exceptions.interest import InterestNotFoundError
 from app.core.exceptions.object_storage import (
     ObjectDeleteError,
     ObjectListGetError,
+    ObjectNotFoundError,
     ObjectUploadError,
 )
 from app.core.exceptions.profile import (
@@ -128,6 +134,7 @@ def setup_exception_handlers(app: FastAPI):
     app.add_exception_handler(InvalidTokenError, invalid_token_handler)
     app.add_exception_handler(ExpiredTokenError, expired_token_handler)
     app.add_exception_handler(MissingTokenError, missing_token_handler)
+    app.add_exception_handler(PasswordHasherBusyError, password_hasher_busy_handler)
     app.add_exception_handler(InterestNotFoundError, interest_not_found_handler)
     app.add_exception_handler(ProfileNotFoundError, profile_not_found_handler)
     app.add_exception_handler(ProfileAlreadyExistsError, profile_exists_handler)
@@ -175,12 +182,14 @@ def setup_exception_handlers(app: FastAPI):
     # Системные исключения
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(SQLAlchemyError, sqlalchemy_exception_handler)
+    app.add_exception_handler(InvalidCursorError, invalid_cursor_handler)
     app.add_exception_handler(Exception, general_exception_handler)
 
     # Исключения объектного хранилища
     app.add_exception_handler(ObjectUploadError, object_upload_handler)
     app.add_exception_handler(ObjectDeleteError, object_delete_handler)
     app.add_exception_handler(ObjectListGetError, object_list_get_handler)
+    app.add_exception_handler(ObjectNotFoundError, object_not_found_handler)
 
     # Файловые исключения
     app.add_exception_handler(UnsupportedMediaTypeError, unsupported_media_type_handler)
@@ -7,6 +7,7 @@ from app.core.exceptions.auth import (
     ExpiredTokenError,
     InvalidTokenError,
     MissingTokenError,
+    PasswordHasherBusyError,
 )
 from app.core.logger import app_logger
 
@@ -57,3 +58,20 @@ async def missing_token_handler(request: Request, exc: MissingTokenError):
             },
         },
     )
+
+
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError):
+    app_logger.warning("Очередь хэширования паролей переполнена, запрос отклонён")
+
+    return JSONResponse(
+        status_code=exc.status_code,
+        headers=exc.headers,
+        content={
+            "success": False,
+            "error": {
+                "code": "password_hasher_busy",
+                "message": exc.detail,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        },
+    )
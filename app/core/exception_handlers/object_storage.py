@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from app.core.exceptions.object_storage import (
     ObjectDeleteError,
     ObjectListGetError,
+    ObjectNotFoundError,
     ObjectUploadError,
 )
 from app.core.logger import app_logger
@@ -57,3 +58,19 @@ async def object_list_get_handler(request: Request, exc: ObjectListGetError):
             },
         },
     )
+
+
+async def object_not_found_handler(request: Request, exc: ObjectNotFoundError):
+    app_logger.error(f"Object not found: {exc.detail}")
+
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "success": False,
+            "error": {
+                "code": "object_not_found",
+                "message": exc.detail,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        },
+    )
@@ -5,6 +5,7 @@ from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.exceptions.base import InvalidCursorError
 from app.core.logger import app_logger
 
 
@@ -52,6 +53,24 @@ async def sqlalchemy_exception_handler(request: Request, exc: SQLAlchemyError):
     )
 
 
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError):
+    """Обработчик для некорректного курсора пагинации"""
+
+    app_logger.warning(f"Некорректный курсор пагинации: {request.url.path}")
+
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "success": False,
+            "error": {
+                "code": "invalid_cursor",
+                "message": exc.detail,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+            },
+        },
+    )
+
+
 async def general_exception_handler(request: Request, exc: Exception):
     """Обработчик для непредвиденных исключений"""
 
@@ -20,3 +20,12 @@ class MissingTokenError(HTTPException):
         super().__init__(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated"
         )
+
+
+class PasswordHasherBusyError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many authentication requests, try again later",
+            headers={"Retry-After": "1"},
+        )
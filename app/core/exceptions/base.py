@@ -23,3 +23,10 @@ class AlreadyExistsError(HTTPException):
         )
         super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
         self.entity_field = entity_field
+
+
+class InvalidCursorError(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+        )
@@ -0,0 +1,105 @@
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.exception_handlers.file import file_too_large_handler
+from app.core.exceptions.file import FileTooLargeError
+from app.db.identity_cache import identity_cache
+from app.db.instrumentation import track_queries
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Считает SQL-запросы каждого HTTP-запроса: число, суммарное время в БД,
+    самые долгие запросы и повторяющиеся формы (вероятный N+1).
+    Итог пишется в лог, а при `expose_headers` — в заголовки
+    `X-DB-Query-Count` и `X-DB-Time-Ms`.
+    """
+
+    def __init__(self, app: ASGIApp, expose_headers: bool = False):
+        self.app = app
+        self.expose_headers = expose_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries(f"{scope['method']} {scope['path']}") as stats:
+
+            async def send_with_stats(message: Message):
+                if message["type"] == "http.response.start" and self.expose_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-DB-Query-Count", str(stats.count))
+                    headers.append("X-DB-Time-Ms", f"{stats.total_time * 1000:.1f}")
+                await send(message)
+
+            await self.app(scope, receive, send_with_stats)
+
+
+class IdentityCacheMiddleware:
+    """
+    Открывает на время HTTP-запроса кэш строк по первичному ключу, общий
+    для всех Unit of Work этого запроса (см. `app.db.identity_cache`).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with identity_cache():
+            await self.app(scope, receive, send)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Ограничивает размер тела запросов загрузки файлов (POST на пути,
+    оканчивающиеся на `path_suffix`) до того, как оно будет разобрано.
+
+    Запрос с заголовком `Content-Length` больше лимита отклоняется сразу,
+    без чтения тела. Без заголовка (chunked) байты считаются по мере
+    поступления, и чтение прерывается ошибкой `FileTooLargeError`,
+    как только лимит превышен.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int, path_suffix: str):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_suffix = path_suffix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].endswith(self.path_suffix)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        error = FileTooLargeError(
+            f"Request body is too large. Maximum size: {self.max_body_size} bytes"
+        )
+
+        content_length = Request(scope).headers.get("content-length")
+        if content_length and content_length.isdigit():
+            if int(content_length) > self.max_body_size:
+                response = await file_too_large_handler(Request(scope), error)
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def receive_with_limit() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    raise error
+            return message
+
+        await self.app(scope, receive_with_limit, send)
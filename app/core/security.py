@@ -1,11 +1,86 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+from app.core.config import settings
+from app.core.exceptions.auth import PasswordHasherBusyError
+
+
+class PasswordHasher:
+    """
+    Хэширование и проверка паролей argon2 вне цикла событий.
+
+    Вычисление argon2 занимает десятки миллисекунд процессора и памяти,
+    поэтому выполняется в отдельном пуле потоков (argon2-cffi отпускает GIL).
+    Число ожидающих задач ограничено: при переполнении очереди запрос сразу
+    отклоняется с `PasswordHasherBusyError`, а не накапливает задержку.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        time_cost: int,
+        memory_cost: int,
+        parallelism: int,
+    ):
+        self.context = CryptContext(
+            schemes=["argon2"],
+            deprecated="auto",
+            argon2__time_cost=time_cost,
+            argon2__memory_cost=memory_cost,
+            argon2__parallelism=parallelism,
+        )
+        self.max_pending = workers + max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hasher"
+        )
+        self._pending = 0
+
+        self.rejected = 0
+
+    def get_stats(self) -> dict[str, int]:
+        return {"pending": self._pending, "rejected": self.rejected}
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """
+        Проверяет пароль и, если хэш создан с устаревшими параметрами,
+        возвращает новый хэш для сохранения (иначе None).
+        """
+        return await self._run(
+            self.context.verify_and_update, password, hashed_password
+        )
+
+    async def _run(self, func, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusyError()
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
 
-def get_password_hash(password: str):
-    return pwd_context.hash(password)
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
 
 
-def verify_password(password: str, hashed_password: str):
-    return pwd_context.verify(password, hashed_password)
+async def get_password_hash(password: str) -> str:
+    return await password_hasher.hash(password)
@@ -0,0 +1,32 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class GatewayEventType(str, Enum):
+    CONNECTION_ESTABLISHED = "connection_established"
+
+    SUBSCRIBED = "subscribed"
+    UNSUBSCRIBED = "unsubscribed"
+
+    ERROR = "error"
+    PING = "ping"
+    PONG = "pong"
+
+
+class GatewayWebSocketMessage(BaseModel):
+    type: GatewayEventType
+    data: dict[str, Any]
+    timestamp: datetime
+    channel: str | None = None
+
+    model_config = ConfigDict(
+        json_encoders={
+            datetime: lambda dt: dt.isoformat(),
+        },
+    )
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.model_dump(mode="json")
@@ -33,6 +33,18 @@ class RoomEventType(str, Enum):
     PING = "ping"
     PONG = "pong"
     CONNECTION_ESTABLISHED = "connection_established"
+    RESYNC_REQUIRED = "resync_required"
+
+
+EPHEMERAL_ROOM_EVENTS = {
+    RoomEventType.PROFILE_ONLINE.value,
+    RoomEventType.PROFILE_OFFLINE.value,
+    RoomEventType.TYPING_STARTED.value,
+    RoomEventType.TYPING_STOPPED.value,
+    RoomEventType.ERROR.value,
+    RoomEventType.PING.value,
+    RoomEventType.PONG.value,
+}
 
 
 class RoomWebSocketMessage(BaseModel):
@@ -41,6 +53,7 @@ class RoomWebSocketMessage(BaseModel):
     timestamp: datetime
     room_id: UUID | None = None
     sender_profile_id: UUID | None = None
+    seq: int | None = None
 
     model_config = ConfigDict(
         json_encoders={
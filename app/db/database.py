@@ -7,20 +7,54 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from app.core.config import settings
+from app.db.instrumentation import install_query_instrumentation
+from app.db.replicas import ReplicaRouter
 
-engine = create_async_engine(
-    url=settings.ASYNC_DATABASE_URL,
-    pool_size=20,
-    max_overflow=30,
-    pool_timeout=60,
-    pool_recycle=3600,
-    pool_pre_ping=True,
-)
+# query_cache_size — кэш скомпилированного SQL в SQLAlchemy (по умолчанию 500
+# форм запросов), prepared_statement_cache_size — кэш подготовленных
+# выражений asyncpg на каждом соединении (по умолчанию 100)
+engine_options = {
+    "pool_size": 20,
+    "max_overflow": 30,
+    "pool_timeout": 60,
+    "pool_recycle": 3600,
+    "pool_pre_ping": True,
+    "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+    "connect_args": {
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+    },
+}
+
+engine = create_async_engine(url=settings.ASYNC_DATABASE_URL, **engine_options)
 
 async_session_maker = async_sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+# Сессии только для чтения работают в режиме AUTOCOMMIT на том же пуле:
+# без BEGIN/COMMIT на каждый вход в UnitOfWork
+read_only_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+read_only_session_maker = async_sessionmaker(
+    read_only_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+)
+
+replica_engines = [
+    create_async_engine(url=url, **engine_options)
+    for url in settings.ASYNC_REPLICA_DATABASE_URLS
+]
+
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    for instrumented_engine in (engine, *replica_engines):
+        install_query_instrumentation(instrumented_engine.sync_engine)
+
+replica_router = ReplicaRouter(
+    replica_engines,
+    health_check_interval=settings.DB_REPLICA_HEALTH_CHECK_INTERVAL_SECONDS,
+    max_lag=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+)
+
 
 async def get_async_session():
     async with async_session_maker() as session:
@@ -0,0 +1,94 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator
+
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+_current_cache: ContextVar["IdentityCache | None"] = ContextVar(
+    "identity_cache", default=None
+)
+
+
+class IdentityCache:
+    """
+    Кэш строк по первичному ключу в пределах одного HTTP-запроса.
+
+    Общий для всех Unit of Work запроса: каждая сессия отдельная, поэтому
+    собственная карта идентичности SQLAlchemy между ними не работает.
+    Хранятся значения колонок, а не сами объекты, чтобы экземпляр одной
+    сессии не попал в другую. Любая запись в таблицу модели в этом же
+    запросе сбрасывает все её строки.
+    """
+
+    def __init__(self):
+        self._rows: dict[tuple[type, Any], dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, session: AsyncSession, model: type, pk: Any) -> Any | None:
+        values = self._rows.get((model, pk))
+        if values is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        instance = model(**values)
+        make_transient_to_detached(instance)
+        return await session.merge(instance, load=False)
+
+    def put(self, model: type, pk: Any, instance: Any):
+        loaded = inspect(instance).dict
+        keys = [attr.key for attr in inspect(model).column_attrs]
+        # Частично загруженный объект не кэшируем: догрузка недостающих
+        # атрибутов потребовала бы запроса
+        if all(key in loaded for key in keys):
+            self._rows[(model, pk)] = {key: loaded[key] for key in keys}
+
+    def invalidate(self, model: type, pk: Any | None = None):
+        if pk is not None:
+            self._rows.pop((model, pk), None)
+            return
+
+        for key in [key for key in self._rows if key[0] is model]:
+            del self._rows[key]
+
+
+def get_identity_cache() -> IdentityCache | None:
+    return _current_cache.get()
+
+
+@contextmanager
+def identity_cache() -> Iterator[IdentityCache]:
+    """Включает кэш строк по первичному ключу для кода внутри блока"""
+
+    cache = IdentityCache()
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state):
+    cache = _current_cache.get()
+    if cache is None or orm_execute_state.is_select:
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None:
+        cache.invalidate(mapper.class_)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_on_flush(session, flush_context):
+    cache = _current_cache.get()
+    if cache is None:
+        return
+
+    for instance in [*session.dirty, *session.deleted]:
+        identity = inspect(instance).identity
+        if identity is not None:
+            cache.invalidate(type(instance), identity[0])
@@ -0,0 +1,126 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.logger import app_logger
+
+_PLACEHOLDER_PATTERN = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_PLACEHOLDER_LIST_PATTERN = re.compile(r"\?(\s*,\s*\?)+")
+
+_current_stats: ContextVar["QueryStats | None"] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def statement_shape(statement: str) -> str:
+    """Приводит SQL к форме без значений параметров для поиска повторов"""
+
+    shape = _PLACEHOLDER_PATTERN.sub("?", statement)
+    shape = _PLACEHOLDER_LIST_PATTERN.sub("?, ...", shape)
+    return " ".join(shape.split())
+
+
+class QueryStats:
+    """
+    Статистика SQL-запросов в пределах одного HTTP-запроса или одного
+    сообщения WebSocket. Запросы вложенного блока учитываются и во внешнем.
+    """
+
+    def __init__(self, parent: "QueryStats | None" = None, slowest_limit: int = 3):
+        self.parent = parent
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_limit = slowest_limit
+        self.slowest: list[tuple[float, str]] = []
+        self.shapes: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float):
+        self.count += 1
+        self.total_time += duration
+        self.shapes[statement_shape(statement)] += 1
+
+        if len(self.slowest) < self.slowest_limit or duration > self.slowest[-1][0]:
+            self.slowest.append((duration, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[self.slowest_limit :]
+
+        if self.parent is not None:
+            self.parent.record(statement, duration)
+
+    def get_repeated_shapes(self, threshold: int) -> dict[str, int]:
+        """Формы запросов, выполненные не меньше `threshold` раз: вероятный N+1"""
+
+        return {
+            shape: count for shape, count in self.shapes.items() if count >= threshold
+        }
+
+    def report(self, label: str):
+        total_ms = self.total_time * 1000
+        repeated = self.get_repeated_shapes(settings.SQL_N_PLUS_ONE_THRESHOLD)
+
+        if repeated:
+            for shape, count in repeated.items():
+                app_logger.warning(
+                    f"SQL: вероятный N+1 в {label}: {count} одинаковых запросов: {shape[:300]}"
+                )
+
+        if total_ms >= settings.SQL_SLOW_REQUEST_MS:
+            slowest = "; ".join(
+                f"{duration * 1000:.1f} мс: {' '.join(statement.split())[:200]}"
+                for duration, statement in self.slowest
+            )
+            app_logger.warning(
+                f"SQL: {label}: {self.count} запросов, {total_ms:.1f} мс в БД. "
+                f"Самые долгие: {slowest}"
+            )
+        else:
+            app_logger.debug(
+                f"SQL: {label}: {self.count} запросов, {total_ms:.1f} мс в БД"
+            )
+
+
+@contextmanager
+def track_queries(label: str | None = None) -> Iterator[QueryStats]:
+    """
+    Собирает статистику SQL-запросов, выполненных внутри блока.
+    Если передан `label`, по выходу статистика пишется в лог.
+    """
+    stats = QueryStats(parent=_current_stats.get())
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+        if label is not None:
+            stats.report(label)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def install_query_instrumentation(engine: Engine):
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime, timezone
 from enum import Enum
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -57,6 +57,26 @@ class ChatRouletteSession(Base):
     """
 
     __tablename__ = "chat_roulette_sessions"
+    __table_args__ = (
+        Index(
+            "ix_chat_roulette_sessions_waiting_created_at",
+            "created_at",
+            "profile1_id",
+            postgresql_where=text("status = 'WAITING' AND profile2_id IS NULL"),
+        ),
+        Index(
+            "uq_chat_roulette_sessions_active_profile1_id",
+            "profile1_id",
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+        Index(
+            "uq_chat_roulette_sessions_active_profile2_id",
+            "profile2_id",
+            unique=True,
+            postgresql_where=text("status = 'ACTIVE'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import DateTime, Float, ForeignKey, String, Text
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -21,11 +21,13 @@ class Profile(Base):
         username: Уникальное имя пользователя (отображаемое имя, максимум 40 символов)
         bio: Биография или описание профиля (опционально, текстовое поле)
         reputation_score: Рейтинг репутации профиля (влияет на подбор в чат-рулетке, индексируется, по умолчанию 3.0)
+        avatar_version: Версия загруженной аватарки (None, если аватарки нет; 0 — аватарка загружена до появления вариантов размеров)
         created_at: Временная метка создания профиля
         updated_at: Временная метка последнего обновления профиля
     """
 
     __tablename__ = "profiles"
+    __table_args__ = (Index("ix_profiles_created_at_id", "created_at", "id"),)
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -39,6 +41,7 @@ class Profile(Base):
     reputation_score: Mapped[float] = mapped_column(
         Float, nullable=False, index=True, default=0.0
     )
+    avatar_version: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -49,6 +49,7 @@ class RoomParticipant(Base):
         UUID(as_uuid=True),
         ForeignKey("profiles.id", ondelete="CASCADE"),
         primary_key=True,
+        index=True,
     )
     role: Mapped[str] = mapped_column(
         String(20), nullable=False, default=RoomParticipantRole.MEMBER.value, index=True
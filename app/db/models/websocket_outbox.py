@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, String, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.database import Base
+
+
+class WebSocketOutboxEvent(Base):
+    """
+    Модель исходящего WebSocket-уведомления (transactional outbox).
+
+    Событие записывается в той же транзакции, что и изменение данных,
+    и рассылается фоновым диспетчером после фиксации транзакции.
+
+    Attributes:
+        id: Порядковый номер события, задаёт порядок рассылки
+        target: Сервис рассылки (room или chat_roulette)
+        method: Имя метода broadcast_* сервиса рассылки
+        payload: Аргументы метода (args и kwargs) в JSON
+        attempts: Количество неудачных попыток рассылки
+        created_at: Время записи события
+        dispatched_at: Время успешной рассылки (None, пока не разослано)
+    """
+
+    __tablename__ = "websocket_outbox"
+    __table_args__ = (
+        Index(
+            "ix_websocket_outbox_pending",
+            "id",
+            postgresql_where=text("dispatched_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    target: Mapped[str] = mapped_column(String(20), nullable=False)
+    method: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        index=True,
+    )
+    dispatched_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -0,0 +1,118 @@
+import asyncio
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.core.logger import app_logger
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+_last_write_at: ContextVar[float | None] = ContextVar("last_write_at", default=None)
+
+
+class ReplicaRouter:
+    """
+    Распределяет сессии только для чтения по репликам.
+
+    Реплики выбираются по кругу среди здоровых, здоровье и отставание
+    репликации проверяются фоновой задачей. После фиксации транзакции
+    в текущем запросе (или WebSocket-соединении) чтение в течение
+    `read_your_writes_seconds` идёт в основную базу, чтобы клиент видел
+    собственные изменения.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        health_check_interval: float,
+        max_lag: float,
+        read_your_writes_seconds: float,
+    ):
+        self.engines = engines
+        self.health_check_interval = health_check_interval
+        self.max_lag = max_lag
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._session_makers = [
+            async_sessionmaker(
+                engine.execution_options(isolation_level="AUTOCOMMIT"),
+                class_=AsyncSession,
+                expire_on_commit=False,
+                autoflush=False,
+            )
+            for engine in engines
+        ]
+        self._healthy = [True] * len(engines)
+        self._cursor = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def mark_write(self):
+        _last_write_at.set(time.monotonic())
+
+    def get_session_maker(self) -> async_sessionmaker | None:
+        """
+        Возвращает фабрику сессий следующей здоровой реплики или None,
+        если чтение должно идти в основную базу.
+        """
+        if not self.enabled:
+            return None
+
+        last_write_at = _last_write_at.get()
+        if (
+            last_write_at is not None
+            and time.monotonic() - last_write_at < self.read_your_writes_seconds
+        ):
+            return None
+
+        for _ in range(len(self._session_makers)):
+            index = self._cursor
+            self._cursor = (self._cursor + 1) % len(self._session_makers)
+            if self._healthy[index]:
+                return self._session_makers[index]
+
+        return None
+
+    async def run(self):
+        try:
+            while True:
+                await self.check_health()
+                await asyncio.sleep(self.health_check_interval)
+
+        except asyncio.CancelledError:
+            app_logger.info("Задача проверки реплик БД отменена")
+            raise
+
+    async def check_health(self):
+        results = await asyncio.gather(
+            *(self._check_replica(engine) for engine in self.engines),
+            return_exceptions=True,
+        )
+
+        for index, result in enumerate(results):
+            healthy = result is True
+            if healthy != self._healthy[index]:
+                host = self.engines[index].url.host
+                if healthy:
+                    app_logger.info(f"Реплика БД {host} снова доступна")
+                else:
+                    app_logger.warning(
+                        f"Реплика БД {host} исключена из чтения: {result}"
+                    )
+            self._healthy[index] = healthy
+
+    async def _check_replica(self, engine: AsyncEngine) -> bool | str:
+        async with asyncio.timeout(self.health_check_interval):
+            async with engine.connect() as connection:
+                lag = (await connection.execute(REPLICA_LAG_QUERY)).scalar()
+
+        if lag is not None and lag > self.max_lag:
+            return f"отставание репликации {lag:.1f} с"
+        return True
@@ -1,6 +1,14 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, TypeVar, overload
 
-from app.db.database import async_session_maker
+from fastapi.encoders import jsonable_encoder
+
+from app.db.database import (
+    async_session_maker,
+    read_only_session_maker,
+    replica_router,
+)
 from app.repositories import (
     ChatRouletteMessageRepository,
     ChatRouletteReportRepository,
@@ -13,8 +21,16 @@ from app.repositories import (
     RoomParticipantRepository,
     RoomRepository,
     UserRepository,
+    WebSocketOutboxRepository,
 )
 
+T1 = TypeVar("T1")
+T2 = TypeVar("T2")
+T3 = TypeVar("T3")
+
+# Сигнал диспетчеру WebSocket-уведомлений: в outbox зафиксированы новые события
+outbox_ready = asyncio.Event()
+
 
 class IUnitOfWork(ABC):
     """
@@ -33,6 +49,7 @@ class IUnitOfWork(ABC):
     chat_roulette_search: ChatRouletteSearchRepository
     chat_roulette_report: ChatRouletteReportRepository
     chat_roulette_message: ChatRouletteMessageRepository
+    websocket_outbox: WebSocketOutboxRepository
 
     @abstractmethod
     async def __aenter__(self):
@@ -63,32 +80,60 @@ class UnitOfWork(IUnitOfWork):
     """
     Реализация паттерна Unit of Work
     Управляет сессиями базы данных и транзакциями
+
+    Репозитории создаются при первом обращении к атрибуту, а соединение
+    из пула берётся сессией только при первом запросе к базе.
+    В режиме `read_only` сессия работает без транзакции, не может
+    быть зафиксирована и при наличии реплик направляется на одну из них.
     """
 
-    def __init__(self):
-        self.session_maker = async_session_maker
+    repositories = {
+        "user": UserRepository,
+        "profile": ProfileRepository,
+        "interest": InterestRepository,
+        "profile_interest": ProfileInterestRepository,
+        "room": RoomRepository,
+        "room_participant": RoomParticipantRepository,
+        "room_message": RoomMessageRepository,
+        "chat_roulette_session": ChatRouletteSessionRepository,
+        "chat_roulette_search": ChatRouletteSearchRepository,
+        "chat_roulette_report": ChatRouletteReportRepository,
+        "chat_roulette_message": ChatRouletteMessageRepository,
+        "websocket_outbox": WebSocketOutboxRepository,
+    }
+
+    def __init__(self, read_only: bool = False):
+        self.read_only = read_only
+        self.session_maker = (
+            read_only_session_maker if read_only else async_session_maker
+        )
         self.session = None
+        self._has_outbox_events = False
 
-    async def __aenter__(self):
-        try:
-            self.session = self.session_maker()
+    def __getattr__(self, name: str):
+        repository_class = self.repositories.get(name)
+        if repository_class is None:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
 
-            self.user = UserRepository(self.session)
-            self.profile = ProfileRepository(self.session)
-            self.interest = InterestRepository(self.session)
-            self.profile_interest = ProfileInterestRepository(self.session)
-            self.room = RoomRepository(self.session)
-            self.room_participant = RoomParticipantRepository(self.session)
-            self.room_message = RoomMessageRepository(self.session)
-            self.chat_roulette_session = ChatRouletteSessionRepository(self.session)
-            self.chat_roulette_search = ChatRouletteSearchRepository(self.session)
-            self.chat_roulette_report = ChatRouletteReportRepository(self.session)
-            self.chat_roulette_message = ChatRouletteMessageRepository(self.session)
+        if self.session is None:
+            raise RuntimeError(f"Cannot access '{name}': unit of work is not active")
+
+        repository = repository_class(self.session)
+        setattr(self, name, repository)
+        return repository
+
+    async def __aenter__(self):
+        self._reset_repositories()
 
-            return self
+        session_maker = self.session_maker
+        if self.read_only:
+            session_maker = replica_router.get_session_maker() or session_maker
 
-        except Exception as e:
-            raise
+        self.session = session_maker()
+        self._has_outbox_events = False
+        return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         try:
@@ -99,15 +144,88 @@ class UnitOfWork(IUnitOfWork):
                 await self.session.close()
 
             self.session = None
+            self._reset_repositories()
 
     async def commit(self):
         if self.session is None:
             raise RuntimeError("Cannot commit: session is None")
 
+        if self.read_only:
+            raise RuntimeError("Cannot commit: unit of work is read-only")
+
         await self.session.commit()
+        replica_router.mark_write()
+
+        if self._has_outbox_events:
+            self._has_outbox_events = False
+            outbox_ready.set()
 
     async def rollback(self):
         if self.session is None:
             return
 
         await self.session.rollback()
+        self._has_outbox_events = False
+
+    async def publish(self, target: str, method: str, *args, **kwargs):
+        """
+        Записывает WebSocket-уведомление в outbox в текущей транзакции.
+        После фиксации диспетчер вызовет `method` сервиса рассылки `target`
+        (room или chat_roulette) с переданными аргументами.
+        """
+        await self.websocket_outbox.add_one(
+            {
+                "target": target,
+                "method": method,
+                "payload": jsonable_encoder({"args": args, "kwargs": kwargs}),
+            }
+        )
+        self._has_outbox_events = True
+
+    def for_reading(self) -> "UnitOfWork":
+        """Возвращает отдельный Unit of Work только для чтения"""
+
+        return UnitOfWork(read_only=True)
+
+    @overload
+    async def gather_reads(
+        self,
+        read1: Callable[["UnitOfWork"], Awaitable[T1]],
+        read2: Callable[["UnitOfWork"], Awaitable[T2]],
+    ) -> tuple[T1, T2]: ...
+
+    @overload
+    async def gather_reads(
+        self,
+        read1: Callable[["UnitOfWork"], Awaitable[T1]],
+        read2: Callable[["UnitOfWork"], Awaitable[T2]],
+        read3: Callable[["UnitOfWork"], Awaitable[T3]],
+    ) -> tuple[T1, T2, T3]: ...
+
+    async def gather_reads(
+        self, *reads: Callable[["UnitOfWork"], Awaitable[Any]]
+    ) -> tuple[Any, ...]:
+        """
+        Выполняет независимые чтения одновременно, каждое в своём Unit of Work
+        только для чтения (отдельное соединение из пула или реплика), и
+        возвращает результаты в порядке аргументов. Время ответа складывается
+        из самого долгого запроса, а не из суммы.
+
+        Незафиксированные изменения текущей транзакции эти чтения не видят:
+        вызывать до записи или после commit().
+
+            profile, rooms = await uow.gather_reads(
+                lambda uow: uow.profile.get_by_id(profile_id),
+                lambda uow: uow.room_participant.count_rooms_for_profile(profile_id),
+            )
+        """
+
+        async def run(read: Callable[["UnitOfWork"], Awaitable[Any]]):
+            async with UnitOfWork(read_only=True) as uow:
+                return await read(uow)
+
+        return tuple(await asyncio.gather(*(run(read) for read in reads)))
+
+    def _reset_repositories(self):
+        for name in self.repositories:
+            self.__dict__.pop(name, None)
@@ -1,26 +1,72 @@
 import asyncio
+import signal
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 
 from app.api.routers import api_router, ws_router
+from app.api.websockets.heartbeat import websocket_heartbeat
+from app.core.config import settings
 from app.core.exception_handlers import setup_exception_handlers
 from app.core.logger import app_logger
+from app.core.middleware import (
+    IdentityCacheMiddleware,
+    SQLInstrumentationMiddleware,
+    UploadSizeLimitMiddleware,
+)
+from app.core.security import password_hasher
+from app.db.database import replica_router
+from app.db.unit_of_work import UnitOfWork
+from app.utils.auth_cache_stats import run_auth_cache_stats_logging
 from app.utils.chat_roulette_cleanup import run_session_cleanup
+from app.utils.image_processing import avatar_processor
+from app.utils.interest_catalog import interest_catalog
+from app.utils.object_storage import object_storage_service
+from app.utils.websocket_outbox import websocket_outbox_dispatcher
+
+
+async def reload_interest_catalog():
+    try:
+        await interest_catalog.reload(UnitOfWork(read_only=True))
+    except Exception as e:
+        app_logger.error(f"Не удалось перезагрузить каталог интересов: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    cleanup_task = asyncio.create_task(run_session_cleanup())
+    await object_storage_service.start()
+    await interest_catalog.load(UnitOfWork(read_only=True))
+    tasks = [
+        asyncio.create_task(run_session_cleanup()),
+        asyncio.create_task(websocket_heartbeat.run()),
+        asyncio.create_task(websocket_outbox_dispatcher.run()),
+        asyncio.create_task(run_auth_cache_stats_logging()),
+    ]
+    if replica_router.enabled:
+        tasks.append(asyncio.create_task(replica_router.run()))
+
+    # Каталог интересов перечитывается по SIGHUP, например после миграции
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGHUP,
+            lambda: tasks.append(asyncio.create_task(reload_interest_catalog())),
+        )
+    except (AttributeError, NotImplementedError):
+        pass
+
     try:
         yield
     finally:
-        cleanup_task.cancel()
-        try:
-            await cleanup_task
-        except asyncio.CancelledError:
-            pass
+        for task in tasks:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        password_hasher.shutdown()
+        avatar_processor.shutdown()
+        await object_storage_service.close()
 
 
 app = FastAPI(
@@ -42,6 +88,10 @@ app = FastAPI(
             "name": "Профили",
             "description": "Создание и управление профилями пользователей, интересы, аватарки",
         },
+        {
+            "name": "Хранилище",
+            "description": "Выдача файлов локального хранилища по подписанным ссылкам",
+        },
         {
             "name": "Комнаты",
             "description": "Создание комнат, управление участниками, сообщения",
@@ -52,11 +102,31 @@ app = FastAPI(
         },
         {"name": "WebSocket: Комнаты", "description": "WebSocket для чата в комнатах"},
         {"name": "WebSocket: Чат-рулетка", "description": "WebSocket для чат-рулетки"},
+        {
+            "name": "WebSocket: Шлюз",
+            "description": "Единый WebSocket с подпиской на каналы комнат и чат-рулетки",
+        },
     ],
 )
 
 setup_exception_handlers(app)
 
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    app.add_middleware(
+        SQLInstrumentationMiddleware,
+        expose_headers=settings.SQL_INSTRUMENTATION_HEADERS,
+    )
+
+if settings.REQUEST_IDENTITY_CACHE_ENABLED:
+    app.add_middleware(IdentityCacheMiddleware)
+
+# Запас на границы и заголовки multipart поверх размера самого файла
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_body_size=settings.AVATAR_MAX_UPLOAD_BYTES + 64 * 1024,
+    path_suffix="/avatar",
+)
+
 app.include_router(api_router)
 app.include_router(ws_router)
 
@@ -9,3 +9,4 @@ from app.repositories.room import RoomRepository
 from app.repositories.room_message import RoomMessageRepository
 from app.repositories.room_participant import RoomParticipantRepository
 from app.repositories.user import UserRepository
+from app.repositories.websocket_outbox import WebSocketOutboxRepository
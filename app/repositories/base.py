@@ -1,10 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from datetime import datetime
+from typing import Any, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Select, bindparam, insert, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.identity_cache import get_identity_cache
+
+# Готовые SELECT для find_one/find_all по форме фильтра: (модель, поля, вид
+# значения). Значения передаются параметрами, поэтому конструкция и её ключ
+# кэша скомпилированного SQL строятся один раз на форму, а не на каждый вызов
+_filter_statements: dict[tuple, Select] = {}
+
+
+def _filter_kind(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "literal"
+    return "param"
+
 
 class IRepository(ABC):
     """
@@ -16,6 +33,19 @@ class IRepository(ABC):
     async def add_one(self, data: dict) -> Any:
         raise NotImplementedError
 
+    @abstractmethod
+    async def add_many(self, data: list[dict]) -> list[Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def upsert_many(
+        self,
+        data: list[dict],
+        index_elements: list[str],
+        update_fields: list[str] | None = None,
+    ) -> list[Any]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_by_id(self, id: UUID) -> Any | None:
         raise NotImplementedError
@@ -44,52 +74,164 @@ class Repository(IRepository):
     """
 
     model = None
+    # Кэшировать ли get_by_id в пределах запроса. Только для моделей,
+    # которые не меняются другими запросами за время жизни этого
+    cache_by_id = False
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
     async def add_one(self, data: dict) -> Any:
-        instance = self.model(**data)
-        self.session.add(instance)
-        await self.session.flush()
-        await self.session.refresh(instance)
-        return instance
+        stmt = insert(self.model).values(**data).returning(self.model)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
+
+    async def add_many(self, data: list[dict]) -> list[Any]:
+        if not data:
+            return []
+
+        stmt = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.session.scalars(stmt, data)
+        return list(result.all())
+
+    async def upsert_many(
+        self,
+        data: list[dict],
+        index_elements: list[str],
+        update_fields: list[str] | None = None,
+    ) -> list[Any]:
+        """
+        Вставляет записи одним запросом, обновляя существующие по конфликту
+        `index_elements`. Без `update_fields` конфликтующие записи пропускаются
+        и не попадают в результат.
+        """
+        if not data:
+            return []
+
+        stmt = pg_insert(self.model).values(data)
+        if update_fields:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements,
+                set_={field: stmt.excluded[field] for field in update_fields},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+
+        stmt = stmt.returning(self.model).execution_options(populate_existing=True)
+        result = await self.session.scalars(stmt)
+        return list(result.all())
 
     async def get_by_id(self, id: UUID) -> Any | None:
-        return await self.session.get(self.model, id)
+        cache = get_identity_cache() if self.cache_by_id else None
+        if cache is None:
+            return await self.session.get(self.model, id)
+
+        instance = await cache.get(self.session, self.model, id)
+        if instance is None:
+            instance = await self.session.get(self.model, id)
+            if instance is not None:
+                cache.put(self.model, id, instance)
+        return instance
 
     async def find_all(self, **filters) -> list[Any]:
-        stmt = select(self.model)
-
-        for field, value in filters.items():
-            if hasattr(self.model, field):
-                stmt = stmt.where(getattr(self.model, field) == value)
-
-        result = await self.session.execute(stmt)
+        stmt, params = self._filter_statement(filters)
+        result = await self.session.execute(stmt, params)
         return result.scalars().all()
 
     async def find_one(self, **filters) -> Any | None:
-        stmt = select(self.model)
+        stmt, params = self._filter_statement(filters)
+        result = await self.session.execute(stmt, params)
+        return result.scalar_one_or_none()
 
-        for field, value in filters.items():
-            if hasattr(self.model, field):
-                stmt = stmt.where(getattr(self.model, field) == value)
+    def _filter_statement(self, filters: dict) -> tuple[Select, dict]:
+        """
+        Возвращает SELECT с условиями равенства по известным модели полям
+        и параметры к нему. None сравнивается через IS NULL, булевы значения
+        подставляются литералом, чтобы работали частичные индексы.
+        """
+        fields = {
+            field: value
+            for field, value in filters.items()
+            if hasattr(self.model, field)
+        }
+        shape = tuple(
+            sorted((field, _filter_kind(value)) for field, value in fields.items())
+        )
+
+        stmt = _filter_statements.get((self.model, shape))
+        if stmt is None:
+            stmt = select(self.model)
+            for field, kind in shape:
+                column = getattr(self.model, field)
+                if kind == "null":
+                    stmt = stmt.where(column.is_(None))
+                else:
+                    stmt = stmt.where(
+                        column
+                        == bindparam(
+                            f"filter_{field}", literal_execute=kind == "literal"
+                        )
+                    )
+            _filter_statements[(self.model, shape)] = stmt
+
+        params = {
+            f"filter_{field}": value
+            for field, value in fields.items()
+            if value is not None
+        }
+        return stmt, params
+
+    async def find_page(
+        self, limit: int, after: tuple[datetime, UUID] | None = None
+    ) -> list[Any]:
+        """
+        Возвращает страницу записей по ключу (created_at, id) без OFFSET:
+        следующая страница начинается строго после позиции `after`.
+        """
+        stmt = (
+            select(self.model)
+            .order_by(self.model.created_at, self.model.id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(self.model.created_at, self.model.id) > tuple_(*after)
+            )
 
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
-
-    async def update(self, id: UUID, data: dict) -> Any | None:
-        instance = await self.get_by_id(id)
-        if not instance:
-            return None
+        return result.scalars().all()
 
-        for field, value in data.items():
-            if hasattr(instance, field):
-                setattr(instance, field, value)
+    async def stream_all(self, chunk_size: int = 500) -> AsyncIterator[list[Any]]:
+        """
+        Отдаёт все записи пачками через серверный курсор, не загружая
+        таблицу в память целиком. Требует открытой транзакции.
+        """
+        stmt = (
+            select(self.model)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream(stmt)
+
+        async for chunk in result.scalars().partitions():
+            yield chunk
 
-        await self.session.flush()
-        await self.session.refresh(instance)
-        return instance
+    async def update(self, id: UUID, data: dict) -> Any | None:
+        values = {
+            field: value for field, value in data.items() if hasattr(self.model, field)
+        }
+        if not values:
+            return await self.get_by_id(id)
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
 
     async def delete(self, id: UUID) -> bool:
         instance = await self.get_by_id(id)
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from sqlalchemy import delete, desc, func, or_, select, update
+from sqlalchemy import bindparam, delete, desc, func, literal, or_, select, update
 
 from app.db.models.chat_roulette_search import ChatRouletteSearch
 from app.db.models.chat_roulette_session import (
@@ -11,6 +11,25 @@ from app.db.models.chat_roulette_session import (
 from app.repositories.base import Repository
 
 
+def _inline_status(status: ChatRouletteSessionStatus):
+    """
+    Статус подставляется в SQL литералом, а не параметром: иначе планировщик
+    не может применить частичные индексы по статусу к подготовленному запросу.
+    """
+    return literal(status.value, literal_execute=True)
+
+
+# Горячие запросы собраны один раз: ключ кэша скомпилированного SQL
+# у готовой конструкции вычисляется однажды, при вызове меняются только параметры
+_active_session_by_profile = select(ChatRouletteSession).where(
+    or_(
+        ChatRouletteSession.profile1_id == bindparam("profile_id"),
+        ChatRouletteSession.profile2_id == bindparam("profile_id"),
+    ),
+    ChatRouletteSession.status == _inline_status(ChatRouletteSessionStatus.ACTIVE),
+)
+
+
 class ChatRouletteSessionRepository(Repository):
     model = ChatRouletteSession
 
@@ -18,7 +37,7 @@ class ChatRouletteSessionRepository(Repository):
         self, exclude_profile_id: UUID | None = None, limit: int = 10
     ) -> list[ChatRouletteSession]:
         stmt = select(self.model).where(
-            self.model.status == ChatRouletteSessionStatus.WAITING,
+            self.model.status == _inline_status(ChatRouletteSessionStatus.WAITING),
             self.model.profile2_id.is_(None),
         )
 
@@ -33,15 +52,9 @@ class ChatRouletteSessionRepository(Repository):
     async def find_active_session_by_profile(
         self, profile_id: UUID
     ) -> ChatRouletteSession | None:
-        stmt = select(self.model).where(
-            or_(
-                self.model.profile1_id == profile_id,
-                self.model.profile2_id == profile_id,
-            ),
-            self.model.status == ChatRouletteSessionStatus.ACTIVE,
+        result = await self.session.execute(
+            _active_session_by_profile, {"profile_id": profile_id}
         )
-
-        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def find_session_by_profile(
@@ -82,7 +95,7 @@ class ChatRouletteSessionRepository(Repository):
         stmt = (
             select(self.model, ChatRouletteSearch.priority_interest_ids)
             .where(
-                self.model.status == ChatRouletteSessionStatus.WAITING,
+                self.model.status == _inline_status(ChatRouletteSessionStatus.WAITING),
                 self.model.profile2_id.is_(None),
                 self.model.profile1_id != profile_id,
             )
@@ -1,31 +1,54 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import String, bindparam, select, update
 
 from app.db.models.interest import Interest
 from app.db.models.profile import Profile
 from app.db.models.profile_interest import ProfileInterest
 from app.repositories.base import Repository
 
+_profile_interests = (
+    select(Interest)
+    .join(ProfileInterest, ProfileInterest.interest_id == Interest.id)
+    .where(ProfileInterest.profile_id == bindparam("profile_id"))
+    .where(
+        Interest.name_translations[bindparam("language", type_=String)].astext.is_not(
+            None
+        )
+    )
+)
+
 
 class ProfileRepository(Repository):
     model = Profile
+    cache_by_id = True
 
     async def get_profile_interests(
         self, profile_id: UUID, accept_language: str = "en"
     ) -> list[Interest]:
-        stmt = (
-            select(Interest)
-            .join(ProfileInterest, ProfileInterest.interest_id == Interest.id)
-            .join(self.model, self.model.id == ProfileInterest.profile_id)
-            .where(self.model.id == profile_id)
-            .where(Interest.name_translations[accept_language].astext.is_not(None))
+        result = await self.session.execute(
+            _profile_interests,
+            {"profile_id": profile_id, "language": accept_language},
         )
-
-        result = await self.session.execute(stmt)
         return result.scalars().all()
 
     async def get_by_ids(self, profile_ids: list[UUID]) -> list[Profile]:
         stmt = select(self.model).where(self.model.id.in_(profile_ids))
         result = await self.session.execute(stmt)
         return result.scalars().all()
+
+    async def set_missing_avatar_versions(
+        self, profile_ids: list[UUID], avatar_version: int = 0
+    ) -> int:
+        """Проставляет версию аватарки профилям, у которых она не заполнена"""
+
+        stmt = (
+            update(self.model)
+            .where(
+                self.model.id.in_(profile_ids),
+                self.model.avatar_version.is_(None),
+            )
+            .values(avatar_version=avatar_version)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
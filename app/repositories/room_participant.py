@@ -1,12 +1,17 @@
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import and_, delete, desc, func, select, update
+from sqlalchemy import and_, bindparam, delete, desc, func, select, update
 
 from app.db.models.room_message import RoomMessage
 from app.db.models.room_participant import RoomParticipant, RoomParticipantRole
 from app.repositories.base import Repository
 
+_participant_by_ids = select(RoomParticipant).where(
+    RoomParticipant.room_id == bindparam("room_id"),
+    RoomParticipant.profile_id == bindparam("profile_id"),
+)
+
 
 class RoomParticipantRepository(Repository):
     model = RoomParticipant
@@ -28,10 +33,9 @@ class RoomParticipantRepository(Repository):
     async def get_participant(
         self, room_id: UUID, profile_id: UUID
     ) -> RoomParticipant | None:
-        stmt = select(self.model).where(
-            and_(self.model.room_id == room_id, self.model.profile_id == profile_id)
+        result = await self.session.execute(
+            _participant_by_ids, {"room_id": room_id, "profile_id": profile_id}
         )
-        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_room_participants(
@@ -111,25 +115,24 @@ class RoomParticipantRepository(Repository):
         await self.session.execute(stmt)
 
     async def get_room_counts(self, room_id: UUID) -> tuple[int, int]:
-        participants_stmt = (
+        participants_count = (
             select(func.count())
             .select_from(RoomParticipant)
             .where(
                 RoomParticipant.room_id == room_id, RoomParticipant.is_banned == False
             )
+            .scalar_subquery()
         )
-        participants_result = await self.session.execute(participants_stmt)
-        participants_count = participants_result.scalar() or 0
-
-        messages_stmt = (
+        messages_count = (
             select(func.count())
             .select_from(RoomMessage)
             .where(RoomMessage.room_id == room_id, RoomMessage.is_deleted == False)
+            .scalar_subquery()
         )
-        messages_result = await self.session.execute(messages_stmt)
-        messages_count = messages_result.scalar() or 0
 
-        return participants_count, messages_count
+        result = await self.session.execute(select(participants_count, messages_count))
+        participants, messages = result.one()
+        return participants or 0, messages or 0
 
     async def count_rooms_for_profile(self, profile_id: UUID) -> int:
         stmt = select(func.count()).where(
@@ -4,3 +4,4 @@ from app.repositories.base import Repository
 
 class UserRepository(Repository):
     model = User
+    cache_by_id = True
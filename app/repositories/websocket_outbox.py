@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, or_, select, update
+
+from app.db.models.websocket_outbox import WebSocketOutboxEvent
+from app.repositories.base import Repository
+
+
+class WebSocketOutboxRepository(Repository):
+    model = WebSocketOutboxEvent
+
+    async def claim_pending(
+        self, limit: int, max_attempts: int
+    ) -> list[WebSocketOutboxEvent]:
+        """
+        Забирает пачку неразосланных событий по порядку записи. Строки
+        блокируются до конца транзакции, занятые другим диспетчером пропускаются;
+        после фиксации блокировки снимаются, поэтому одновременно события
+        должен забирать только один диспетчер.
+        """
+        stmt = (
+            select(self.model)
+            .where(
+                self.model.dispatched_at.is_(None),
+                self.model.attempts < max_attempts,
+            )
+            .order_by(self.model.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def mark_dispatched(self, event_ids: list[int]) -> None:
+        if not event_ids:
+            return
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(event_ids))
+            .values(dispatched_at=datetime.now(timezone.utc))
+        )
+        await self.session.execute(stmt)
+
+    async def mark_failed(self, event_ids: list[int]) -> None:
+        if not event_ids:
+            return
+
+        stmt = (
+            update(self.model)
+            .where(self.model.id.in_(event_ids))
+            .values(attempts=self.model.attempts + 1)
+        )
+        await self.session.execute(stmt)
+
+    async def delete_finished_before(self, cutoff: datetime, max_attempts: int) -> int:
+        """Удаляет разосланные и исчерпавшие попытки события старше `cutoff`"""
+
+        stmt = delete(self.model).where(
+            self.model.created_at < cutoff,
+            or_(
+                self.model.dispatched_at.is_not(None),
+                self.model.attempts >= max_attempts,
+            ),
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
@@ -2,6 +2,8 @@ import asyncio
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
+from sqlalchemy.exc import IntegrityError
+
 from app.core.exceptions.chat_roulette import (
     AlreadyInSearchError,
     AlreadyInSessionError,
@@ -72,6 +74,7 @@ class ChatRouletteService:
 
         Raises:
             ProfileNotFoundError: Если профиль не найден
+            AlreadyInSearchError: Если параллельный запрос уже начал поиск для профиля
             AlreadyInSessionError: Если у профиля уже есть активная сессия
             NoMatchingFoundError: Если не найдено совпадений за отведённое время
         """
@@ -87,10 +90,15 @@ class ChatRouletteService:
             )
             if existing_search:
                 await uow.chat_roulette_search.deactivate_search(profile_id)
-                existing_session = await uow.chat_roulette_session.find_session_by_profile(
-                    profile_id, include_completed=False
+                existing_session = (
+                    await uow.chat_roulette_session.find_session_by_profile(
+                        profile_id, include_completed=False
+                    )
                 )
-                if existing_session and existing_session.status == ChatRouletteSessionStatus.WAITING:
+                if (
+                    existing_session
+                    and existing_session.status == ChatRouletteSessionStatus.WAITING
+                ):
                     await uow.chat_roulette_session.update_session_status(
                         existing_session.id,
                         ChatRouletteSessionStatus.CANCELLED,
@@ -109,10 +117,16 @@ class ChatRouletteService:
             if existing_session:
                 raise AlreadyInSessionError()
 
-            search = await uow.chat_roulette_search.create_or_update_search(
-                profile_id=profile_id,
-                priority_interest_ids=search_request.priority_interest_ids,
-            )
+            # Уникальные частичные индексы допускают один активный поиск
+            # и одну активную сессию на профиль: проигравший гонку
+            # параллельный запрос получает IntegrityError
+            try:
+                search = await uow.chat_roulette_search.create_or_update_search(
+                    profile_id=profile_id,
+                    priority_interest_ids=search_request.priority_interest_ids,
+                )
+            except IntegrityError:
+                raise AlreadyInSearchError()
 
             matched = await self._try_match_profile(
                 uow,
@@ -133,23 +147,29 @@ class ChatRouletteService:
                     )
                 )
 
-                if waiting_session:
-                    started_session = await uow.chat_roulette_session.start_session(
-                        waiting_session.id, partner_profile_id, matched_interest_id
-                    )
-                else:
-                    session_data = {
-                        "profile1_id": profile_id,
-                        "profile2_id": partner_profile_id,
-                        "matched_interest_id": matched_interest_id,
-                        "status": ChatRouletteSessionStatus.ACTIVE,
-                        "duration_minutes": 5,
-                        "started_at": datetime.now(timezone.utc),
-                        "expires_at": datetime.now(timezone.utc) + timedelta(minutes=5),
-                    }
-                    started_session = await uow.chat_roulette_session.add_one(
-                        session_data
-                    )
+                try:
+                    if waiting_session:
+                        started_session = await uow.chat_roulette_session.start_session(
+                            waiting_session.id,
+                            partner_profile_id,
+                            matched_interest_id,
+                        )
+                    else:
+                        session_data = {
+                            "profile1_id": profile_id,
+                            "profile2_id": partner_profile_id,
+                            "matched_interest_id": matched_interest_id,
+                            "status": ChatRouletteSessionStatus.ACTIVE,
+                            "duration_minutes": 5,
+                            "started_at": datetime.now(timezone.utc),
+                            "expires_at": datetime.now(timezone.utc)
+                            + timedelta(minutes=5),
+                        }
+                        started_session = await uow.chat_roulette_session.add_one(
+                            session_data
+                        )
+                except IntegrityError:
+                    raise AlreadyInSessionError()
 
                 await uow.chat_roulette_search.deactivate_search(profile_id)
                 await uow.chat_roulette_search.deactivate_search(partner_profile_id)
@@ -214,7 +234,7 @@ class ChatRouletteService:
                 await uow.chat_roulette_search.deactivate_search(profile_id)
                 await uow.commit()
                 raise NoMatchingFoundError()
-        
+
     async def cancel_search(self, profile_id: UUID) -> bool:
         """
         Отменяет активный поиск партнёра для указанного профиля.
@@ -358,8 +378,6 @@ class ChatRouletteService:
                 }
             )
 
-            await uow.commit()
-
             message_response = ChatRouletteMessageResponse(
                 session_id=session.id,
                 sender_id=profile_id,
@@ -367,14 +385,14 @@ class ChatRouletteService:
                 created_at=message.created_at,
             )
 
-            try:
-                await self.wcrs.broadcast_message_sent(
-                    session.id, message_response.model_dump(), profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о новом сообщении: {e}"
-                )
+            await uow.publish(
+                "chat_roulette",
+                "broadcast_message_sent",
+                session.id,
+                message_response.model_dump(),
+                profile_id,
+            )
+            await uow.commit()
 
             return message_response
 
@@ -470,37 +488,28 @@ class ChatRouletteService:
             }
 
             await uow.chat_roulette_session.update(session.id, update_data)
-            await uow.commit()
 
-            if is_profile1 and not session.extension_approved_by_profile2:
-                try:
-                    await self.wcrs.broadcast_extension_request(
-                        session.id, profile_id, partner_profile_id
-                    )
-                except Exception as e:
-                    app_logger.error(
-                        f"Ошибка при отправке WebSocket уведомления о запросе продления: {e}"
-                    )
-                raise ExtensionNotApprovedError()
-            elif not is_profile1 and not session.extension_approved_by_profile1:
-                try:
-                    await self.wcrs.broadcast_extension_request(
-                        session.id, profile_id, partner_profile_id
-                    )
-                except Exception as e:
-                    app_logger.error(
-                        f"Ошибка при отправке WebSocket уведомления о запросе продления: {e}"
-                    )
+            if (is_profile1 and not session.extension_approved_by_profile2) or (
+                not is_profile1 and not session.extension_approved_by_profile1
+            ):
+                await uow.publish(
+                    "chat_roulette",
+                    "broadcast_extension_request",
+                    session.id,
+                    profile_id,
+                    partner_profile_id,
+                )
+                await uow.commit()
                 raise ExtensionNotApprovedError()
 
-            try:
-                await self.wcrs.broadcast_extension_approved(
-                    session.id, profile_id, partner_profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления об утверждении продления: {e}"
-                )
+            await uow.publish(
+                "chat_roulette",
+                "broadcast_extension_approved",
+                session.id,
+                profile_id,
+                partner_profile_id,
+            )
+            await uow.commit()
 
             extended_session = await uow.chat_roulette_session.extend_session(
                 session.id, fixed_extension_minutes
@@ -514,28 +523,22 @@ class ChatRouletteService:
                 "extension_approved_by_profile2": False,
             }
             await uow.chat_roulette_session.update(session.id, reset_data)
+            await uow.publish(
+                "chat_roulette",
+                "broadcast_session_extended",
+                session.id,
+                profile_id,
+                fixed_extension_minutes,
+                extended_session.expires_at,
+            )
             await uow.commit()
 
-            response = SessionExtendResponse(
+            return SessionExtendResponse(
                 session_id=session.id,
                 extended_minutes=fixed_extension_minutes,
                 new_expires_at=extended_session.expires_at.isoformat(),
             )
 
-            try:
-                await self.wcrs.broadcast_session_extended(
-                    session.id,
-                    profile_id,
-                    fixed_extension_minutes,
-                    extended_session.expires_at,
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о продлении сессии: {e}"
-                )
-
-            return response
-
     async def reject_extension(self, profile_id: UUID) -> None:
         """
         Отказывает в продлении сессии чат-рулетки (вызывается партнёром).
@@ -571,10 +574,15 @@ class ChatRouletteService:
                     "extension_approved_by_profile2": False,
                 },
             )
+            await uow.publish(
+                "chat_roulette",
+                "broadcast_extension_rejected",
+                session.id,
+                profile_id,
+                partner_id,
+            )
             await uow.commit()
 
-        await self.wcrs.broadcast_extension_rejected(session.id, profile_id, partner_id)
-
     async def cancel_extension_request(self, profile_id: UUID) -> None:
         """
         Отменяет собственный запрос на продление сессии (вызывается инициатором)
@@ -609,12 +617,15 @@ class ChatRouletteService:
                 ),
             }
             await uow.chat_roulette_session.update(session.id, update_data)
+            await uow.publish(
+                "chat_roulette",
+                "broadcast_extension_cancelled",
+                session.id,
+                profile_id,
+                partner_id,
+            )
             await uow.commit()
 
-        await self.wcrs.broadcast_extension_cancelled(
-            session.id, profile_id, partner_id
-        )
-
     async def end_session(self, profile_id: UUID, reason: str) -> bool:
         """
         Завершает активную сессию чат-рулетки с указанием причины.
@@ -652,18 +663,16 @@ class ChatRouletteService:
             await uow.chat_roulette_session.update_session_status(
                 session.id, ChatRouletteSessionStatus.LEFT, full_reason
             )
+            await uow.publish(
+                "chat_roulette",
+                "broadcast_session_ended",
+                session.id,
+                profile_id,
+                full_reason,
+            )
 
             await uow.commit()
 
-            try:
-                await self.wcrs.broadcast_session_ended(
-                    session.id, profile_id, full_reason
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о завершении сессии: {e}"
-                )
-
             return True
 
     async def rate_partner(
@@ -797,6 +806,13 @@ class ChatRouletteService:
                     "details": report_request.details,
                 }
             )
+            await uow.publish(
+                "chat_roulette",
+                "broadcast_session_ended",
+                session.id,
+                profile_id,
+                full_reason,
+            )
 
             await uow.commit()
 
@@ -804,15 +820,6 @@ class ChatRouletteService:
                 f"Профиль {profile_id} пожаловался на {partner_profile_id}: {report_request.reason} - {report_request.details}"
             )
 
-            try:
-                await self.wcrs.broadcast_session_ended(
-                    session.id, profile_id, full_reason
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о репорте сессии: {e}"
-                )
-
             return True
 
     async def _try_match_profile(
@@ -988,9 +995,18 @@ class ChatRouletteService:
                         )
                     )
 
-                    started_session = await uow.chat_roulette_session.start_session(
-                        waiting_session.id, partner_profile_id, matched_interest_id
-                    )
+                    try:
+                        started_session = await uow.chat_roulette_session.start_session(
+                            waiting_session.id,
+                            partner_profile_id,
+                            matched_interest_id,
+                        )
+                    except IntegrityError:
+                        # Партнёра уже забрала другая сессия: пробуем снова
+                        await uow.rollback()
+                        if attempt < 9:
+                            await asyncio.sleep(2)
+                        continue
 
                     await uow.chat_roulette_search.deactivate_search(profile_id)
                     await uow.chat_roulette_search.deactivate_search(partner_profile_id)
@@ -1029,14 +1045,14 @@ class ChatRouletteService:
         Returns:
             list[UUID]: Список идентификаторов общих интересов
         """
-        async with UnitOfWork() as uow:
-            profile1_interests = await uow.profile.get_profile_interests(profile1_id)
-            profile1_interest_ids = {interest.id for interest in profile1_interests}
-
-            profile2_interests = await uow.profile.get_profile_interests(profile2_id)
-            profile2_interest_ids = {interest.id for interest in profile2_interests}
+        profile1_interests, profile2_interests = await self.uow.gather_reads(
+            lambda uow: uow.profile.get_profile_interests(profile1_id),
+            lambda uow: uow.profile.get_profile_interests(profile2_id),
+        )
+        profile1_interest_ids = {interest.id for interest in profile1_interests}
+        profile2_interest_ids = {interest.id for interest in profile2_interests}
 
-            return list(profile1_interest_ids.intersection(profile2_interest_ids))
+        return list(profile1_interest_ids.intersection(profile2_interest_ids))
 
     async def _enrich_session_response(
         self, session, profile_id: UUID, partner_profile=None, common_interests=None
@@ -1073,7 +1089,9 @@ class ChatRouletteService:
         response["partner_online"] = partner_online
 
         if partner_profile:
-            avatar_url = await self.oss.get_avatar_url(partner_profile.id)
+            avatar_url = await self.oss.get_avatar_url(
+                partner_profile.id, partner_profile.avatar_version
+            )
             response["matched_profile"] = {
                 "id": partner_profile.id,
                 "username": partner_profile.username,
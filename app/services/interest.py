@@ -1,9 +1,7 @@
-from sqlalchemy import UUID
+from uuid import UUID
 
-from app.core.exceptions.interest import InterestNotFoundError
-from app.core.logger import app_logger
 from app.db.unit_of_work import UnitOfWork
-from app.schemas.interest import InterestResponse
+from app.utils.interest_catalog import InterestCatalog, LocalizedInterests
 
 
 class InterestService:
@@ -11,37 +9,30 @@ class InterestService:
     Сервис для работы с интересами профилей.
 
     Обеспечивает доступ к мультиязычным интересам для профилей пользователей.
+    Интересы отдаются из каталога в памяти (`InterestCatalog`); база
+    читается только при первой загрузке каталога.
     """
 
-    def __init__(self, uow: UnitOfWork):
+    def __init__(self, uow: UnitOfWork, catalog: InterestCatalog):
         self.uow = uow
+        self.catalog = catalog
 
-    async def get_interests(self, accept_language: str) -> list[InterestResponse]:
+    async def get_interests(self, accept_language: str) -> LocalizedInterests:
         """
-        Возвращает список всех интересов с локализацией для указанного языка.
+        Возвращает все интересы с локализацией для указанного языка.
 
         Args:
             accept_language: Код языка для локализации названий интересов
 
         Returns:
-            list[InterestResponse]: Список интересов с локализованными названиями
+            LocalizedInterests: Сериализованный список интересов и его ETag
         """
-        app_logger.info("Получение всех интересов")
-        async with self.uow as uow:
-            interests = await uow.interest.find_all_with_localization(accept_language)
-            interests_to_return = [
-                InterestResponse(
-                    id=interest.id, name=interest.name_translations[accept_language]
-                )
-                for interest in interests
-            ]
-
-            app_logger.info(f"Найдено {len(interests_to_return)} интересов")
-            return interests_to_return
+        await self.catalog.load(self.uow)
+        return self.catalog.get(accept_language)
 
     async def get_interests_by_ids(
         self, interest_ids: list[UUID], accept_language: str
-    ) -> list[InterestResponse]:
+    ) -> bytes:
         """
         Возвращает локализованные интересы по списку идентификаторов.
 
@@ -52,25 +43,10 @@ class InterestService:
             accept_language: Код языка для локализации названий
 
         Returns:
-            list[InterestResponse]: Список интересов с переведёнными названиями
+            bytes: JSON-список интересов с переведёнными названиями
 
         Raises:
             InterestNotFoundError: Если хотя бы один из идентификаторов не найден
         """
-        app_logger.info(f"Получение интересов по IDs: {interest_ids}")
-        async with self.uow as uow:
-            interests = await uow.interest.get_by_ids_with_localization(
-                interest_ids, accept_language
-            )
-            found_ids = {i.id for i in interests}
-            missing = set(interest_ids) - found_ids
-            if missing:
-                raise InterestNotFoundError(f"Interests not found: {missing}")
-
-            return [
-                InterestResponse(
-                    id=interest.id,
-                    name=interest.name_translations[accept_language],
-                )
-                for interest in interests
-            ]
+        await self.catalog.load(self.uow)
+        return self.catalog.get(accept_language).select(interest_ids)
@@ -1,6 +1,11 @@
+from typing import AsyncIterator
 from uuid import UUID
 
-from app.core.exceptions.file import FileTooLargeError, UnsupportedMediaTypeError
+from fastapi import UploadFile
+
+from app.core.auth import profile_ownership_cache
+from app.core.config import settings
+from app.core.exceptions.file import UnsupportedMediaTypeError
 from app.core.exceptions.interest import InterestNotFoundError
 from app.core.exceptions.profile import (
     ProfileAlreadyExistsError,
@@ -18,7 +23,10 @@ from app.schemas.profile import (
     ProfileUpdate,
 )
 from app.schemas.profile_interest import ProfileInterestAdd, ProfileInterestDelete
+from app.utils.image_processing import avatar_processor
 from app.utils.object_storage import ObjectStorageService
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.upload import spool_upload
 
 
 class ProfileService:
@@ -64,12 +72,16 @@ class ProfileService:
             app_logger.info(f"Профиль создан с ID: {profile_to_return.id}")
             return profile_to_return
 
-    async def get_profile(self, profile_id: UUID) -> ProfileResponse:
+    async def get_profile(
+        self, profile_id: UUID, avatar_variant: str | None = None
+    ) -> ProfileResponse:
         """
         Возвращает информацию о профиле по его идентификатору.
 
         Args:
             profile_id: Идентификатор профиля
+            avatar_variant: Вариант аватарки в ответе, например "64.webp"
+                (по умолчанию — из настроек)
 
         Returns:
             ProfileResponse: Данные профиля, включая URL аватарки
@@ -84,19 +96,23 @@ class ProfileService:
                 raise ProfileNotFoundError(profile_id)
 
             profile_to_return = ProfileResponse.model_validate(profile)
-            profile_to_return.avatar_url = await self.oss.get_avatar_url(profile.id)
+            profile_to_return.avatar_url = await self.oss.get_avatar_url(
+                profile.id, profile.avatar_version, avatar_variant
+            )
 
             app_logger.info(f"Профиль {profile_id} найден")
             return profile_to_return
 
     async def get_profiles_by_ids(
-        self, profile_ids: list[UUID]
+        self, profile_ids: list[UUID], avatar_variant: str | None = None
     ) -> list[ProfileResponse]:
         """
         Возвращает профили по списку идентификаторов.
 
         Args:
             profile_ids: Список UUID профилей
+            avatar_variant: Вариант аватарки в ответе, например "64.webp"
+                (по умолчанию — из настроек)
 
         Returns:
             list[ProfileResponse]: Список найденных профилей с URL аватарок
@@ -104,43 +120,92 @@ class ProfileService:
         app_logger.info(f"Получение профилей по IDs: {profile_ids}")
         async with self.uow as uow:
             profiles = await uow.profile.get_by_ids(profile_ids)
-            ids = [profile.id for profile in profiles]
-            avatar_urls = await self.oss.list_avatars(ids)
-
-            profiles_to_return = []
-            for profile in profiles:
-                profile_to_return = ProfileResponse.model_validate(profile)
-                profile_to_return.avatar_url = avatar_urls.get(profile.id)
-                profiles_to_return.append(profile_to_return)
+            profiles_to_return = await self._with_avatars(profiles, avatar_variant)
 
             app_logger.info(f"Найдено {len(profiles_to_return)} профилей по IDs")
             return profiles_to_return
 
-    async def get_profiles(self) -> list[ProfileResponse]:
+    async def get_profiles(
+        self,
+        limit: int = 50,
+        cursor: str | None = None,
+        avatar_variant: str | None = None,
+    ) -> tuple[list[ProfileResponse], str | None]:
         """
-        Возвращает список всех профилей в системе.
+        Возвращает страницу профилей в порядке создания.
+
+        Args:
+            limit: Максимальное количество профилей на странице
+            cursor: Курсор следующей страницы из предыдущего ответа
+            avatar_variant: Вариант аватарки в ответе, например "64.webp"
+                (по умолчанию — из настроек)
 
         Returns:
-            list[ProfileResponse]: Список профилей с URL аватарок
+            tuple[list[ProfileResponse], str | None]: Профили с URL аватарок
+            и курсор следующей страницы (None, если страница последняя)
+        """
+        app_logger.info(f"Получение страницы профилей: limit={limit}")
+        after = decode_cursor(cursor) if cursor else None
+
+        async with self.uow.for_reading() as uow:
+            profiles = await uow.profile.find_page(limit + 1, after)
+
+        next_cursor = None
+        if len(profiles) > limit:
+            profiles = profiles[:limit]
+            next_cursor = encode_cursor(profiles[-1].created_at, profiles[-1].id)
+
+        profiles_to_return = await self._with_avatars(profiles, avatar_variant)
+
+        app_logger.info(f"Найдено {len(profiles)} профилей")
+        return profiles_to_return, next_cursor
+
+    async def stream_profiles(
+        self, chunk_size: int = 500
+    ) -> AsyncIterator[ProfileResponse]:
+        """
+        Отдаёт все профили по одному, читая таблицу пачками через серверный
+        курсор, чтобы память не зависела от размера таблицы.
+
+        Args:
+            chunk_size: Количество строк, получаемых из базы за раз
+
+        Yields:
+            ProfileResponse: Профиль с URL аватарки
         """
-        app_logger.info("Получение всех профилей")
+        app_logger.info("Потоковая выгрузка профилей")
+        exported = 0
+
         async with self.uow as uow:
-            profiles = await uow.profile.find_all()
-            profile_ids = [profile.id for profile in profiles]
-            avatar_urls = await self.oss.list_avatars(profile_ids)
+            async for profiles in uow.profile.stream_all(chunk_size):
+                for profile_to_return in await self._with_avatars(profiles):
+                    yield profile_to_return
+                exported += len(profiles)
 
-            profiles_to_return = []
-            for profile in profiles:
-                profile_to_return = ProfileResponse.model_validate(profile)
-                profile_to_return.avatar_url = avatar_urls.get(profile.id)
+        app_logger.info(f"Выгружено {exported} профилей")
 
-                profiles_to_return.append(profile_to_return)
+    async def _with_avatars(
+        self, profiles, avatar_variant: str | None = None
+    ) -> list[ProfileResponse]:
+        avatar_urls = await self.oss.list_avatars(
+            {profile.id: profile.avatar_version for profile in profiles},
+            avatar_variant,
+        )
 
-            app_logger.info(f"Найдено {len(profiles)} профилей")
-            return profiles_to_return
+        profiles_to_return = []
+        for profile in profiles:
+            profile_to_return = ProfileResponse.model_validate(profile)
+            profile_to_return.avatar_url = avatar_urls.get(profile.id)
+
+            profiles_to_return.append(profile_to_return)
+
+        return profiles_to_return
 
     async def update_profile(
-        self, profile_id: UUID, profile_update: ProfileUpdate
+        self,
+        profile_id: UUID,
+        profile_update: ProfileUpdate,
+        avatar_variant: str | None = None,
     ) -> ProfileResponse:
         """
         Обновляет данные профиля (биографию, интересы, настройки и др.).
@@ -148,6 +213,8 @@ class ProfileService:
         Args:
             profile_id: Идентификатор профиля
             profile_update: Данные для обновления
+            avatar_variant: Вариант аватарки в ответе, например "64.webp"
+                (по умолчанию — из настроек)
 
         Returns:
             ProfileResponse: Обновлённая информация о профиле
@@ -174,7 +241,9 @@ class ProfileService:
             updated_profile = await uow.profile.update(profile.id, update_dict)
 
             profile_to_return = ProfileResponse.model_validate(updated_profile)
-            profile_to_return.avatar_url = await self.oss.get_avatar_url(profile.id)
+            profile_to_return.avatar_url = await self.oss.get_avatar_url(
+                profile.id, updated_profile.avatar_version, avatar_variant
+            )
 
             await uow.commit()
 
@@ -183,21 +252,27 @@ class ProfileService:
 
     async def upload_avatar(
         self,
-        file_data: bytes,
-        content_type: str,
+        file: UploadFile,
         profile_id: UUID | None = None,
         username: str | None = None,
         user_id: UUID | None = None,
+        avatar_variant: str | None = None,
     ) -> ProfileAvatarResponse:
         """
-        Загружает аватарку для профиля в объектное хранилище.
+        Загружает аватарку для профиля в объектное хранилище. Изображение
+        декодируется, очищается от метаданных и сохраняется вариантами
+        нескольких размеров в WebP и JPEG.
+
+        Файл читается по частям во временный файл на диске, поэтому
+        в памяти процесса загрузка целиком не держится.
 
         Args:
             profile_id: Идентификатор профиля (опционально)
             username: Имя профиля (опционально)
-            file_data: Двоичные данные файла аватарки
-            content_type: MIME-тип файла (например, 'image/jpeg')
+            file: Загруженный файл аватарки
             user_id: Идентификатор пользователя (опционально, для проверки принадлежности профиля)
+            avatar_variant: Вариант аватарки в ответе, например "64.webp"
+                (по умолчанию — из настроек)
 
         Returns:
             ProfileAvatarResponse: URL загруженной аватарки
@@ -206,38 +281,54 @@ class ProfileService:
             ProfileNotFoundError: Если профиль не найден
             ProfilePermissionError: Если профиль принадлежит другому пользователю
             UnsupportedMediaTypeError: Если файл не является изображением
-            FileTooLargeError: Если размер файла превышает 5MB
+            FileTooLargeError: Если размер файла превышает `AVATAR_MAX_UPLOAD_BYTES`
         """
         if not profile_id and not username:
             raise ValueError("Either profile_id or username must be provided")
 
+        if not (file.content_type or "").startswith("image/"):
+            raise UnsupportedMediaTypeError("File must be an image")
+
         app_logger.info(f"Загрузка аватарки для профиля: {profile_id or username}")
-        async with self.uow as uow:
+        # Профиль и права проверяются до чтения и обработки файла, чтобы
+        # чужой или несуществующий профиль не стоил серверу масштабирования
+        async with self.uow.for_reading() as uow:
             if username:
                 profile = await uow.profile.find_one(username=username)
                 if not profile:
                     raise ProfileNotFoundError(username)
                 if user_id and profile.user_id != user_id:
-                    raise ProfilePermissionError(profile_id)
+                    raise ProfilePermissionError(profile.id)
                 profile_id = profile.id
-            else:
-                profile = await uow.profile.get_by_id(profile_id)
-                if not profile:
-                    raise ProfileNotFoundError(profile_id)
+            elif not await uow.profile.get_by_id(profile_id):
+                raise ProfileNotFoundError(profile_id)
 
-            if not content_type.startswith("image/"):
-                raise UnsupportedMediaTypeError("File must be an image")
+        # Обработка изображения и загрузка в хранилище выполняются вне
+        # сессии, чтобы не держать соединение с базой на время масштабирования
+        async with spool_upload(
+            file,
+            max_size=settings.AVATAR_MAX_UPLOAD_BYTES,
+            chunk_size=settings.AVATAR_UPLOAD_CHUNK_SIZE,
+        ) as file_path:
+            variants = await avatar_processor.process(file_path)
 
-            if len(file_data) > 5 * 1024 * 1024:
-                raise FileTooLargeError("File is too large. Maximum size: 5MB")
+        await self.oss.upload_avatar(profile_id, variants)
 
-            avatar_url = await self.oss.upload_avatar(profile_id, file_data)
+        async with self.uow as uow:
+            profile = await uow.profile.get_by_id(profile_id)
+            if not profile:
+                # Профиль удалён, пока обрабатывалось изображение
+                await self.oss.delete_avatar(profile_id)
+                raise ProfileNotFoundError(profile_id)
 
-            avatar_to_return = ProfileAvatarResponse.model_validate(
-                {"avatar_url": avatar_url}
-            )
+            avatar_version = (profile.avatar_version or 0) + 1
+            await uow.profile.update(profile_id, {"avatar_version": avatar_version})
+            await uow.commit()
 
-            return avatar_to_return
+        avatar_url = await self.oss.get_avatar_url(
+            profile_id, avatar_version, avatar_variant
+        )
+        return ProfileAvatarResponse.model_validate({"avatar_url": avatar_url})
 
     async def delete_avatar(self, profile_id: UUID) -> None:
         """
@@ -256,6 +347,8 @@ class ProfileService:
                 raise ProfileNotFoundError(profile_id)
 
             await self.oss.delete_avatar(profile_id)
+            await uow.profile.update(profile_id, {"avatar_version": None})
+            await uow.commit()
 
     async def delete_profile(self, profile_id: UUID) -> None:
         """
@@ -273,25 +366,26 @@ class ProfileService:
             if not profile:
                 raise ProfileNotFoundError(profile_id)
 
-            existing_avatar = await self.oss.avatar_exists(profile_id)
-
-            if existing_avatar:
+            if profile.avatar_version is not None:
                 await self.oss.delete_avatar(profile_id)
-            else:
-                app_logger.warning(f"Не удалось удалить аватарку профиля {profile_id}")
 
             await uow.profile_interest.delete_by_profile_id(profile_id)
             await uow.profile.delete(profile_id)
             await uow.commit()
+            profile_ownership_cache.invalidate(profile_id)
 
             app_logger.info(f"Профиль {profile_id} удален")
 
-    async def get_user_profiles(self, user_id: UUID) -> list[ProfileResponse]:
+    async def get_user_profiles(
+        self, user_id: UUID, avatar_variant: str | None = None
+    ) -> list[ProfileResponse]:
         """
         Возвращает все профили, принадлежащие одному пользователю.
 
         Args:
             user_id: Идентификатор пользователя
+            avatar_variant: Вариант аватарки в ответе, например "64.webp"
+                (по умолчанию — из настроек)
 
         Returns:
             list[ProfileResponse]: Список профилей пользователя
@@ -299,15 +393,7 @@ class ProfileService:
         app_logger.info(f"Получение всех профилей пользователя с ID: {user_id}")
         async with self.uow as uow:
             profiles = await uow.profile.find_all(user_id=user_id)
-            profile_ids = [profile.id for profile in profiles]
-            avatar_urls = await self.oss.list_avatars(profile_ids)
-
-            profiles_to_return = []
-            for profile in profiles:
-                profile_to_return = ProfileResponse.model_validate(profile)
-                profile_to_return.avatar_url = avatar_urls.get(profile.id)
-
-                profiles_to_return.append(profile_to_return)
+            profiles_to_return = await self._with_avatars(profiles, avatar_variant)
 
             app_logger.info(
                 f"Найдено {len(profiles)} профилей для пользователя с ID {user_id}"
@@ -448,6 +534,7 @@ class ProfileService:
     async def validate_profile_ownership(self, profile_id: UUID, user_id: UUID) -> None:
         """
         Проверяет, принадлежит ли профиль указанному пользователю.
+        Владелец профиля кэшируется, повторная проверка не обращается к базе.
 
         Args:
             profile_id: Идентификатор профиля
@@ -460,13 +547,18 @@ class ProfileService:
         app_logger.info(
             f"Проверка принадлежности профиля {profile_id} пользователю {user_id}"
         )
-        async with self.uow as uow:
-            profile = await uow.profile.get_by_id(profile_id)
-            if not profile:
-                raise ProfileNotFoundError(str(profile_id))
+        owner_id = profile_ownership_cache.get(profile_id)
+        if owner_id is None:
+            async with self.uow as uow:
+                profile = await uow.profile.get_by_id(profile_id)
+                if not profile:
+                    raise ProfileNotFoundError(str(profile_id))
 
-            if profile.user_id != user_id:
-                raise ProfilePermissionError(str(profile_id))
+                owner_id = profile.user_id
+            profile_ownership_cache.put(profile_id, owner_id)
+
+        if owner_id != user_id:
+            raise ProfilePermissionError(str(profile_id))
 
     async def get_profile_statistics(
         self, profile_id: UUID
@@ -485,18 +577,18 @@ class ProfileService:
         Returns:
             ProfileStatisticsResponse: объект с total_sessions, reputation_score, total_rooms
         """
-        async with self.uow as uow:
-            profile = await uow.profile.get_by_id(profile_id)
-            if not profile:
-                raise ProfileNotFoundError(profile_id)
-
-            total_sessions = (
-                await uow.chat_roulette_session.get_total_completed_sessions(profile_id)
-            )
-            total_rooms = await uow.room_participant.count_rooms_for_profile(profile_id)
+        profile, total_sessions, total_rooms = await self.uow.gather_reads(
+            lambda uow: uow.profile.get_by_id(profile_id),
+            lambda uow: uow.chat_roulette_session.get_total_completed_sessions(
+                profile_id
+            ),
+            lambda uow: uow.room_participant.count_rooms_for_profile(profile_id),
+        )
+        if not profile:
+            raise ProfileNotFoundError(profile_id)
 
-            return ProfileStatisticsResponse(
-                total_sessions=total_sessions,
-                reputation_score=profile.reputation_score,
-                total_rooms=total_rooms,
-            )
+        return ProfileStatisticsResponse(
+            total_sessions=total_sessions,
+            reputation_score=profile.reputation_score,
+            total_rooms=total_rooms,
+        )
@@ -177,7 +177,7 @@ class RoomService:
             f"Поиск комнат: query={query}, interest_ids={interest_ids}, my_rooms={my_rooms}"
         )
 
-        async with self.uow as uow:
+        async with self.uow.for_reading() as uow:
             rooms = await uow.room.search_rooms(
                 query=query,
                 interest_ids=interest_ids,
@@ -278,10 +278,6 @@ class RoomService:
                 await uow.room_participant.get_room_counts(room_id)
             )
 
-            await uow.commit()
-
-            app_logger.info(f"Комната {room_id} обновлена")
-
             room_response = RoomResponse(
                 id=updated_room.id,
                 name=updated_room.name,
@@ -299,14 +295,16 @@ class RoomService:
                 is_banned=False,
             )
 
-            try:
-                await self.wrs.broadcast_room_update(
-                    room_id, room_response.model_dump(), profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления об обновлении комнаты: {e}"
-                )
+            await uow.publish(
+                "room",
+                "broadcast_room_update",
+                room_id,
+                room_response.model_dump(),
+                profile_id,
+            )
+            await uow.commit()
+
+            app_logger.info(f"Комната {room_id} обновлена")
 
             return room_response
 
@@ -333,17 +331,11 @@ class RoomService:
                 raise RoomPermissionError("Only room creator can delete room")
 
             await uow.room.delete(room_id)
+            await uow.publish("room", "broadcast_room_deleted", room_id, profile_id)
             await uow.commit()
 
             app_logger.info(f"Комната {room_id} удалена")
 
-            try:
-                await self.wrs.broadcast_room_deleted(room_id, profile_id)
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления об удалении комнаты: {e}"
-                )
-
     async def join_room(self, room_id: UUID, profile_id: UUID) -> RoomResponse:
         """
         Добавляет пользователя в комнату в качестве участника.
@@ -392,17 +384,13 @@ class RoomService:
                 await uow.room_participant.get_room_counts(room_id)
             )
 
+            await uow.publish(
+                "room", "broadcast_participant_joined", room_id, profile_id
+            )
             await uow.commit()
 
             app_logger.info(f"Профиль {profile_id} присоединился к комнате {room_id}")
 
-            try:
-                await self.wrs.broadcast_participant_joined(room_id, profile_id)
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о присоединении участника: {e}"
-                )
-
             room_dict = {
                 **room.__dict__,
                 "participants_count": participants_count,
@@ -447,17 +435,11 @@ class RoomService:
                 )
 
             await uow.room_participant.remove_participant(room_id, profile_id)
+            await uow.publish("room", "broadcast_participant_left", room_id, profile_id)
             await uow.commit()
 
             app_logger.info(f"Профиль {profile_id} вышел из комнаты {room_id}")
 
-            try:
-                await self.wrs.broadcast_participant_left(room_id, profile_id)
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о выходе участника: {e}"
-                )
-
     async def get_room_participants(
         self, room_id: UUID, profile_id: UUID, include_banned: bool = False
     ) -> list[RoomParticipantResponse]:
@@ -569,21 +551,19 @@ class RoomService:
             await uow.room_participant.remove_participant(
                 room_id, kick_request.profile_id
             )
+            await uow.publish(
+                "room",
+                "broadcast_participant_kicked",
+                room_id,
+                kick_request.profile_id,
+                profile_id,
+            )
             await uow.commit()
 
             app_logger.info(
                 f"Участник {kick_request.profile_id} исключен из комнаты {room_id}"
             )
 
-            try:
-                await self.wrs.broadcast_participant_kicked(
-                    room_id, kick_request.profile_id, profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления об исключении участника: {e}"
-                )
-
     async def send_message(
         self, room_id: UUID, message_create: RoomMessageCreate, profile_id: UUID
     ) -> RoomMessageResponse:
@@ -624,21 +604,19 @@ class RoomService:
 
             message = await uow.room_message.add_one(message_data)
 
+            message_response = RoomMessageResponse.model_validate(message)
+
+            await uow.publish(
+                "room",
+                "broadcast_new_message",
+                room_id,
+                message_response.model_dump(),
+                profile_id,
+            )
             await uow.commit()
 
             app_logger.info(f"Сообщение отправлено в комнату {room_id}")
 
-            try:
-                message_response = RoomMessageResponse.model_validate(message)
-
-                await self.wrs.broadcast_new_message(
-                    room_id, message_response.model_dump(), profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о новом сообщении: {e}"
-                )
-
             return RoomMessageResponse.model_validate(message)
 
     async def get_room_messages(
@@ -666,7 +644,7 @@ class RoomService:
         """
         app_logger.info(f"Получение сообщений комнаты: {room_id}")
 
-        async with self.uow as uow:
+        async with self.uow.for_reading() as uow:
             participant = await uow.room_participant.get_participant(
                 room_id, profile_id
             )
@@ -740,22 +718,19 @@ class RoomService:
 
             await uow.room_message.mark_as_edited(message_id)
 
+            message_response = RoomMessageResponse.model_validate(updated_message)
+
+            await uow.publish(
+                "room",
+                "broadcast_message_updated",
+                room_id=message.room_id,
+                message_data=message_response.model_dump(),
+                updater_profile_id=profile_id,
+            )
             await uow.commit()
 
             app_logger.info(f"Сообщение {message_id} обновлено")
 
-            try:
-                message_response = RoomMessageResponse.model_validate(updated_message)
-                await self.wrs.broadcast_message_updated(
-                    room_id=message.room_id,
-                    message_data=message_response.model_dump(),
-                    updater_profile_id=profile_id,
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления об обновлении сообщения: {e}"
-                )
-
             return RoomMessageResponse.model_validate(updated_message)
 
     async def delete_message(self, message_id: UUID, profile_id: UUID) -> None:
@@ -797,21 +772,17 @@ class RoomService:
 
             await uow.room_message.soft_delete_message(message_id)
 
+            await uow.publish(
+                "room",
+                "broadcast_message_deleted",
+                room_id=message.room_id,
+                message_id=message_id,
+                deleter_profile_id=profile_id,
+            )
             await uow.commit()
 
             app_logger.info(f"Сообщение {message_id} удалено")
 
-            try:
-                await self.wrs.broadcast_message_deleted(
-                    room_id=message.room_id,
-                    message_id=message_id,
-                    deleter_profile_id=profile_id,
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления об удалении сообщения: {e}"
-                )
-
     async def mute_participant(
         self, room_id: UUID, target_profile_id: UUID, profile_id: UUID
     ) -> None:
@@ -866,19 +837,17 @@ class RoomService:
                 raise RoomPermissionError("Moderators cannot mute other moderators")
 
             await uow.room_participant.mute_participant(room_id, target_profile_id)
+            await uow.publish(
+                "room",
+                "broadcast_participant_muted",
+                room_id,
+                target_profile_id,
+                profile_id,
+            )
             await uow.commit()
 
             app_logger.info(f"Участник {target_profile_id} замучен в комнате {room_id}")
 
-            try:
-                await self.wrs.broadcast_participant_muted(
-                    room_id, target_profile_id, profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о мьюте участника: {e}"
-                )
-
     async def unmute_participant(
         self, room_id: UUID, target_profile_id: UUID, profile_id: UUID
     ) -> None:
@@ -929,21 +898,19 @@ class RoomService:
                 raise RoomPermissionError("Moderators cannot unmute other moderators")
 
             await uow.room_participant.unmute_participant(room_id, target_profile_id)
+            await uow.publish(
+                "room",
+                "broadcast_participant_unmuted",
+                room_id,
+                target_profile_id,
+                profile_id,
+            )
             await uow.commit()
 
             app_logger.info(
                 f"С участника {target_profile_id} снят мут в комнате {room_id}"
             )
 
-            try:
-                await self.wrs.broadcast_participant_unmuted(
-                    room_id, target_profile_id, profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о размьюте участника: {e}"
-                )
-
     async def ban_participant(
         self, room_id: UUID, target_profile_id: UUID, profile_id: UUID
     ) -> None:
@@ -998,19 +965,17 @@ class RoomService:
                 raise RoomPermissionError("Moderators cannot ban other moderators")
 
             await uow.room_participant.ban_participant(room_id, target_profile_id)
+            await uow.publish(
+                "room",
+                "broadcast_participant_banned",
+                room_id,
+                target_profile_id,
+                profile_id,
+            )
             await uow.commit()
 
             app_logger.info(f"Участник {target_profile_id} забанен в комнате {room_id}")
 
-            try:
-                await self.wrs.broadcast_participant_banned(
-                    room_id, target_profile_id, profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о бане участника: {e}"
-                )
-
     async def unban_participant(
         self, room_id: UUID, target_profile_id: UUID, profile_id: UUID
     ) -> None:
@@ -1064,21 +1029,19 @@ class RoomService:
                 raise RoomFullError()
 
             await uow.room_participant.unban_participant(room_id, target_profile_id)
+            await uow.publish(
+                "room",
+                "broadcast_participant_unbanned",
+                room_id,
+                target_profile_id,
+                profile_id,
+            )
             await uow.commit()
 
             app_logger.info(
                 f"Участник {target_profile_id} разбанен в комнате {room_id}"
             )
 
-            try:
-                await self.wrs.broadcast_participant_unbanned(
-                    room_id, target_profile_id, profile_id
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о разбане участника: {e}"
-                )
-
     async def get_banned_participants(
         self, room_id: UUID, profile_id: UUID
     ) -> list[RoomParticipantResponse]:
@@ -1206,6 +1169,15 @@ class RoomService:
                 role=new_role,
             )
 
+            await uow.publish(
+                "room",
+                "broadcast_role_changed",
+                room_id=room_id,
+                target_profile_id=target_profile_id,
+                old_role=old_role,
+                new_role=new_role,
+                changer_profile_id=profile_id,
+            )
             await uow.commit()
 
             updated_participant = await uow.room_participant.get_participant(
@@ -1227,17 +1199,4 @@ class RoomService:
                 participant_dict
             )
 
-            try:
-                await self.wrs.broadcast_role_changed(
-                    room_id=room_id,
-                    target_profile_id=target_profile_id,
-                    old_role=old_role,
-                    new_role=new_role,
-                    changer_profile_id=profile_id,
-                )
-            except Exception as e:
-                app_logger.error(
-                    f"Ошибка при отправке WebSocket уведомления о смене роли участника: {e}"
-                )
-
             return participant_response
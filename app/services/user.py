@@ -1,14 +1,17 @@
+from typing import AsyncIterator
 from uuid import UUID
 
+from app.core.auth import profile_ownership_cache, revoke_user_tokens
 from app.core.exceptions.user import (
     AuthenticationFailedError,
     UserAlreadyExistsError,
     UserNotFoundError,
 )
 from app.core.logger import app_logger
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash, password_hasher
 from app.db.unit_of_work import UnitOfWork
 from app.schemas.user import UserCreate, UserLogin, UserResponse, UserUpdate
+from app.utils.pagination import decode_cursor, encode_cursor
 
 
 class UserService:
@@ -39,7 +42,7 @@ class UserService:
         """
         app_logger.info(f"Создание пользователя с email: {user_create.email}")
         user_dict: dict = user_create.model_dump()
-        user_dict["password_hash"] = get_password_hash(user_dict.pop("password"))
+        user_dict["password_hash"] = await get_password_hash(user_dict.pop("password"))
         async with self.uow as uow:
             existing_user = await uow.user.find_one(email=user_create.email)
             if existing_user:
@@ -76,24 +79,55 @@ class UserService:
             app_logger.info(f"Пользователь найден: {user.email}")
             return user_to_return
 
-    async def get_users(self) -> list[UserResponse]:
+    async def get_users(
+        self, limit: int = 50, cursor: str | None = None
+    ) -> tuple[list[UserResponse], str | None]:
         """
-        Возвращает список всех пользователей в системе.
+        Возвращает страницу пользователей в порядке регистрации.
+
+        Args:
+            limit: Максимальное количество пользователей на странице
+            cursor: Курсор следующей страницы из предыдущего ответа
 
         Returns:
-            list[UserResponse]: Список пользователей (без паролей)
+            tuple[list[UserResponse], str | None]: Пользователи (без паролей)
+            и курсор следующей страницы (None, если страница последняя)
         """
-        app_logger.info("Получение всех пользователей")
-        async with self.uow as uow:
-            users = await uow.user.find_all()
-            users_to_return = [UserResponse.model_validate(user) for user in users]
+        app_logger.info(f"Получение страницы пользователей: limit={limit}")
+        after = decode_cursor(cursor) if cursor else None
+
+        async with self.uow.for_reading() as uow:
+            users = await uow.user.find_page(limit + 1, after)
+
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor(users[-1].created_at, users[-1].id)
+
+        app_logger.info(f"Найдено {len(users)} пользователей")
+        return [UserResponse.model_validate(user) for user in users], next_cursor
 
-            app_logger.info(f"Найдено {len(users)} пользователей")
-            return users_to_return
+    async def stream_users(self, chunk_size: int = 500) -> AsyncIterator[UserResponse]:
+        """
+        Отдаёт всех пользователей по одному, читая таблицу пачками через
+        серверный курсор.
+
+        Args:
+            chunk_size: Количество строк, получаемых из базы за раз
+
+        Yields:
+            UserResponse: Пользователь (без пароля)
+        """
+        app_logger.info("Потоковая выгрузка пользователей")
+        async with self.uow as uow:
+            async for users in uow.user.stream_all(chunk_size):
+                for user in users:
+                    yield UserResponse.model_validate(user)
 
     async def update_user(self, user_id: UUID, user_update: UserUpdate) -> UserResponse:
         """
         Обновляет данные пользователя (email, имя, пароль и др.).
+        При смене пароля все ранее выпущенные токены пользователя отзываются.
 
         Args:
             user_id: Идентификатор пользователя
@@ -108,6 +142,10 @@ class UserService:
         """
         app_logger.info(f"Обновление пользователя с ID: {user_id}")
         user_dict: dict = user_update.model_dump(exclude_unset=True)
+        if "password" in user_dict:
+            user_dict["password_hash"] = await get_password_hash(
+                user_dict.pop("password")
+            )
 
         async with self.uow as uow:
             if "email" in user_dict:
@@ -115,17 +153,15 @@ class UserService:
                 if existing_user and existing_user.id != user_id:
                     raise UserAlreadyExistsError(user_dict["email"])
 
-            if "password" in user_dict:
-                user_dict["password_hash"] = get_password_hash(
-                    user_dict.pop("password")
-                )
-
             user = await uow.user.update(user_id, user_dict)
             if not user:
                 raise UserNotFoundError(user_id)
 
             user_to_return = UserResponse.model_validate(user)
             await uow.commit()
+            if "password_hash" in user_dict:
+                # После смены пароля прежние токены недействительны
+                revoke_user_tokens(user_id)
 
             app_logger.info(f"Пользователь с ID {user_id} обновлен")
             return user_to_return
@@ -148,12 +184,16 @@ class UserService:
 
             await uow.user.delete(user_id)
             await uow.commit()
+            profile_ownership_cache.invalidate_user(user_id)
+            revoke_user_tokens(user_id)
 
             app_logger.info(f"Пользователь с ID {user_id} удален")
 
     async def authenticate_user(self, user_auth: UserLogin) -> UserResponse:
         """
-        Аутентифицирует пользователя по email и паролю.
+        Аутентифицирует пользователя по email и паролю. Если хэш пароля
+        создан с устаревшими параметрами argon2, он пересчитывается
+        и сохраняется.
 
         Args:
             user_auth: Данные для аутентификации (email и пароль)
@@ -169,12 +209,29 @@ class UserService:
         )
         async with self.uow as uow:
             user = await uow.user.find_one(email=user_auth.email)
-            if not user or not verify_password(user_auth.password, user.password_hash):
+            if not user:
                 raise AuthenticationFailedError()
-
             user_to_return = UserResponse.model_validate(user)
+            password_hash = user.password_hash
 
+        # Проверка пароля выполняется без открытой сессии, чтобы не держать
+        # соединение из пула на время вычисления argon2
+        verified, new_hash = await password_hasher.verify_and_update(
+            user_auth.password, password_hash
+        )
+        if not verified:
+            raise AuthenticationFailedError()
+
+        if new_hash:
+            async with self.uow as uow:
+                await uow.user.update(user_to_return.id, {"password_hash": new_hash})
+                await uow.commit()
             app_logger.info(
-                f"Успешная аутентификация пользователя с email: {user_auth.email}"
+                f"Хэш пароля пользователя {user_to_return.id} пересчитан "
+                f"с текущими параметрами"
             )
-            return user_to_return
+
+        app_logger.info(
+            f"Успешная аутентификация пользователя с email: {user_auth.email}"
+        )
+        return user_to_return
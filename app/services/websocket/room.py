@@ -101,6 +101,8 @@ class WebSocketRoomService:
         for profile_id in participants:
             await room_connection_manager.disconnect(room_id, profile_id)
 
+        room_connection_manager.clear_replay_log(room_id)
+
         app_logger.info(f"Удаление комнаты {room_id} разослано через WebSocket")
 
     async def broadcast_participant_muted(
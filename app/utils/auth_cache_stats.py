@@ -0,0 +1,32 @@
+import asyncio
+
+from app.core.auth import profile_ownership_cache, verified_token_cache
+from app.core.config import settings
+from app.core.logger import app_logger
+
+
+def _format_stats(stats: dict[str, float]) -> str:
+    return ", ".join(
+        f"{name}={value:.2f}" if isinstance(value, float) else f"{name}={value}"
+        for name, value in stats.items()
+    )
+
+
+async def run_auth_cache_stats_logging():
+    """
+    Фоновая задача, периодически записывающая в лог статистику кэшей
+    аутентификации (проверенных токенов и владельцев профилей):
+    размер, попадания, промахи и долю попаданий.
+    """
+    try:
+        while True:
+            await asyncio.sleep(settings.AUTH_CACHE_STATS_LOG_INTERVAL_SECONDS)
+            app_logger.info(
+                f"Кэш токенов: {_format_stats(verified_token_cache.get_stats())}; "
+                f"кэш владельцев профилей: "
+                f"{_format_stats(profile_ownership_cache.get_stats())}"
+            )
+
+    except asyncio.CancelledError:
+        app_logger.info("Задача статистики кэшей аутентификации отменена")
+        raise
@@ -0,0 +1,33 @@
+"""
+Однократное заполнение `profiles.avatar_version` для аватарок, загруженных
+до появления колонки. Запускается после `alembic upgrade head`:
+
+    python -m app.utils.avatar_backfill
+"""
+
+import asyncio
+
+from app.core.logger import app_logger
+from app.db.unit_of_work import UnitOfWork
+from app.utils.object_storage import object_storage_service
+
+
+async def backfill_avatar_versions() -> int:
+    updated = 0
+    try:
+        async for profile_ids in object_storage_service.iter_avatar_profile_ids():
+            if not profile_ids:
+                continue
+
+            async with UnitOfWork() as uow:
+                updated += await uow.profile.set_missing_avatar_versions(profile_ids)
+                await uow.commit()
+    finally:
+        await object_storage_service.close()
+
+    app_logger.info(f"Версия аватарки проставлена {updated} профилям")
+    return updated
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_avatar_versions())
@@ -4,7 +4,6 @@ from datetime import datetime, timezone
 from app.core.logger import app_logger
 from app.db.models.chat_roulette_session import ChatRouletteSessionStatus
 from app.db.unit_of_work import UnitOfWork
-from app.services.websocket.chat_roulette import WebSocketChatRouletteService
 
 
 async def run_session_cleanup():
@@ -15,8 +14,6 @@ async def run_session_cleanup():
     Завершает просроченные сессии, обновляет их статус на COMPLETED
     и уведомляет участников через WebSocket.
     """
-    wcrs = WebSocketChatRouletteService()
-
     try:
         while True:
             try:
@@ -32,24 +29,19 @@ async def run_session_cleanup():
                                 ChatRouletteSessionStatus.COMPLETED,
                                 "Session expired automatically",
                             )
+                            await uow.publish(
+                                "chat_roulette",
+                                "broadcast_session_ended",
+                                session.id,
+                                session.profile1_id,
+                                "Session expired automatically",
+                            )
 
                         await uow.commit()
                         app_logger.info(
                             f"Автоматически завершено {len(expired_sessions)} просроченных сессий"
                         )
 
-                        for session in expired_sessions:
-                            try:
-                                await wcrs.broadcast_session_ended(
-                                    session.id,
-                                    session.profile1_id,
-                                    "Session expired automatically",
-                                )
-                            except Exception as e:
-                                app_logger.error(
-                                    f"Ошибка при отправке WebSocket уведомления о завершении сессии {session.id}: {e}"
-                                )
-
                     expiring_soon = (
                         await uow.chat_roulette_session.get_expiring_sessions(
                             minutes_before=2
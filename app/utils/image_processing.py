@@ -0,0 +1,146 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from app.core.config import settings
+from app.core.exceptions.file import UnsupportedMediaTypeError
+
+# Формат варианта аватарки: расширение ключа → (формат Pillow, MIME-тип)
+AVATAR_FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "jpg": ("JPEG", "image/jpeg"),
+}
+ALLOWED_SOURCE_FORMATS = {"JPEG", "PNG", "WEBP", "GIF", "BMP"}
+
+
+def avatar_variant(size: int, extension: str) -> str:
+    return f"{size}.{extension}"
+
+
+def make_avatar_variants(
+    file_path: str,
+    sizes: list[int],
+    max_pixels: int,
+    webp_quality: int,
+    jpeg_quality: int,
+) -> dict[str, tuple[bytes, str]]:
+    """
+    Декодирует изображение и строит квадратные варианты аватарки всех
+    размеров в WebP и JPEG. Метаданные (EXIF, ICC, комментарии) в варианты
+    не попадают, ориентация из EXIF применяется к пикселям.
+
+    Выполняется в отдельном процессе, поэтому не использует состояние
+    приложения, а исходный файл читает с диска сам: загруженные байты
+    не передаются между процессами.
+
+    Returns:
+        dict[str, tuple[bytes, str]]: {"256.webp": (данные, MIME-тип), ...}
+
+    Raises:
+        ValueError: Если файл не является изображением допустимого формата
+            или превышает `max_pixels`
+    """
+    try:
+        with Image.open(file_path) as image:
+            if image.format not in ALLOWED_SOURCE_FORMATS:
+                raise ValueError(f"Unsupported image format: {image.format}")
+            if image.width * image.height > max_pixels:
+                raise ValueError("Image dimensions are too large")
+
+            image.load()
+            image = ImageOps.exif_transpose(image)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError) as e:
+        raise ValueError(f"Invalid image: {e}")
+
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    variants = {}
+    for size in sizes:
+        resized = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+
+        buffer = BytesIO()
+        resized.save(buffer, format="WEBP", quality=webp_quality, method=4)
+        variants[avatar_variant(size, "webp")] = (buffer.getvalue(), "image/webp")
+
+        if resized.mode == "RGBA":
+            background = Image.new("RGB", resized.size, (255, 255, 255))
+            background.paste(resized, mask=resized.getchannel("A"))
+            resized = background
+
+        buffer = BytesIO()
+        resized.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
+        variants[avatar_variant(size, "jpg")] = (buffer.getvalue(), "image/jpeg")
+
+    return variants
+
+
+class AvatarProcessor:
+    """
+    Обработка загруженных аватарок в пуле процессов.
+
+    Декодирование и масштабирование изображений нагружают процессор
+    и удерживают GIL, поэтому выполняются в отдельных процессах
+    и не останавливают цикл событий.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        sizes: list[int],
+        max_pixels: int,
+        webp_quality: int,
+        jpeg_quality: int,
+    ):
+        self.workers = workers
+        self.sizes = sizes
+        self.max_pixels = max_pixels
+        self.webp_quality = webp_quality
+        self.jpeg_quality = jpeg_quality
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def process(self, file_path: str) -> dict[str, tuple[bytes, str]]:
+        """
+        Строит варианты аватарки из файла на диске (см. `make_avatar_variants`).
+
+        Raises:
+            UnsupportedMediaTypeError: Если файл не является допустимым изображением
+        """
+        if self._executor is None:
+            # spawn вместо fork: приложение к этому моменту уже запустило
+            # потоки и цикл событий, которые нельзя копировать в дочерний процесс
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor,
+                make_avatar_variants,
+                file_path,
+                self.sizes,
+                self.max_pixels,
+                self.webp_quality,
+                self.jpeg_quality,
+            )
+        except ValueError as e:
+            raise UnsupportedMediaTypeError(str(e))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+avatar_processor = AvatarProcessor(
+    workers=settings.AVATAR_PROCESS_WORKERS,
+    sizes=settings.AVATAR_SIZES,
+    max_pixels=settings.AVATAR_MAX_PIXELS,
+    webp_quality=settings.AVATAR_WEBP_QUALITY,
+    jpeg_quality=settings.AVATAR_JPEG_QUALITY,
+)
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import json
+from uuid import UUID
+
+from app.core.exceptions.interest import InterestNotFoundError
+from app.core.logger import app_logger
+from app.db.unit_of_work import UnitOfWork
+
+
+class LocalizedInterests:
+    """
+    Интересы одного языка, заранее сериализованные в JSON: каждый интерес
+    отдельно (для выборки по идентификаторам) и весь список целиком
+    вместе с его ETag. Порядок интересов — порядок строк, прочитанных из базы.
+    """
+
+    def __init__(self, names: dict[UUID, str]):
+        self.items = {
+            interest_id: json.dumps(
+                {"id": str(interest_id), "name": name},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode()
+            for interest_id, name in names.items()
+        }
+        self.body = b"[" + b",".join(self.items.values()) + b"]"
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+
+    def select(self, interest_ids: list[UUID]) -> bytes:
+        """
+        Собирает JSON-список интересов по идентификаторам (в порядке каталога,
+        без повторов).
+
+        Raises:
+            InterestNotFoundError: Если хотя бы один из идентификаторов не найден
+        """
+        missing = set(interest_ids) - self.items.keys()
+        if missing:
+            raise InterestNotFoundError(f"Interests not found: {missing}")
+
+        wanted = set(interest_ids)
+        return (
+            b"["
+            + b",".join(
+                item
+                for interest_id, item in self.items.items()
+                if interest_id in wanted
+            )
+            + b"]"
+        )
+
+
+class InterestCatalog:
+    """
+    Каталог интересов в памяти.
+
+    Интересы — справочные данные, которые меняются только миграциями,
+    поэтому загружаются из базы один раз (при старте приложения или при
+    первом обращении) и хранятся по языкам в уже сериализованном виде.
+    Эндпоинты интересов отдают готовые тела ответов без запросов к базе.
+    После изменения таблицы интересов каталог перечитывается через `reload`
+    (в работающем процессе — по сигналу SIGHUP, см. lifespan).
+    """
+
+    def __init__(self):
+        self._languages: dict[str, LocalizedInterests] = {}
+        self._empty = LocalizedInterests({})
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    async def load(self, uow: UnitOfWork) -> None:
+        """Загружает каталог, если он ещё не загружен"""
+
+        if self._loaded:
+            return
+
+        async with self._lock:
+            if not self._loaded:
+                await self._load(uow)
+
+    async def reload(self, uow: UnitOfWork) -> None:
+        """Перечитывает каталог из базы"""
+
+        async with self._lock:
+            await self._load(uow)
+
+    def get(self, language: str) -> LocalizedInterests:
+        """
+        Возвращает интересы на указанном языке (пустой список, если
+        переводов на этот язык нет).
+        """
+        return self._languages.get(language, self._empty)
+
+    async def _load(self, uow: UnitOfWork) -> None:
+        async with uow:
+            interests = await uow.interest.find_all()
+
+        names_by_language: dict[str, dict[UUID, str]] = {}
+        for interest in interests:
+            for language, name in interest.name_translations.items():
+                if name is not None:
+                    names_by_language.setdefault(language, {})[interest.id] = name
+
+        self._languages = {
+            language: LocalizedInterests(names)
+            for language, names in names_by_language.items()
+        }
+        self._loaded = True
+        app_logger.info(
+            f"Каталог интересов загружен: {len(interests)} интересов, "
+            f"языки: {', '.join(sorted(self._languages)) or '—'}"
+        )
+
+
+interest_catalog = InterestCatalog()
@@ -1,9 +1,21 @@
-from uuid import UUID
+import asyncio
+import hashlib
+import hmac
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import AsyncIterator
+from urllib.parse import urlencode
+from uuid import UUID, uuid4
 
 import aioboto3
-from botocore.client import Config
+import anyio
+from aiobotocore.config import AioConfig
 from botocore.exceptions import ClientError
 
+from app.core.config import settings
 from app.core.exceptions.object_storage import (
     ObjectDeleteError,
     ObjectListGetError,
@@ -12,81 +24,104 @@ from app.core.exceptions.object_storage import (
 from app.core.logger import app_logger
 
 
-class ObjectStorageService:
+class ObjectStorageService(ABC):
     """
-    Сервис для работы с объектным хранилищем (S3-совместимым).
+    Сервис для работы с объектным хранилищем.
     Обеспечивает загрузку, удаление и управление аватарками пользователей.
 
-    Использует асинхронный клиент `aioboto3` для взаимодействия с S3.
+    Логика работы с аватарками общая, а чтение и запись объектов реализуют
+    бэкенды: `S3ObjectStorageService` (S3-совместимое хранилище)
+    и `LocalObjectStorageService` (локальная файловая система, например
+    для тестов и бенчмарков без S3). Бэкенд выбирается настройкой
+    `STORAGE_BACKEND`.
+
+    Наличие и версия аватарки хранятся в профиле (`avatar_version`), поэтому
+    URL аватарки подписывается локально без запроса к хранилищу и кэшируется
+    до момента незадолго до истечения его срока.
+
+    Аватарка хранится вариантами разных размеров и форматов
+    (`users/{profile_id}/256.webp` и т.д.). Аватарки, загруженные до появления
+    вариантов, имеют версию 0 и хранятся одним файлом `users/{profile_id}.jpg`.
     """
 
+    # Исключения бэкенда, которые означают ошибку операции с хранилищем
+    backend_errors: tuple[type[Exception], ...] = ()
+
     def __init__(
         self,
-        endpoint_url: str,
-        access_key_id: str,
-        secret_access_key: str,
-        bucket_name: str,
+        presigned_url_expires_in: int = 3600,
+        presigned_url_refresh_margin: int = 300,
+        presigned_url_cache_size: int = 10000,
+        default_avatar_variant: str = "256.webp",
     ):
         """
-        Инициализирует сервис с параметрами подключения к S3.
-
         Args:
-            endpoint_url: URL эндпоинта S3 (например, 'https://s3.example.com')
-            access_key_id: Идентификатор ключа доступа
-            secret_access_key: Секретный ключ доступа
-            bucket_name: Имя бакета для хранения файлов
+            presigned_url_expires_in: Время жизни предподписанного URL в секундах
+            presigned_url_refresh_margin: За сколько секунд до истечения URL
+                подписывается заново
+            presigned_url_cache_size: Максимальное число URL в кэше
+            default_avatar_variant: Вариант аватарки, если клиент его не выбрал
         """
-        self.endpoint_url = endpoint_url
-        self.bucket_name = bucket_name
-        self.access_key_id = access_key_id
-        self.secret_access_key = secret_access_key
-        self.session = aioboto3.Session()
-        self.config = Config(signature_version="s3v4")
+        self.presigned_url_expires_in = presigned_url_expires_in
+        self.presigned_url_refresh_margin = presigned_url_refresh_margin
+        self.presigned_url_cache_size = presigned_url_cache_size
+        self.default_avatar_variant = default_avatar_variant
+        self._presigned_urls: OrderedDict[tuple[UUID, int, str], tuple[str, float]] = (
+            OrderedDict()
+        )
 
-    async def _get_client(self):
-        """
-        Возвращает асинхронный S3-клиент с настроенными параметрами подключения.
+    async def start(self) -> None:
+        """Подготавливает бэкенд к работе (вызывается из lifespan)"""
 
-        Returns:
-            AioBaseClient: Асинхронный клиент для работы с S3
-        """
-        return self.session.client(
-            "s3",
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=self.access_key_id,
-            aws_secret_access_key=self.secret_access_key,
-            config=self.config,
-        )
+    async def close(self) -> None:
+        """Освобождает ресурсы бэкенда (вызывается из lifespan)"""
 
-    async def upload_avatar(self, profile_id: UUID, file_data: bytes) -> str:
+    @abstractmethod
+    async def _put_object(
+        self, key: str, data: bytes, content_type: str, metadata: dict[str, str]
+    ) -> None:
+        """Сохраняет объект под ключом `key`"""
+
+    @abstractmethod
+    async def _delete_objects(self, keys: list[str]) -> None:
+        """Удаляет объекты по ключам; отсутствующие ключи пропускаются"""
+
+    @abstractmethod
+    def _list_keys(self, prefix: str) -> AsyncIterator[list[str]]:
+        """Перебирает ключи с префиксом `prefix` страницами"""
+
+    @abstractmethod
+    async def _generate_presigned_url(self, key: str, expires_in: int) -> str:
+        """Подписывает URL для чтения объекта на `expires_in` секунд"""
+
+    async def upload_avatar(
+        self, profile_id: UUID, variants: dict[str, tuple[bytes, str]]
+    ) -> None:
         """
-        Загружает аватарку пользователя в объектное хранилище.
+        Загружает варианты аватарки пользователя в объектное хранилище
+        параллельно.
 
         Args:
             profile_id: Идентификатор профиля
-            file_data: Двоичные данные файла аватарки (ожидается JPEG)
-
-        Returns:
-            str: Предподписанный URL для доступа к загруженной аватарке
+            variants: Варианты аватарки {"256.webp": (данные, MIME-тип), ...}
 
         Raises:
             ObjectUploadError: Если произошла ошибка при загрузке
         """
         try:
-            key = f"users/{profile_id}.jpg"
-
-            async with await self._get_client() as s3:
-                await s3.put_object(
-                    Bucket=self.bucket_name,
-                    Key=key,
-                    Body=file_data,
-                    ContentType="image/jpeg",
-                    Metadata={"profile_id": str(profile_id)},
+            await asyncio.gather(
+                *(
+                    self._put_object(
+                        self._avatar_key(profile_id, variant),
+                        data,
+                        content_type,
+                        {"profile_id": str(profile_id)},
+                    )
+                    for variant, (data, content_type) in variants.items()
                 )
-                app_logger.info(f"Аватарка для профиля {profile_id} успешно загружена")
-
-                return await self._generate_presigned_url(s3, key)
-        except ClientError as e:
+            )
+            app_logger.info(f"Аватарка для профиля {profile_id} успешно загружена")
+        except self.backend_errors as e:
             app_logger.error(
                 f"Ошибка при загрузке аватарки для профиля {profile_id}: {e}"
             )
@@ -94,7 +129,7 @@ class ObjectStorageService:
 
     async def delete_avatar(self, profile_id: UUID) -> None:
         """
-        Удаляет аватарку пользователя из объектного хранилища.
+        Удаляет все варианты аватарки пользователя из объектного хранилища.
 
         Args:
             profile_id: Идентификатор профиля
@@ -103,110 +138,409 @@ class ObjectStorageService:
             ObjectDeleteError: Если произошла ошибка при удалении
         """
         try:
-            key = f"users/{profile_id}.jpg"
-            async with await self._get_client() as s3:
-                await s3.delete_object(Bucket=self.bucket_name, Key=key)
-                app_logger.info(f"Аватарка для профиля {profile_id} успешно удалена")
-        except ClientError as e:
+            keys = [self._avatar_key(profile_id, None)]
+            async for page in self._list_keys(f"users/{profile_id}/"):
+                keys.extend(page)
+
+            await self._delete_objects(keys)
+            self._forget_avatar_urls(profile_id)
+            app_logger.info(f"Аватарка для профиля {profile_id} успешно удалена")
+        except self.backend_errors as e:
             app_logger.error(
                 f"Ошибка при удалении аватарки для профиля {profile_id}: {e}"
             )
             raise ObjectDeleteError(f"avatar_{profile_id}")
 
-    async def get_avatar_url(self, profile_id: UUID) -> str | None:
+    async def get_avatar_url(
+        self,
+        profile_id: UUID,
+        avatar_version: int | None,
+        variant: str | None = None,
+    ) -> str | None:
         """
         Возвращает предподписанный URL для доступа к аватарке пользователя.
+        Запросов к хранилищу не выполняет: URL подписывается локально и берётся
+        из кэша, пока до истечения его срока больше `presigned_url_refresh_margin`.
 
         Args:
             profile_id: Идентификатор профиля
+            avatar_version: Версия аватарки из профиля (None, если аватарки нет)
+            variant: Вариант аватарки, например "64.jpg" (по умолчанию
+                `default_avatar_variant`)
 
         Returns:
-            str | None: Предподписанный URL или None, если аватарка не найдена
+            str | None: Предподписанный URL или None, если аватарки нет
         """
-        try:
-            key = f"users/{profile_id}.jpg"
-            async with await self._get_client() as s3:
-                await s3.head_object(Bucket=self.bucket_name, Key=key)
-
-                return await self._generate_presigned_url(s3, key)
-        except ClientError as e:
-            app_logger.error(
-                f"Ошибка при получении URL аватарки для профиля {profile_id}: {e}"
-            )
+        if avatar_version is None:
             return None
 
-    async def avatar_exists(self, profile_id: UUID) -> bool:
-        """
-        Проверяет существование аватарки для указанного профиля.
+        # У аватарок, загруженных до появления вариантов, есть только один файл
+        variant = (variant or self.default_avatar_variant) if avatar_version else None
 
-        Args:
-            profile_id: Идентификатор профиля
+        cache_key = (profile_id, avatar_version, variant)
+        cached = self._presigned_urls.get(cache_key)
+        if cached and cached[1] > time.monotonic():
+            self._presigned_urls.move_to_end(cache_key)
+            return cached[0]
 
-        Returns:
-            bool: True, если аватарка существует, иначе False
-        """
-        try:
-            key = f"users/{profile_id}.jpg"
-            async with await self._get_client() as s3:
-                await s3.head_object(Bucket=self.bucket_name, Key=key)
+        url = await self._generate_presigned_url(
+            self._avatar_key(profile_id, variant), self.presigned_url_expires_in
+        )
 
-                return True
-        except ClientError as e:
-            app_logger.error(
-                f"Ошибка при проверке существования аватарки для профиля {profile_id}: {e}"
-            )
-            return False
+        refresh_at = (
+            time.monotonic()
+            + self.presigned_url_expires_in
+            - self.presigned_url_refresh_margin
+        )
+        self._presigned_urls[cache_key] = (url, refresh_at)
+        self._presigned_urls.move_to_end(cache_key)
+        if len(self._presigned_urls) > self.presigned_url_cache_size:
+            self._presigned_urls.popitem(last=False)
+
+        return url
+
+    def _avatar_key(self, profile_id: UUID, variant: str | None) -> str:
+        if variant is None:
+            return f"users/{profile_id}.jpg"
+        return f"users/{profile_id}/{variant}"
 
-    async def list_avatars(self, profile_ids: list[UUID]) -> dict[UUID, str | None]:
+    def _forget_avatar_urls(self, profile_id: UUID) -> None:
+        for cache_key in [key for key in self._presigned_urls if key[0] == profile_id]:
+            del self._presigned_urls[cache_key]
+
+    async def list_avatars(
+        self, avatar_versions: dict[UUID, int | None], variant: str | None = None
+    ) -> dict[UUID, str | None]:
         """
         Возвращает предподписанные URL для аватарок списка профилей.
+        Наличие аватарок берётся из версий в профилях, поэтому хранилище
+        не листается: затрагиваются только запрошенные профили, а URL
+        подписываются локально за один проход (с учётом кэша).
 
         Args:
-            profile_ids: Список идентификаторов профилей
+            avatar_versions: Словарь {profile_id: avatar_version} из профилей
+            variant: Вариант аватарки (по умолчанию `default_avatar_variant`)
 
         Returns:
-            dict[UUID, str | None]: Словарь {profile_id: avatar_url} для существующих аватарок
+            dict[UUID, str | None]: Словарь {profile_id: avatar_url}
+            (None для профилей без аватарки)
+        """
+        return {
+            profile_id: await self.get_avatar_url(profile_id, avatar_version, variant)
+            for profile_id, avatar_version in avatar_versions.items()
+        }
+
+    async def iter_avatar_profile_ids(self) -> AsyncIterator[list[UUID]]:
+        """
+        Перебирает идентификаторы профилей, для которых в хранилище есть
+        аватарка без вариантов (`users/{profile_id}.jpg`), постранично.
+
+        Yields:
+            list[UUID]: Идентификаторы профилей одной страницы листинга
 
         Raises:
             ObjectListGetError: Если произошла ошибка при получении списка
         """
         try:
-            keys = [f"users/{profile_id}.jpg" for profile_id in profile_ids]
-            async with await self._get_client() as s3:
-                response = await s3.list_objects_v2(
-                    Bucket=self.bucket_name, Prefix="users/"
+            async for page in self._list_keys("users/"):
+                profile_ids = []
+                for key in page:
+                    name = key.removeprefix("users/").removesuffix(".jpg")
+                    try:
+                        profile_ids.append(UUID(name))
+                    except ValueError:
+                        continue
+                yield profile_ids
+        except self.backend_errors as e:
+            app_logger.error(f"Ошибка при получении списка аватарок: {e}")
+            raise ObjectListGetError("avatar")
+
+
+class S3ObjectStorageService(ObjectStorageService):
+    """
+    Бэкенд объектного хранилища для S3-совместимых сервисов.
+
+    Использует один долгоживущий асинхронный клиент `aioboto3` на приложение:
+    клиент открывается в `start` (из lifespan) или при первом обращении
+    и закрывается в `close`, поэтому все операции переиспользуют пул
+    соединений с S3 и не повторяют разрешение учётных данных и TLS-рукопожатие.
+    """
+
+    backend_errors = (ClientError,)
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        access_key_id: str,
+        secret_access_key: str,
+        bucket_name: str,
+        max_pool_connections: int = 10,
+        keepalive_timeout: float = 15.0,
+        **options,
+    ):
+        """
+        Инициализирует сервис с параметрами подключения к S3.
+
+        Args:
+            endpoint_url: URL эндпоинта S3 (например, 'https://s3.example.com')
+            access_key_id: Идентификатор ключа доступа
+            secret_access_key: Секретный ключ доступа
+            bucket_name: Имя бакета для хранения файлов
+            max_pool_connections: Максимальное число соединений в пуле клиента
+            keepalive_timeout: Сколько секунд держать простаивающее соединение
+            **options: Общие параметры `ObjectStorageService`
+        """
+        super().__init__(**options)
+        self.endpoint_url = endpoint_url
+        self.bucket_name = bucket_name
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.session = aioboto3.Session()
+        self.config = AioConfig(
+            signature_version="s3v4",
+            max_pool_connections=max_pool_connections,
+            tcp_keepalive=True,
+            connector_args={"keepalive_timeout": keepalive_timeout},
+        )
+        self._client = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._client_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Открывает общий S3-клиент, если он ещё не открыт"""
+
+        async with self._client_lock:
+            if self._client is not None:
+                return
+
+            exit_stack = AsyncExitStack()
+            self._client = await exit_stack.enter_async_context(
+                self.session.client(
+                    "s3",
+                    endpoint_url=self.endpoint_url,
+                    aws_access_key_id=self.access_key_id,
+                    aws_secret_access_key=self.secret_access_key,
+                    config=self.config,
                 )
+            )
+            self._exit_stack = exit_stack
+            app_logger.info("S3-клиент открыт")
 
-                existing_keys = {obj["Key"] for obj in response.get("Contents", [])}
-                result = {}
+    async def close(self) -> None:
+        """Закрывает общий S3-клиент и его пул соединений"""
 
-                for profile_id, key in zip(profile_ids, keys):
-                    if key in existing_keys:
-                        result[profile_id] = await self._generate_presigned_url(s3, key)
-                    else:
-                        result[profile_id] = None
+        async with self._client_lock:
+            if self._exit_stack is None:
+                return
 
-                return result
-        except ClientError as e:
-            app_logger.error(f"Ошибка при получении списка аватарок: {e}")
-            raise ObjectListGetError("avatar")
+            await self._exit_stack.aclose()
+            self._client = None
+            self._exit_stack = None
+            app_logger.info("S3-клиент закрыт")
+
+    async def _get_client(self):
+        """
+        Возвращает общий асинхронный S3-клиент, открывая его при первом обращении.
+
+        Returns:
+            AioBaseClient: Асинхронный клиент для работы с S3
+        """
+        if self._client is None:
+            await self.start()
+        return self._client
+
+    async def _put_object(
+        self, key: str, data: bytes, content_type: str, metadata: dict[str, str]
+    ) -> None:
+        s3 = await self._get_client()
+        await s3.put_object(
+            Bucket=self.bucket_name,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            Metadata=metadata,
+        )
+
+    async def _delete_objects(self, keys: list[str]) -> None:
+        s3 = await self._get_client()
+        await s3.delete_objects(
+            Bucket=self.bucket_name,
+            Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+        )
 
-    async def _generate_presigned_url(
-        self, s3_client, key: str, expires_in: int = 3600
-    ) -> str:
+    async def _list_keys(self, prefix: str) -> AsyncIterator[list[str]]:
+        s3 = await self._get_client()
+        paginator = s3.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            yield [obj["Key"] for obj in page.get("Contents", [])]
+
+    async def _generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
         """
         Генерирует предподписанный URL для доступа к объекту в S3.
 
         Args:
-            s3_client: Асинхронный S3-клиент
             key: Ключ объекта в бакете
             expires_in: Время жизни URL в секундах (по умолчанию: 3600)
 
         Returns:
             str: Предподписанный URL для доступа к объекту
         """
-        return await s3_client.generate_presigned_url(
+        s3 = await self._get_client()
+        return await s3.generate_presigned_url(
             "get_object",
             Params={"Bucket": self.bucket_name, "Key": key},
             ExpiresIn=expires_in,
         )
+
+
+class LocalObjectStorageService(ObjectStorageService):
+    """
+    Бэкенд объектного хранилища в локальной файловой системе — для тестов,
+    бенчмарков и локального запуска без S3.
+
+    Объекты хранятся файлами в каталоге `root` (ключ — относительный путь),
+    файловые операции выполняются в пуле потоков через `anyio`.
+    Вместо предподписанных URL S3 выдаются ссылки на эндпоинт приложения
+    (`base_url`), подписанные HMAC и ограниченные по времени; эндпоинт
+    проверяет их через `resolve_signed_key`.
+    """
+
+    backend_errors = (OSError,)
+
+    def __init__(
+        self,
+        root: str,
+        base_url: str,
+        secret_key: str,
+        page_size: int = 1000,
+        **options,
+    ):
+        """
+        Args:
+            root: Каталог для хранения объектов (создаётся при необходимости)
+            base_url: URL эндпоинта, отдающего объекты (например, '/api/storage')
+            secret_key: Ключ для подписи URL
+            page_size: Число ключей на странице листинга
+            **options: Общие параметры `ObjectStorageService`
+        """
+        super().__init__(**options)
+        self.root = Path(root).resolve()
+        self.base_url = base_url.rstrip("/")
+        self.secret_key = secret_key.encode()
+        self.page_size = page_size
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if not path.is_relative_to(self.root):
+            raise ValueError(f"Key {key!r} is outside the storage root")
+        return path
+
+    def _sign(self, key: str, expires: int) -> str:
+        return hmac.new(
+            self.secret_key, f"{key}:{expires}".encode(), hashlib.sha256
+        ).hexdigest()
+
+    async def _put_object(
+        self, key: str, data: bytes, content_type: str, metadata: dict[str, str]
+    ) -> None:
+        path = anyio.Path(self._path(key))
+        await path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Запись во временный файл и переименование, чтобы читатели
+        # не увидели недописанный объект; имя временного файла уникально,
+        # иначе параллельные загрузки одного ключа перезаписывали бы его
+        temp_path = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        try:
+            await temp_path.write_bytes(data)
+            await temp_path.replace(path)
+        except BaseException:
+            await temp_path.unlink(missing_ok=True)
+            raise
+
+    async def _delete_objects(self, keys: list[str]) -> None:
+        for key in keys:
+            await anyio.Path(self._path(key)).unlink(missing_ok=True)
+
+    async def _list_keys(self, prefix: str) -> AsyncIterator[list[str]]:
+        def scan() -> list[str]:
+            # Обходится только каталог префикса, а не всё хранилище
+            directory = self._path(prefix.rpartition("/")[0])
+            if not directory.is_dir():
+                return []
+            keys = (
+                path.relative_to(self.root).as_posix()
+                for path in directory.rglob("*")
+                if path.is_file() and not path.name.startswith(".")
+            )
+            return sorted(key for key in keys if key.startswith(prefix))
+
+        keys = await anyio.to_thread.run_sync(scan)
+        for i in range(0, len(keys), self.page_size):
+            yield keys[i : i + self.page_size]
+
+    async def _generate_presigned_url(self, key: str, expires_in: int = 3600) -> str:
+        expires = int(time.time()) + expires_in
+        query = urlencode({"expires": expires, "signature": self._sign(key, expires)})
+        return f"{self.base_url}/{key}?{query}"
+
+    def resolve_signed_key(self, key: str, expires: int, signature: str) -> Path | None:
+        """
+        Проверяет подпись и срок ссылки, выданной `_generate_presigned_url`.
+
+        Args:
+            key: Ключ объекта
+            expires: Время истечения ссылки (Unix-время)
+            signature: Подпись ссылки
+
+        Returns:
+            Path | None: Путь к файлу объекта или None, если ссылка
+            недействительна, истекла или объекта нет
+        """
+        if expires < time.time():
+            return None
+        if not hmac.compare_digest(self._sign(key, expires), signature):
+            return None
+        try:
+            path = self._path(key)
+        except ValueError:
+            return None
+        return path if path.is_file() else None
+
+
+def create_object_storage_service() -> ObjectStorageService:
+    """Создаёт сервис объектного хранилища с бэкендом из `STORAGE_BACKEND`"""
+
+    options = dict(
+        presigned_url_expires_in=settings.S3_PRESIGNED_URL_EXPIRES_SECONDS,
+        presigned_url_refresh_margin=settings.S3_PRESIGNED_URL_REFRESH_MARGIN_SECONDS,
+        presigned_url_cache_size=settings.S3_PRESIGNED_URL_CACHE_SIZE,
+        default_avatar_variant=f"{settings.AVATAR_DEFAULT_SIZE}.{settings.AVATAR_DEFAULT_FORMAT}",
+    )
+    if settings.STORAGE_BACKEND == "local":
+        # Ключ подписи ссылок не должен совпадать с ключом JWT: если он не
+        # задан явно, выводится из JWT_SECRET_KEY с отдельным контекстом
+        signing_key = (
+            settings.LOCAL_STORAGE_SIGNING_KEY
+            or hmac.new(
+                settings.JWT_SECRET_KEY.encode(), b"local-storage-urls", hashlib.sha256
+            ).hexdigest()
+        )
+        return LocalObjectStorageService(
+            root=settings.LOCAL_STORAGE_ROOT,
+            base_url=settings.LOCAL_STORAGE_BASE_URL,
+            secret_key=signing_key,
+            **options,
+        )
+
+    return S3ObjectStorageService(
+        endpoint_url=settings.S3_ENDPOINT_URL,
+        access_key_id=settings.S3_ACCESS_KEY_ID,
+        secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        bucket_name=settings.S3_BUCKET_NAME,
+        max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+        keepalive_timeout=settings.S3_KEEPALIVE_TIMEOUT_SECONDS,
+        **options,
+    )
+
+
+object_storage_service = create_object_storage_service()
@@ -0,0 +1,27 @@
+import base64
+from datetime import datetime
+from uuid import UUID
+
+from app.core.exceptions.base import InvalidCursorError
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    """Кодирует позицию последней записи страницы в непрозрачный курсор"""
+
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Раскодирует курсор, полученный от `encode_cursor`.
+
+    Raises:
+        InvalidCursorError: Если курсор повреждён
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(id)
+    except ValueError:
+        raise InvalidCursorError()
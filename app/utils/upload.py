@@ -0,0 +1,43 @@
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.core.exceptions.file import FileTooLargeError
+
+
+@asynccontextmanager
+async def spool_upload(
+    upload: UploadFile, max_size: int, chunk_size: int
+) -> AsyncIterator[str]:
+    """
+    Копирует загруженный файл по частям во временный файл на диске
+    и возвращает путь к нему. В памяти одновременно находится не больше
+    одной части, а лимит размера проверяется по мере чтения.
+    Временный файл удаляется при выходе из контекста.
+
+    Args:
+        upload: Загруженный файл
+        max_size: Максимальный размер файла в байтах
+        chunk_size: Размер читаемой части в байтах
+
+    Yields:
+        str: Путь к временному файлу
+
+    Raises:
+        FileTooLargeError: Если размер файла превышает `max_size`
+    """
+    with tempfile.NamedTemporaryFile(prefix="upload-") as spooled:
+        size = 0
+        while chunk := await upload.read(chunk_size):
+            size += len(chunk)
+            if size > max_size:
+                raise FileTooLargeError(
+                    f"File is too large. Maximum size: {max_size // (1024 * 1024)}MB"
+                )
+            await run_in_threadpool(spooled.write, chunk)
+
+        await run_in_threadpool(spooled.flush)
+        yield spooled.name
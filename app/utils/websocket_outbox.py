@@ -0,0 +1,193 @@
+import asyncio
+import inspect
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, get_type_hints
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.db.models.websocket_outbox import WebSocketOutboxEvent
+from app.db.unit_of_work import UnitOfWork, outbox_ready
+from app.services.websocket.chat_roulette import WebSocketChatRouletteService
+from app.services.websocket.room import WebSocketRoomService
+
+
+def _restore_argument(annotation: Any, value: Any) -> Any:
+    """Возвращает аргументу тип, потерянный при сохранении в JSON"""
+
+    if value is None:
+        return None
+    if annotation is UUID or annotation == UUID | None:
+        return UUID(value)
+    if annotation is datetime or annotation == datetime | None:
+        return datetime.fromisoformat(value)
+    return value
+
+
+class WebSocketOutboxDispatcher:
+    """
+    Фоновая рассылка WebSocket-уведомлений из outbox.
+
+    Сервисы записывают события через `UnitOfWork.publish` в той же
+    транзакции, что и изменения данных, поэтому уведомление не теряется
+    при падении процесса между фиксацией и рассылкой, а время рассылки
+    не входит во время ответа. Диспетчер просыпается сразу после фиксации
+    события (или раз в `poll_interval`), забирает события пачками по порядку
+    и вызывает соответствующий метод broadcast_* сервиса рассылки.
+
+    Пачка забирается в короткой транзакции, рассылка идёт вне её, а результат
+    фиксируется второй транзакцией — блокировки строк и соединение из пула
+    не удерживаются на время рассылки.
+
+    Диспетчер рассчитан на один процесс приложения: подписчики хранятся
+    в памяти процесса, и при `--workers > 1` событие разошлётся только
+    подключённым к процессу, который его забрал, а блокировка `SKIP LOCKED`
+    держится только на время выборки и не закрепляет пачку за процессом.
+    Несколько процессов требуют общей шины событий (например, Redis pub/sub).
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        retention_seconds: float,
+        lag_warning_ms: float,
+    ):
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self.lag_warning_ms = lag_warning_ms
+        self.targets = {
+            "room": WebSocketRoomService(),
+            "chat_roulette": WebSocketChatRouletteService(),
+        }
+        self._signatures: dict[tuple[str, str], tuple[inspect.Signature, dict]] = {}
+        self._last_cleanup = 0.0
+
+        self.dispatched = 0
+        self.failed = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def get_stats(self) -> dict[str, float]:
+        return {
+            "dispatched": self.dispatched,
+            "failed": self.failed,
+            "last_lag_ms": self.last_lag_ms,
+            "max_lag_ms": self.max_lag_ms,
+        }
+
+    async def run(self):
+        try:
+            while True:
+                # Сигнал сбрасывается до выборки: события, зафиксированные
+                # во время рассылки пачки, разбудят следующую итерацию сразу
+                outbox_ready.clear()
+                try:
+                    claimed = await self.dispatch_batch()
+                    await self._cleanup_if_due()
+                except Exception as e:
+                    app_logger.error(f"Ошибка рассылки WebSocket-уведомлений: {e}")
+                    claimed = 0
+
+                if claimed < self.batch_size:
+                    try:
+                        async with asyncio.timeout(self.poll_interval):
+                            await outbox_ready.wait()
+                    except TimeoutError:
+                        pass
+
+        except asyncio.CancelledError:
+            app_logger.info("Задача рассылки WebSocket-уведомлений отменена")
+            raise
+
+    async def dispatch_batch(self) -> int:
+        """Рассылает одну пачку событий и возвращает число забранных событий"""
+
+        async with UnitOfWork() as uow:
+            events = await uow.websocket_outbox.claim_pending(
+                self.batch_size, self.max_attempts
+            )
+            await uow.commit()
+
+        if not events:
+            return 0
+
+        dispatched, failed = [], []
+        for event in events:
+            try:
+                await self._deliver(event)
+                dispatched.append(event.id)
+            except Exception as e:
+                failed.append(event.id)
+                app_logger.error(
+                    f"Ошибка рассылки события outbox {event.id} "
+                    f"({event.target}.{event.method}): {e}"
+                )
+
+        async with UnitOfWork() as uow:
+            await uow.websocket_outbox.mark_dispatched(dispatched)
+            await uow.websocket_outbox.mark_failed(failed)
+            await uow.commit()
+
+        self._record_lag(events)
+        self.dispatched += len(dispatched)
+        self.failed += len(failed)
+        return len(events)
+
+    async def _deliver(self, event: WebSocketOutboxEvent):
+        method = getattr(self.targets[event.target], event.method)
+        signature, hints = self._get_signature(event.target, method)
+
+        bound = signature.bind(
+            *event.payload.get("args", []), **event.payload.get("kwargs", {})
+        )
+        for name, value in bound.arguments.items():
+            bound.arguments[name] = _restore_argument(hints.get(name), value)
+
+        await method(*bound.args, **bound.kwargs)
+
+    def _get_signature(self, target: str, method) -> tuple[inspect.Signature, dict]:
+        key = (target, method.__name__)
+        if key not in self._signatures:
+            self._signatures[key] = (inspect.signature(method), get_type_hints(method))
+        return self._signatures[key]
+
+    def _record_lag(self, events: list[WebSocketOutboxEvent]):
+        now = datetime.now(timezone.utc)
+        lag_ms = (now - events[0].created_at).total_seconds() * 1000
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+        if lag_ms >= self.lag_warning_ms:
+            app_logger.warning(
+                f"Задержка рассылки WebSocket-уведомлений {lag_ms:.0f} мс "
+                f"({len(events)} событий в пачке)"
+            )
+
+    async def _cleanup_if_due(self):
+        if time.monotonic() - self._last_cleanup < self.retention_seconds / 10:
+            return
+
+        self._last_cleanup = time.monotonic()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.retention_seconds)
+        async with UnitOfWork() as uow:
+            deleted = await uow.websocket_outbox.delete_finished_before(
+                cutoff, self.max_attempts
+            )
+            await uow.commit()
+
+        if deleted:
+            app_logger.info(f"Удалено {deleted} обработанных событий outbox")
+
+
+websocket_outbox_dispatcher = WebSocketOutboxDispatcher(
+    batch_size=settings.WS_OUTBOX_BATCH_SIZE,
+    poll_interval=settings.WS_OUTBOX_POLL_INTERVAL_SECONDS,
+    max_attempts=settings.WS_OUTBOX_MAX_ATTEMPTS,
+    retention_seconds=settings.WS_OUTBOX_RETENTION_SECONDS,
+    lag_warning_ms=settings.WS_OUTBOX_LAG_WARNING_MS,
+)
@@ -1,3 +1,4 @@
+from contextlib import contextmanager
 from typing import AsyncGenerator
 
 import pytest
@@ -6,14 +7,18 @@ from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.api.dependencies import get_object_storage_service
 from app.db.database import Base, get_async_session
+from app.db.instrumentation import install_query_instrumentation, track_queries
 from app.main import app
+from app.utils.object_storage import LocalObjectStorageService, object_storage_service
 
 load_dotenv(".test.env", override=True)
 
 from app.core.config import settings
 
 engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+install_query_instrumentation(engine.sync_engine)
 TestingSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
@@ -44,12 +49,46 @@ async def client(setup_db) -> AsyncGenerator[AsyncClient, None]:
 
 @pytest.fixture
 def mock_s3(mocker):
-    mock = mocker.patch("app.utils.object_storage.ObjectStorageService")
-    mock.return_value.upload_avatar = mocker.AsyncMock(
-        return_value="http://fake.url/avatar.jpg"
+    mocker.patch.object(
+        object_storage_service,
+        "get_avatar_url",
+        mocker.AsyncMock(return_value="http://fake.url/avatar.jpg"),
     )
-    mock.return_value.get_avatar_url = mocker.AsyncMock(
-        return_value="http://fake.url/avatar.jpg"
+    for method in ("upload_avatar", "delete_avatar"):
+        mocker.patch.object(object_storage_service, method, mocker.AsyncMock())
+    return object_storage_service
+
+
+@pytest.fixture
+def local_storage(tmp_path):
+    """Подменяет S3 локальным хранилищем во временном каталоге"""
+
+    storage = LocalObjectStorageService(
+        root=str(tmp_path), base_url="/api/storage", secret_key="test"
     )
-    mock.return_value.delete_avatar = mocker.AsyncMock()
-    return mock
+    app.dependency_overrides[get_object_storage_service] = lambda: storage
+    yield storage
+    del app.dependency_overrides[get_object_storage_service]
+
+
+@pytest.fixture
+def query_budget():
+    """
+    Проверяет, что код внутри блока укладывается в заданное число SQL-запросов:
+
+        with query_budget(3):
+            await client.get("/api/profiles/")
+    """
+
+    @contextmanager
+    def assert_max_queries(max_queries: int):
+        with track_queries() as stats:
+            yield stats
+
+        repeated = stats.get_repeated_shapes(2)
+        assert stats.count <= max_queries, (
+            f"Ожидалось не больше {max_queries} SQL-запросов, выполнено {stats.count}. "
+            f"Повторяющиеся запросы: {repeated}"
+        )
+
+    return assert_max_queries
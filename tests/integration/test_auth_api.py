@@ -3,20 +3,22 @@ from httpx import AsyncClient
 
 
 @pytest.mark.asyncio
-async def test_register_and_login(client: AsyncClient):
-    reg_resp = await client.post(
-        "/api/auth/register",
-        json={"email": "test@example.com", "password": "StrongP@ss123"},
-    )
+async def test_register_and_login(client: AsyncClient, query_budget):
+    with query_budget(2):
+        reg_resp = await client.post(
+            "/api/auth/register",
+            json={"email": "test@example.com", "password": "StrongP@ss123"},
+        )
     assert reg_resp.status_code == 201
     tokens = reg_resp.json()
     assert "access_token" in tokens
     assert "refresh_token" in tokens
 
-    login_resp = await client.post(
-        "/api/auth/login",
-        json={"email": "test@example.com", "password": "StrongP@ss123"},
-    )
+    with query_budget(1):
+        login_resp = await client.post(
+            "/api/auth/login",
+            json={"email": "test@example.com", "password": "StrongP@ss123"},
+        )
     assert login_resp.status_code == 200
     assert "access_token" in login_resp.json()
 
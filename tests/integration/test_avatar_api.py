@@ -0,0 +1,49 @@
+from io import BytesIO
+
+import pytest
+from httpx import AsyncClient
+from PIL import Image
+
+
+@pytest.mark.asyncio
+async def test_avatar_upload_get_and_delete(client: AsyncClient, local_storage):
+    tokens = (
+        await client.post(
+            "/api/auth/register",
+            json={"email": "avatar@example.com", "password": "StrongP@ss123"},
+        )
+    ).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    profile = await client.post(
+        "/api/profiles/", json={"username": "avatar_owner"}, headers=headers
+    )
+    assert profile.status_code == 201
+    tokens = (
+        await client.post(
+            "/api/auth/select-profile",
+            json={"profile_id": profile.json()["id"]},
+            headers=headers,
+        )
+    ).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+    image = BytesIO()
+    Image.new("RGB", (64, 64), "red").save(image, format="PNG")
+    upload = await client.post(
+        "/api/profiles/me/avatar",
+        files={"file": ("avatar.png", image.getvalue(), "image/png")},
+        headers=headers,
+    )
+    assert upload.status_code == 200
+    avatar_url = upload.json()["avatar_url"]
+    assert avatar_url.startswith(local_storage.base_url)
+
+    avatar = await client.get(avatar_url)
+    assert avatar.status_code == 200
+    assert avatar.content
+
+    delete = await client.delete("/api/profiles/me/avatar", headers=headers)
+    assert delete.status_code == 200
+    assert (await client.get(avatar_url)).status_code == 404
+    assert not any(local_storage.root.rglob("*.*"))
@@ -0,0 +1,167 @@
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import event, text
+
+from app.repositories import (
+    ChatRouletteSearchRepository,
+    ChatRouletteSessionRepository,
+    ProfileRepository,
+    RoomParticipantRepository,
+    UserRepository,
+)
+from tests.conftest import TestingSessionLocal, engine
+
+INDEX_NODE_TYPES = {"Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+
+
+def iter_plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+async def explain(repository_call) -> list[dict]:
+    """
+    Выполняет метод репозитория, перехватывает его последний SQL-запрос
+    и возвращает узлы плана `EXPLAIN` для него. Последовательное сканирование
+    отключено, поэтому на пустых таблицах план показывает, может ли запрос
+    вообще использовать индекс.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    async with TestingSessionLocal() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        try:
+            await repository_call(session)
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", capture)
+
+        statement, parameters = statements[-1]
+        connection = await session.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        )
+        plan = result.scalar()
+        await session.rollback()
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return list(iter_plan_nodes(plan[0]["Plan"]))
+
+
+def assert_index_scan(nodes: list[dict], table: str, *index_names: str):
+    """
+    Проверяет, что таблица читается через индекс и что в плане участвуют
+    именно индексы `index_names` (а не прежние одноколоночные индексы).
+    """
+    scans = [
+        node
+        for node in nodes
+        if node.get("Relation Name") == table and node["Node Type"].endswith("Scan")
+    ]
+    assert scans, f"Таблица {table} не найдена в плане: {nodes}"
+    for scan in scans:
+        assert (
+            scan["Node Type"] in INDEX_NODE_TYPES
+        ), f"{table} читается через {scan['Node Type']}: {nodes}"
+
+    used = {node["Index Name"] for node in nodes if "Index Name" in node}
+    missing = set(index_names) - used
+    assert not missing, f"{table}: в плане нет индексов {missing}: {nodes}"
+
+
+@pytest.mark.asyncio
+async def test_roulette_session_lookups_use_indexes(setup_db):
+    profile_id = uuid4()
+
+    nodes = await explain(
+        lambda session: ChatRouletteSessionRepository(
+            session
+        ).find_active_session_by_profile(profile_id)
+    )
+    assert_index_scan(
+        nodes,
+        "chat_roulette_sessions",
+        "uq_chat_roulette_sessions_active_profile1_id",
+        "uq_chat_roulette_sessions_active_profile2_id",
+    )
+
+    nodes = await explain(
+        lambda session: ChatRouletteSessionRepository(session).find_waiting_sessions(
+            exclude_profile_id=profile_id
+        )
+    )
+    assert_index_scan(
+        nodes, "chat_roulette_sessions", "ix_chat_roulette_sessions_waiting_created_at"
+    )
+
+    nodes = await explain(
+        lambda session: ChatRouletteSessionRepository(session).find_matching_sessions(
+            profile_id
+        )
+    )
+    assert_index_scan(
+        nodes, "chat_roulette_sessions", "ix_chat_roulette_sessions_waiting_created_at"
+    )
+    assert_index_scan(
+        nodes, "chat_roulette_searches", "uq_chat_roulette_searches_active_profile_id"
+    )
+
+
+@pytest.mark.asyncio
+async def test_search_and_participant_lookups_use_indexes(setup_db):
+    profile_id = uuid4()
+
+    nodes = await explain(
+        lambda session: ChatRouletteSearchRepository(session).find_one(
+            profile_id=profile_id, is_active=True
+        )
+    )
+    assert_index_scan(
+        nodes, "chat_roulette_searches", "uq_chat_roulette_searches_active_profile_id"
+    )
+
+    nodes = await explain(
+        lambda session: ChatRouletteSearchRepository(session).deactivate_search(
+            profile_id
+        )
+    )
+    assert_index_scan(
+        nodes, "chat_roulette_searches", "uq_chat_roulette_searches_active_profile_id"
+    )
+
+    nodes = await explain(
+        lambda session: RoomParticipantRepository(session).get_participant(
+            uuid4(), profile_id
+        )
+    )
+    assert_index_scan(nodes, "room_participants", "room_participants_pkey")
+
+    nodes = await explain(
+        lambda session: RoomParticipantRepository(session).count_rooms_for_profile(
+            profile_id
+        )
+    )
+    assert_index_scan(nodes, "room_participants", "ix_room_participants_profile_id")
+
+
+@pytest.mark.asyncio
+async def test_keyset_pagination_uses_indexes(setup_db):
+    after = (datetime.now(timezone.utc), uuid4())
+
+    for repository, table in (
+        (UserRepository, "users"),
+        (ProfileRepository, "profiles"),
+    ):
+        nodes = await explain(
+            lambda session: repository(session).find_page(limit=20, after=after)
+        )
+        assert_index_scan(nodes, table, f"ix_{table}_created_at_id")
@@ -0,0 +1,107 @@
+"""
+Бенчмарк проверки паролей при одновременных входах: пропускная способность,
+задержка входа и задержка цикла событий для проверки argon2 прямо в цикле
+событий (прежняя схема) и в ограниченном пуле потоков `PasswordHasher`.
+
+База не нужна, параметры argon2 берутся из настроек приложения:
+
+    python -m tests.load.login_throughput --logins 200 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core.config import settings
+from app.core.exceptions.auth import PasswordHasherBusyError
+from app.core.security import PasswordHasher
+
+PASSWORD = "StrongP@ss123"
+
+
+class InlineHasher:
+    """Прежняя схема: проверка выполняется синхронно в цикле событий"""
+
+    def __init__(self, hasher: PasswordHasher):
+        self.context = hasher.context
+
+    async def verify_and_update(self, password: str, hashed_password: str):
+        return self.context.verify_and_update(password, hashed_password)
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.005) -> float:
+    """Максимальное опоздание периодической задачи — время, на которое
+    останавливаются остальные запросы и WebSocket-соединения"""
+
+    max_lag = 0.0
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        max_lag = max(max_lag, time.perf_counter() - started_at - interval)
+    return max_lag
+
+
+async def run_logins(name: str, hasher, password_hash: str, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies, rejected = [], 0
+
+    # Все входы пакета приходят одновременно, задержка считается от начала
+    async def login():
+        nonlocal rejected
+        async with semaphore:
+            try:
+                await hasher.verify_and_update(PASSWORD, password_hash)
+            except PasswordHasherBusyError:
+                rejected += 1
+                return
+            latencies.append(time.perf_counter() - started_at)
+
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+    started_at = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(args.logins)))
+    elapsed = time.perf_counter() - started_at
+    stop.set()
+    max_lag = await lag_task
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0
+    print(
+        f"{name:>8}: {len(latencies) / elapsed:7.1f} входов/с, "
+        f"p50 {statistics.median(latencies) * 1000 if latencies else 0:7.1f} мс, "
+        f"p99 {p99 * 1000:7.1f} мс, "
+        f"остановка цикла событий {max_lag * 1000:7.1f} мс, "
+        f"отклонено {rejected}"
+    )
+
+
+async def run(args):
+    hasher = PasswordHasher(
+        workers=args.workers,
+        max_queue=args.max_queue,
+        time_cost=settings.ARGON2_TIME_COST,
+        memory_cost=settings.ARGON2_MEMORY_COST,
+        parallelism=settings.ARGON2_PARALLELISM,
+    )
+    password_hash = await hasher.hash(PASSWORD)
+
+    await run_logins("в цикле", InlineHasher(hasher), password_hash, args)
+    await run_logins("в пуле", hasher, password_hash, args)
+    hasher.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument(
+        "--max-queue", type=int, default=settings.PASSWORD_HASH_MAX_QUEUE
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Бенчмарк операций с аватарками: новый клиент aioboto3 на каждый вызов
+(прежняя схема) против общего долгоживущего клиента `S3ObjectStorageService`.
+
+Нужен S3-совместимый сервер, например moto в режиме сервера:
+
+    moto_server -p 5000
+    python -m tests.load.object_storage --endpoint http://localhost:5000 --calls 200
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+import aioboto3
+from botocore.client import Config
+
+from app.utils.object_storage import S3ObjectStorageService
+
+
+class LegacyObjectStorageService(S3ObjectStorageService):
+    """Прежняя схема: сессия и клиент создаются на каждую операцию"""
+
+    async def head_avatar(self, profile_id) -> None:
+        session = aioboto3.Session()
+        async with session.client(
+            "s3",
+            endpoint_url=self.endpoint_url,
+            aws_access_key_id=self.access_key_id,
+            aws_secret_access_key=self.secret_access_key,
+            config=Config(signature_version="s3v4"),
+        ) as s3:
+            await s3.head_object(
+                Bucket=self.bucket_name, Key=self._avatar_key(profile_id, "256.webp")
+            )
+
+
+class PooledObjectStorageService(S3ObjectStorageService):
+    """Текущая схема: общий клиент сервиса"""
+
+    async def head_avatar(self, profile_id) -> None:
+        s3 = await self._get_client()
+        await s3.head_object(
+            Bucket=self.bucket_name, Key=self._avatar_key(profile_id, "256.webp")
+        )
+
+
+async def measure(name: str, service, profile_id, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def call():
+        async with semaphore:
+            await service.head_avatar(profile_id)
+
+    await call()
+    started_at = time.perf_counter()
+    await asyncio.gather(*(call() for _ in range(args.calls)))
+    elapsed = time.perf_counter() - started_at
+
+    print(
+        f"{name:>8}: {args.calls / elapsed:8.1f} операций/с, "
+        f"{elapsed / args.calls * 1000:6.2f} мс/операцию"
+    )
+
+
+async def run(args):
+    options = dict(
+        endpoint_url=args.endpoint,
+        access_key_id="test",
+        secret_access_key="test",
+        bucket_name=args.bucket,
+    )
+    pooled = PooledObjectStorageService(
+        **options, max_pool_connections=args.concurrency
+    )
+    legacy = LegacyObjectStorageService(**options)
+
+    s3 = await pooled._get_client()
+    try:
+        await s3.create_bucket(Bucket=args.bucket)
+    except s3.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    profile_id = uuid4()
+    await pooled.upload_avatar(profile_id, {"256.webp": (b"avatar", "image/webp")})
+
+    await measure("прежний", legacy, profile_id, args)
+    await measure("общий", pooled, profile_id, args)
+
+    await pooled.delete_avatar(profile_id)
+    await pooled.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--endpoint", default="http://localhost:5000")
+    parser.add_argument("--bucket", default="benchmark-avatars")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
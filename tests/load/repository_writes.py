@@ -0,0 +1,139 @@
+"""
+Бенчмарк записи через базовый репозиторий: число обращений к базе и время
+на операцию для `add_one`/`update` на RETURNING и для пакетного `add_many`
+в сравнении с прежней схемой add + flush + refresh.
+
+Работает с базой из настроек приложения; все изменения выполняются в одной
+транзакции и откатываются в конце:
+
+    python -m tests.load.repository_writes --iterations 500
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from app.db.database import async_session_maker, engine
+from app.repositories import UserRepository
+
+
+class LegacyUserRepository(UserRepository):
+    async def add_one(self, data: dict):
+        instance = self.model(**data)
+        self.session.add(instance)
+        await self.session.flush()
+        await self.session.refresh(instance)
+        return instance
+
+    async def update(self, id, data: dict):
+        instance = await self.get_by_id(id)
+        if not instance:
+            return None
+
+        for field, value in data.items():
+            setattr(instance, field, value)
+
+        await self.session.flush()
+        await self.session.refresh(instance)
+        return instance
+
+
+class RoundTripCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+async def measure(name: str, iterations: int, operation, counter: RoundTripCounter):
+    counter.count = 0
+    started_at = time.perf_counter()
+    for index in range(iterations):
+        await operation(index)
+    elapsed = time.perf_counter() - started_at
+
+    print(
+        f"{name:>24}: {counter.count / iterations:.2f} запросов/операцию, "
+        f"{elapsed / iterations * 1000:.3f} мс/операцию"
+    )
+
+
+async def run(iterations: int, batch_size: int):
+    counter = RoundTripCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    run_id = uuid4().hex[:8]
+
+    try:
+        async with async_session_maker() as session:
+            legacy = LegacyUserRepository(session)
+            current = UserRepository(session)
+            legacy_ids, current_ids = [], []
+
+            async def legacy_add(index: int):
+                user = await legacy.add_one(
+                    {
+                        "email": f"legacy_{run_id}_{index}@example.com",
+                        "password_hash": "x",
+                    }
+                )
+                legacy_ids.append(user.id)
+
+            async def current_add(index: int):
+                user = await current.add_one(
+                    {
+                        "email": f"current_{run_id}_{index}@example.com",
+                        "password_hash": "x",
+                    }
+                )
+                current_ids.append(user.id)
+
+            async def legacy_update(index: int):
+                session.expunge_all()
+                await legacy.update(legacy_ids[index], {"password_hash": f"y{index}"})
+
+            async def current_update(index: int):
+                session.expunge_all()
+                await current.update(current_ids[index], {"password_hash": f"y{index}"})
+
+            async def current_add_many(index: int):
+                await current.add_many(
+                    [
+                        {
+                            "email": f"batch_{run_id}_{index}_{row}@example.com",
+                            "password_hash": "x",
+                        }
+                        for row in range(batch_size)
+                    ]
+                )
+
+            await measure("add_one (legacy)", iterations, legacy_add, counter)
+            await measure("add_one (RETURNING)", iterations, current_add, counter)
+            await measure("update (legacy)", iterations, legacy_update, counter)
+            await measure("update (RETURNING)", iterations, current_update, counter)
+            await measure(
+                f"add_many x{batch_size}",
+                max(1, iterations // batch_size),
+                current_add_many,
+                counter,
+            )
+
+            await session.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", counter)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
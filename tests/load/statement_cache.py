@@ -0,0 +1,166 @@
+"""
+Бенчмарк накладных расходов Python на один вызов горячих методов
+репозиториев: построение SQL-конструкции, вычисление ключа кэша, поиск
+скомпилированного SQL в кэше движка и подготовка параметров. Сеть и драйвер
+не участвуют, база не нужна:
+
+    python -m tests.load.statement_cache --iterations 20000
+
+Прежние версии методов (конструкция собирается на каждый вызов) сравниваются
+с текущими (готовые конструкции с параметрами).
+"""
+
+import argparse
+import asyncio
+import time
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.util import LRUCache
+
+from app.db.database import engine
+from app.db.models.chat_roulette_session import ChatRouletteSessionStatus
+from app.db.models.interest import Interest
+from app.db.models.profile_interest import ProfileInterest
+from app.repositories import (
+    ChatRouletteSessionRepository,
+    ProfileRepository,
+    RoomParticipantRepository,
+)
+
+
+class EmptyResult:
+    def scalar_one_or_none(self):
+        return None
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class CompileOnlySession:
+    """Сессия, которая выполняет всё до отправки запроса в драйвер"""
+
+    def __init__(self):
+        self.dialect = engine.sync_engine.dialect
+        self.compiled_cache = LRUCache(engine.sync_engine._compiled_cache.capacity)
+        self.cache_misses = 0
+
+    async def execute(self, statement, params=None):
+        compiled, extracted, cache_hit = statement._compile_w_cache(
+            self.dialect,
+            compiled_cache=self.compiled_cache,
+            column_keys=[],
+            for_executemany=False,
+            schema_translate_map=None,
+        )
+        if cache_hit != self.dialect.CACHE_HIT:
+            self.cache_misses += 1
+        compiled.construct_params(params, extracted_parameters=extracted)
+        return EmptyResult()
+
+
+class LegacyChatRouletteSessionRepository(ChatRouletteSessionRepository):
+    async def find_active_session_by_profile(self, profile_id: UUID):
+        stmt = select(self.model).where(
+            or_(
+                self.model.profile1_id == profile_id,
+                self.model.profile2_id == profile_id,
+            ),
+            self.model.status == ChatRouletteSessionStatus.ACTIVE,
+        )
+
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+
+class LegacyRoomParticipantRepository(RoomParticipantRepository):
+    async def get_participant(self, room_id: UUID, profile_id: UUID):
+        stmt = select(self.model).where(
+            and_(self.model.room_id == room_id, self.model.profile_id == profile_id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+
+class LegacyProfileRepository(ProfileRepository):
+    async def get_profile_interests(
+        self, profile_id: UUID, accept_language: str = "en"
+    ):
+        stmt = (
+            select(Interest)
+            .join(ProfileInterest, ProfileInterest.interest_id == Interest.id)
+            .join(self.model, self.model.id == ProfileInterest.profile_id)
+            .where(self.model.id == profile_id)
+            .where(Interest.name_translations[accept_language].astext.is_not(None))
+        )
+
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+
+async def measure(name: str, iterations: int, call, session: CompileOnlySession):
+    await call()
+    session.cache_misses = 0
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        await call()
+    elapsed = time.perf_counter() - started_at
+
+    print(
+        f"{name:>48}: {elapsed / iterations * 1_000_000:8.1f} мкс/вызов, "
+        f"промахов кэша: {session.cache_misses}"
+    )
+
+
+async def run(iterations: int):
+    session = CompileOnlySession()
+    profile_id, room_id = uuid4(), uuid4()
+
+    cases = [
+        (
+            "find_active_session_by_profile",
+            LegacyChatRouletteSessionRepository(session),
+            ChatRouletteSessionRepository(session),
+            lambda repository: repository.find_active_session_by_profile(profile_id),
+        ),
+        (
+            "get_participant",
+            LegacyRoomParticipantRepository(session),
+            RoomParticipantRepository(session),
+            lambda repository: repository.get_participant(room_id, profile_id),
+        ),
+        (
+            "get_profile_interests",
+            LegacyProfileRepository(session),
+            ProfileRepository(session),
+            lambda repository: repository.get_profile_interests(profile_id, "ru"),
+        ),
+        (
+            "find_one",
+            None,
+            ProfileRepository(session),
+            lambda repository: repository.find_one(user_id=profile_id),
+        ),
+    ]
+
+    for name, legacy, current, call in cases:
+        if legacy is not None:
+            await measure(
+                f"{name} (прежний)", iterations, lambda: call(legacy), session
+            )
+        await measure(f"{name} (текущий)", iterations, lambda: call(current), session)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Бенчмарк операций с аватарками на разных бэкендах объектного хранилища:
+загрузка вариантов, подпись URL (без кэша) и удаление. Локальный бэкенд
+работает без S3; S3 добавляется в сравнение, если указан `--endpoint`
+(например, moto в режиме сервера):
+
+    python -m tests.load.storage_backends --profiles 200
+    python -m tests.load.storage_backends --endpoint http://localhost:5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from uuid import uuid4
+
+from app.utils.object_storage import (
+    LocalObjectStorageService,
+    ObjectStorageService,
+    S3ObjectStorageService,
+)
+
+VARIANTS = {
+    f"{size}.{extension}": (b"x" * size * 8, content_type)
+    for size in (64, 256, 512)
+    for extension, content_type in (("webp", "image/webp"), ("jpg", "image/jpeg"))
+}
+
+
+async def timed(semaphore: asyncio.Semaphore, operation) -> float:
+    async with semaphore:
+        started_at = time.perf_counter()
+        await operation
+        return time.perf_counter() - started_at
+
+
+async def measure(name: str, service: ObjectStorageService, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+    profile_ids = [uuid4() for _ in range(args.profiles)]
+
+    print(f"{name}:")
+    for operation, make_call in (
+        ("загрузка", lambda profile_id: service.upload_avatar(profile_id, VARIANTS)),
+        (
+            "подпись URL",
+            lambda profile_id: service._generate_presigned_url(
+                service._avatar_key(profile_id, "256.webp"), 3600
+            ),
+        ),
+        ("удаление", service.delete_avatar),
+    ):
+        started_at = time.perf_counter()
+        latencies = await asyncio.gather(
+            *(timed(semaphore, make_call(profile_id)) for profile_id in profile_ids)
+        )
+        elapsed = time.perf_counter() - started_at
+        latencies.sort()
+
+        print(
+            f"  {operation:>12}: {len(latencies) / elapsed:8.1f} операций/с, "
+            f"p50 {statistics.median(latencies) * 1000:6.2f} мс, "
+            f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.2f} мс"
+        )
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as root:
+        local = LocalObjectStorageService(
+            root=root, base_url="/api/storage", secret_key="benchmark"
+        )
+        await measure("local", local, args)
+
+    if args.endpoint:
+        s3 = S3ObjectStorageService(
+            endpoint_url=args.endpoint,
+            access_key_id="test",
+            secret_access_key="test",
+            bucket_name=args.bucket,
+            max_pool_connections=args.concurrency,
+        )
+        client = await s3._get_client()
+        try:
+            await client.create_bucket(Bucket=args.bucket)
+        except client.exceptions.BucketAlreadyOwnedByYou:
+            pass
+        await measure("s3", s3, args)
+        await s3.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--endpoint", default=None)
+    parser.add_argument("--bucket", default="benchmark-avatars")
+    parser.add_argument("--profiles", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,735 @@
+"""
+Нагрузочный генератор для WebSocket-эндпоинтов комнат и чат-рулетки.
+
+Поднимает приложение через uvicorn (или подключается к уже запущенному по
+`--base-url`), создаёт через REST пользователей, профили, комнаты и пары
+чат-рулетки, открывает тысячи сокетов и с заданной интенсивностью шлёт
+сообщения, события набора текста и переподключения. В конце печатает
+p50/p99 задержки доставки, кадры в секунду и RSS сервера.
+
+База данных берётся из тех же переменных окружения, что и у приложения,
+поэтому запускать генератор стоит на локальном Postgres с применёнными
+миграциями:
+
+    alembic upgrade head
+    python -m tests.load.websocket_load --rooms 50 --clients-per-room 40 \\
+        --roulette-pairs 200 --duration 60
+
+Флаг `--transport gateway` направляет клиентов комнат через единый сокет
+`/ws/gateway` вместо отдельных `/ws/rooms/{room_id}`.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from uuid import UUID, uuid4
+
+import httpx
+import msgpack
+from websockets.asyncio.client import connect
+
+PASSWORD = "LoadTest_Passw0rd"
+
+
+MSGPACK_SUBPROTOCOL = "commonground.msgpack.v1"
+EXPANDED_ENVELOPE_KEYS = {"t": "type", "d": "data", "ts": "timestamp", "q": "seq"}
+
+
+class WireFormat:
+    """Кодирование кадров клиента в JSON или в компактный MessagePack."""
+
+    def __init__(self, protocol: str, compression: str | None = "deflate"):
+        self.protocol = protocol
+        self.compression = compression
+        self.subprotocols = [MSGPACK_SUBPROTOCOL] if protocol == "msgpack" else None
+
+    def encode(self, frame: dict) -> str | bytes:
+        if self.protocol == "msgpack":
+            return msgpack.packb(frame)
+        return json.dumps(frame)
+
+    def decode(self, raw: str | bytes) -> dict:
+        if self.protocol != "msgpack":
+            return json.loads(raw)
+
+        event = msgpack.unpackb(raw, timestamp=3)
+        return {
+            EXPANDED_ENVELOPE_KEYS.get(key, key): self._expand(value)
+            for key, value in event.items()
+        }
+
+    def _expand(self, value):
+        if isinstance(value, bytes) and len(value) == 16:
+            return str(UUID(bytes=value))
+        if isinstance(value, dict):
+            return {key: self._expand(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._expand(item) for item in value]
+        return value
+
+
+wire = WireFormat("json")
+
+
+class LoadStats:
+    def __init__(self):
+        self.message_latencies: list[float] = []
+        self.typing_latencies: list[float] = []
+        self.roulette_latencies: list[float] = []
+        self.frames_received = 0
+        self.bytes_received = 0
+        self.messages_sent = 0
+        self.typing_sent = 0
+        self.reconnects = 0
+        self.replayed_events = 0
+        self.resyncs = 0
+        self.errors = 0
+        self.rss_samples: list[int] = []
+
+
+class ServerProcess:
+    def __init__(self, port: int, log_path: str):
+        self.port = port
+        self.log_path = log_path
+        self.process: subprocess.Popen | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self):
+        log_file = open(self.log_path, "w")
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "app.main:app",
+                "--host",
+                "127.0.0.1",
+                "--port",
+                str(self.port),
+                "--log-level",
+                "warning",
+            ],
+            stdout=log_file,
+            stderr=subprocess.STDOUT,
+        )
+
+        async with httpx.AsyncClient(base_url=self.base_url) as client:
+            for _ in range(100):
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"Сервер завершился, см. лог {self.log_path}")
+                try:
+                    await client.get("/openapi.json")
+                    return
+                except httpx.TransportError:
+                    await asyncio.sleep(0.2)
+
+        raise RuntimeError("Сервер не поднялся за 20 секунд")
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait(timeout=10)
+
+
+def read_rss(pid: int) -> int | None:
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+class ProfileClient:
+    def __init__(self, profile_id: str, token: str):
+        self.profile_id = profile_id
+        self.token = token
+
+
+async def seed_profiles(
+    http: httpx.AsyncClient, count: int, profiles_per_user: int, run_id: str
+) -> list[ProfileClient]:
+    """
+    Создаёт пользователей и профили через REST и возвращает токены с выбранным
+    профилем. Несколько профилей на пользователя экономят дорогое хэширование.
+    """
+    profiles: list[ProfileClient] = []
+    user_count = (count + profiles_per_user - 1) // profiles_per_user
+
+    for user_index in range(user_count):
+        response = await http.post(
+            "/api/auth/register",
+            json={
+                "email": f"load_{run_id}_{user_index}@example.com",
+                "password": PASSWORD,
+            },
+        )
+        response.raise_for_status()
+        user_token = response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {user_token}"}
+
+        async def create_profile(profile_index: int) -> ProfileClient:
+            response = await http.post(
+                "/api/profiles/",
+                json={"username": f"l{run_id}u{user_index}p{profile_index}"},
+                headers=headers,
+            )
+            response.raise_for_status()
+            profile_id = response.json()["id"]
+
+            response = await http.post(
+                "/api/auth/select-profile",
+                json={"profile_id": profile_id},
+                headers=headers,
+            )
+            response.raise_for_status()
+            return ProfileClient(profile_id, response.json()["access_token"])
+
+        batch = min(profiles_per_user, count - len(profiles))
+        profiles.extend(
+            await asyncio.gather(*(create_profile(index) for index in range(batch)))
+        )
+
+    return profiles
+
+
+async def seed_rooms(
+    http: httpx.AsyncClient,
+    profiles: list[ProfileClient],
+    rooms: int,
+    clients_per_room: int,
+    run_id: str,
+) -> dict[str, list[ProfileClient]]:
+    room_members: dict[str, list[ProfileClient]] = {}
+
+    for room_index in range(rooms):
+        members = profiles[
+            room_index * clients_per_room : (room_index + 1) * clients_per_room
+        ]
+        creator = members[0]
+
+        response = await http.post(
+            "/api/rooms/",
+            json={
+                "name": f"load-{run_id}-{room_index}",
+                "max_participants": max(2, min(1000, clients_per_room)),
+            },
+            headers={"Authorization": f"Bearer {creator.token}"},
+        )
+        response.raise_for_status()
+        room_id = response.json()["id"]
+
+        await asyncio.gather(
+            *(
+                http.post(
+                    f"/api/rooms/{room_id}/join",
+                    headers={"Authorization": f"Bearer {member.token}"},
+                )
+                for member in members[1:]
+            )
+        )
+        room_members[room_id] = members
+
+    return room_members
+
+
+async def seed_roulette_pairs(
+    http: httpx.AsyncClient, profiles: list[ProfileClient]
+) -> list[tuple[str, ProfileClient, ProfileClient]]:
+    """
+    Запускает поиск для пар профилей одновременно, чтобы они сматчились друг
+    с другом, и возвращает активные сессии.
+    """
+
+    async def search(profile: ProfileClient) -> str | None:
+        response = await http.post(
+            "/api/chat-roulette/search",
+            json={},
+            headers={"Authorization": f"Bearer {profile.token}"},
+            timeout=30,
+        )
+        if response.status_code != 201:
+            return None
+        return response.json()["session"]["id"]
+
+    sessions: dict[str, list[ProfileClient]] = {}
+    for first, second in zip(profiles[::2], profiles[1::2]):
+        session_ids = await asyncio.gather(search(first), search(second))
+        for profile, session_id in zip((first, second), session_ids):
+            if session_id:
+                sessions.setdefault(session_id, []).append(profile)
+
+    return [
+        (session_id, members[0], members[1])
+        for session_id, members in sessions.items()
+        if len(members) == 2
+    ]
+
+
+class RoomLoadClient:
+    def __init__(
+        self,
+        ws_url: str,
+        room_id: str,
+        profile: ProfileClient,
+        transport: str,
+        stats: LoadStats,
+        sent_at: dict[str, float],
+        typing_sent_at: dict[str, float],
+    ):
+        self.ws_url = ws_url
+        self.room_id = room_id
+        self.profile = profile
+        self.transport = transport
+        self.stats = stats
+        self.sent_at = sent_at
+        self.typing_sent_at = typing_sent_at
+        self.channel = f"room:{room_id}"
+        self.websocket = None
+        self.reader: asyncio.Task | None = None
+        self.last_seq: int | None = None
+
+    async def open(self):
+        if self.transport == "gateway":
+            self.websocket = await connect(
+                f"{self.ws_url}/ws/gateway?token={self.profile.token}",
+                subprotocols=wire.subprotocols,
+                compression=wire.compression,
+            )
+            frame = {"action": "subscribe", "channel": self.channel}
+            if self.last_seq is not None:
+                frame["last_seq"] = self.last_seq
+            await self.websocket.send(wire.encode(frame))
+        else:
+            url = f"{self.ws_url}/ws/rooms/{self.room_id}?token={self.profile.token}"
+            if self.last_seq is not None:
+                url += f"&last_seq={self.last_seq}"
+            self.websocket = await connect(
+                url, subprotocols=wire.subprotocols, compression=wire.compression
+            )
+
+        self.reader = asyncio.create_task(self._read())
+
+    async def close(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+        if self.reader is not None:
+            await asyncio.gather(self.reader, return_exceptions=True)
+
+    async def reconnect(self):
+        await self.close()
+        self.stats.reconnects += 1
+        await self.open()
+
+    async def send(self, frame: dict):
+        if self.transport == "gateway":
+            frame = {**frame, "channel": self.channel}
+        await self.websocket.send(wire.encode(frame))
+
+    async def send_message(self):
+        message_id = uuid4().hex
+        self.sent_at[message_id] = time.perf_counter()
+        await self.send({"type": "send_message", "content": f"load:{message_id}"})
+        self.stats.messages_sent += 1
+
+    async def send_typing(self):
+        self.typing_sent_at[self.profile.profile_id] = time.perf_counter()
+        await self.send({"type": "typing_started"})
+        self.stats.typing_sent += 1
+
+    async def _read(self):
+        replaying = self.last_seq is not None
+        try:
+            async for raw in self.websocket:
+                received_at = time.perf_counter()
+                self.stats.frames_received += 1
+                self.stats.bytes_received += len(raw)
+                event = wire.decode(raw)
+                event_type = event.get("type")
+
+                if event.get("seq") is not None:
+                    if replaying and event_type != "connection_established":
+                        self.stats.replayed_events += 1
+                    self.last_seq = event["seq"]
+
+                if event_type == "message_sent":
+                    content = event["data"]["message"]["content"]
+                    sent_at = self.sent_at.get(content.removeprefix("load:"))
+                    if sent_at is not None:
+                        self.stats.message_latencies.append(received_at - sent_at)
+                elif event_type == "typing_started":
+                    sent_at = self.typing_sent_at.get(event["data"]["profile_id"])
+                    if sent_at is not None:
+                        self.stats.typing_latencies.append(received_at - sent_at)
+                elif event_type == "connection_established":
+                    replaying = self.last_seq is not None
+                elif event_type == "resync_required":
+                    self.stats.resyncs += 1
+                elif event_type == "ping":
+                    await self.websocket.send(wire.encode({"type": "ping"}))
+                elif event_type == "error":
+                    self.stats.errors += 1
+        except Exception:
+            pass
+
+
+class RouletteLoadClient:
+    def __init__(
+        self,
+        ws_url: str,
+        session_id: str,
+        profile: ProfileClient,
+        stats: LoadStats,
+        sent_at: dict[str, float],
+    ):
+        self.ws_url = ws_url
+        self.session_id = session_id
+        self.profile = profile
+        self.stats = stats
+        self.sent_at = sent_at
+        self.websocket = None
+        self.reader: asyncio.Task | None = None
+
+    async def open(self):
+        self.websocket = await connect(
+            f"{self.ws_url}/ws/chat-roulette/{self.session_id}"
+            f"?token={self.profile.token}",
+            subprotocols=wire.subprotocols,
+            compression=wire.compression,
+        )
+        self.reader = asyncio.create_task(self._read())
+
+    async def close(self):
+        if self.websocket is not None:
+            await self.websocket.close()
+        if self.reader is not None:
+            await asyncio.gather(self.reader, return_exceptions=True)
+
+    async def send_message(self):
+        message_id = uuid4().hex
+        self.sent_at[message_id] = time.perf_counter()
+        await self.websocket.send(
+            wire.encode({"type": "send_message", "content": f"load:{message_id}"})
+        )
+        self.stats.messages_sent += 1
+
+    async def _read(self):
+        try:
+            async for raw in self.websocket:
+                received_at = time.perf_counter()
+                self.stats.frames_received += 1
+                self.stats.bytes_received += len(raw)
+                event = wire.decode(raw)
+
+                if event.get("type") == "message_sent":
+                    content = event["data"]["message"]["content"]
+                    sent_at = self.sent_at.get(content.removeprefix("load:"))
+                    if sent_at is not None:
+                        self.stats.roulette_latencies.append(received_at - sent_at)
+                elif event.get("type") == "ping":
+                    await self.websocket.send(wire.encode({"type": "ping"}))
+                elif event.get("type") == "error":
+                    self.stats.errors += 1
+        except Exception:
+            pass
+
+
+async def run_at_rate(rate: float, duration: float, action):
+    """Вызывает `action` с пуассоновским потоком событий интенсивностью `rate` в секунду."""
+    if rate <= 0:
+        return
+
+    deadline = time.perf_counter() + duration
+    pending: set[asyncio.Task] = set()
+
+    while True:
+        await asyncio.sleep(random.expovariate(rate))
+        if time.perf_counter() >= deadline:
+            break
+        task = asyncio.create_task(action())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def open_all(clients, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def open_one(client):
+        async with semaphore:
+            await client.open()
+
+    await asyncio.gather(*(open_one(client) for client in clients))
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def build_report(stats: LoadStats, elapsed: float, sockets: int) -> dict:
+    def latency_summary(values: list[float]) -> dict:
+        return {
+            "count": len(values),
+            "p50_ms": _ms(percentile(values, 0.50)),
+            "p99_ms": _ms(percentile(values, 0.99)),
+            "mean_ms": _ms(statistics.fmean(values)) if values else None,
+        }
+
+    return {
+        "sockets": sockets,
+        "duration_s": round(elapsed, 2),
+        "frames_received": stats.frames_received,
+        "frames_per_second": round(stats.frames_received / elapsed, 1),
+        "bytes_received": stats.bytes_received,
+        "bytes_per_frame": (
+            round(stats.bytes_received / stats.frames_received, 1)
+            if stats.frames_received
+            else None
+        ),
+        "messages_sent": stats.messages_sent,
+        "typing_sent": stats.typing_sent,
+        "reconnects": stats.reconnects,
+        "replayed_events": stats.replayed_events,
+        "resyncs": stats.resyncs,
+        "errors": stats.errors,
+        "room_message_fanout": latency_summary(stats.message_latencies),
+        "room_typing_fanout": latency_summary(stats.typing_latencies),
+        "roulette_message_fanout": latency_summary(stats.roulette_latencies),
+        "server_rss_mb": {
+            "start": _mb(stats.rss_samples[0]) if stats.rss_samples else None,
+            "peak": _mb(max(stats.rss_samples)) if stats.rss_samples else None,
+            "end": _mb(stats.rss_samples[-1]) if stats.rss_samples else None,
+        },
+    }
+
+
+def _ms(value: float | None) -> float | None:
+    return round(value * 1000, 2) if value is not None else None
+
+
+def _mb(value: int) -> float:
+    return round(value / (1024 * 1024), 1)
+
+
+async def sample_rss(pid: int | None, stats: LoadStats, stop: asyncio.Event):
+    if pid is None:
+        return
+    while not stop.is_set():
+        rss = read_rss(pid)
+        if rss is not None:
+            stats.rss_samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run(args: argparse.Namespace) -> dict:
+    global wire
+    wire = WireFormat(args.protocol, None if args.no_compression else "deflate")
+
+    server = None
+    base_url = args.base_url
+    server_pid = args.server_pid
+
+    if base_url is None:
+        server = ServerProcess(args.port, args.server_log)
+        await server.start()
+        base_url = server.base_url
+        server_pid = server.process.pid
+
+    ws_url = base_url.replace("http", "ws", 1)
+    run_id = uuid4().hex[:6]
+    stats = LoadStats()
+    stop_sampling = asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(server_pid, stats, stop_sampling))
+
+    try:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as http:
+            room_profiles = args.rooms * args.clients_per_room
+            profiles = await seed_profiles(
+                http,
+                room_profiles + args.roulette_pairs * 2,
+                args.profiles_per_user,
+                run_id,
+            )
+            room_members = await seed_rooms(
+                http,
+                profiles[:room_profiles],
+                args.rooms,
+                args.clients_per_room,
+                run_id,
+            )
+            roulette_sessions = await seed_roulette_pairs(
+                http, profiles[room_profiles:]
+            )
+
+        sent_at: dict[str, float] = {}
+        typing_sent_at: dict[str, float] = {}
+        room_clients = [
+            RoomLoadClient(
+                ws_url,
+                room_id,
+                profile,
+                args.transport,
+                stats,
+                sent_at,
+                typing_sent_at,
+            )
+            for room_id, members in room_members.items()
+            for profile in members
+        ]
+        roulette_clients = [
+            RouletteLoadClient(ws_url, session_id, profile, stats, sent_at)
+            for session_id, first, second in roulette_sessions
+            for profile in (first, second)
+        ]
+
+        await open_all(room_clients + roulette_clients, args.connect_concurrency)
+        await asyncio.sleep(1)
+
+        async def random_room_message():
+            await random.choice(room_clients).send_message()
+
+        async def random_typing():
+            await random.choice(room_clients).send_typing()
+
+        async def random_reconnect():
+            await random.choice(room_clients).reconnect()
+
+        async def random_roulette_message():
+            await random.choice(roulette_clients).send_message()
+
+        started_at = time.perf_counter()
+        frames_before = stats.frames_received
+        stats.frames_received = 0
+        stats.bytes_received = 0
+        await asyncio.gather(
+            (
+                run_at_rate(
+                    args.message_rate * args.rooms, args.duration, random_room_message
+                )
+                if room_clients
+                else asyncio.sleep(0)
+            ),
+            (
+                run_at_rate(args.typing_rate * args.rooms, args.duration, random_typing)
+                if room_clients
+                else asyncio.sleep(0)
+            ),
+            (
+                run_at_rate(args.reconnect_rate, args.duration, random_reconnect)
+                if room_clients
+                else asyncio.sleep(0)
+            ),
+            (
+                run_at_rate(
+                    args.roulette_message_rate * len(roulette_sessions),
+                    args.duration,
+                    random_roulette_message,
+                )
+                if roulette_clients
+                else asyncio.sleep(0)
+            ),
+        )
+        await asyncio.sleep(args.drain)
+        elapsed = time.perf_counter() - started_at
+
+        report = build_report(stats, elapsed, len(room_clients) + len(roulette_clients))
+        report["setup_frames"] = frames_before
+
+        await asyncio.gather(
+            *(client.close() for client in room_clients + roulette_clients),
+            return_exceptions=True,
+        )
+        return report
+
+    finally:
+        stop_sampling.set()
+        await sampler
+        if server is not None:
+            server.stop()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--base-url", help="URL запущенного сервера; иначе сервер поднимается сам"
+    )
+    parser.add_argument(
+        "--server-pid", type=int, help="PID внешнего сервера для замера RSS"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--server-log", default="load_server.log")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--clients-per-room", type=int, default=20)
+    parser.add_argument("--roulette-pairs", type=int, default=20)
+    parser.add_argument("--profiles-per-user", type=int, default=50)
+    parser.add_argument(
+        "--transport", choices=["per-channel", "gateway"], default="per-channel"
+    )
+    parser.add_argument("--protocol", choices=["json", "msgpack"], default="json")
+    parser.add_argument(
+        "--no-compression", action="store_true", help="Отключить permessage-deflate"
+    )
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--drain", type=float, default=2.0, help="Ожидание доставки после нагрузки, с"
+    )
+    parser.add_argument(
+        "--message-rate", type=float, default=1.0, help="Сообщений в секунду на комнату"
+    )
+    parser.add_argument(
+        "--typing-rate",
+        type=float,
+        default=2.0,
+        help="Событий набора в секунду на комнату",
+    )
+    parser.add_argument(
+        "--reconnect-rate",
+        type=float,
+        default=1.0,
+        help="Переподключений в секунду всего",
+    )
+    parser.add_argument(
+        "--roulette-message-rate",
+        type=float,
+        default=0.5,
+        help="Сообщений в секунду на сессию",
+    )
+    parser.add_argument("--connect-concurrency", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="Печатать отчёт в JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    for key, value in report.items():
+        print(f"{key:>24}: {value}")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUNBUFFERED", "1")
+    main()
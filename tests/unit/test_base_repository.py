@@ -0,0 +1,41 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.repositories import ProfileRepository
+
+
+@pytest.mark.asyncio
+async def test_add_one_and_update_are_single_returning_statements():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    repository = ProfileRepository(session)
+
+    await repository.add_one({"user_id": uuid4(), "username": "tester"})
+    await repository.update(uuid4(), {"bio": "Hello", "unknown_field": 1})
+
+    assert session.execute.await_count == 2
+    insert_stmt, update_stmt = (
+        call.args[0] for call in session.execute.await_args_list
+    )
+    assert insert_stmt.is_insert and insert_stmt._returning
+    assert update_stmt.is_update and update_stmt._returning
+    assert "unknown_field" not in str(update_stmt)
+    session.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_find_one_reuses_statement_for_same_filter_shape():
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    repository = ProfileRepository(session)
+
+    await repository.find_one(user_id=uuid4(), unknown_field=1)
+    await repository.find_one(user_id=uuid4())
+    await repository.find_one(user_id=None)
+
+    first, second, null = session.execute.await_args_list
+    assert first.args[0] is second.args[0]
+    assert first.args[1]["filter_user_id"] != second.args[1]["filter_user_id"]
+    assert "IS NULL" in str(null.args[0]) and null.args[1] == {}
@@ -0,0 +1,26 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.core.exceptions.chat_roulette import AlreadyInSearchError
+from app.schemas.chat_roulette import ChatRouletteSearchRequest
+from app.services.chat_roulette import ChatRouletteService
+
+
+@pytest.mark.asyncio
+async def test_concurrent_search_conflict_is_reported_as_already_searching():
+    mock_uow = AsyncMock()
+    mock_uow.__aenter__.return_value = mock_uow
+    mock_uow.chat_roulette_search.find_one = AsyncMock(return_value=None)
+    mock_uow.chat_roulette_session.find_active_session_by_profile = AsyncMock(
+        return_value=None
+    )
+    mock_uow.chat_roulette_search.create_or_update_search = AsyncMock(
+        side_effect=IntegrityError("INSERT", {}, Exception("duplicate key"))
+    )
+    service = ChatRouletteService(mock_uow, MagicMock(), MagicMock())
+
+    with pytest.raises(AlreadyInSearchError):
+        await service.start_search(ChatRouletteSearchRequest(), uuid4())
@@ -0,0 +1,45 @@
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.api.websockets.gateway_connection import GatewayConnection, parse_channel
+from app.api.websockets.room_connection_manager import room_connection_manager
+
+
+def test_parse_channel_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        parse_channel(f"lobby:{uuid4()}")
+
+
+@pytest.mark.asyncio
+async def test_room_events_are_multiplexed_over_one_socket(mocker):
+    mocker.patch(
+        "app.api.websockets.gateway_connection.validate_room_access",
+        AsyncMock(return_value=True),
+    )
+    websocket = AsyncMock()
+    profile_id = uuid4()
+    room_ids = [uuid4(), uuid4()]
+    connection = GatewayConnection(websocket, profile_id)
+
+    for room_id in room_ids:
+        await connection.handle_frame(
+            {"action": "subscribe", "channel": f"room:{room_id}"}
+        )
+
+    websocket.send_json.reset_mock()
+    await room_connection_manager.broadcast({"type": "room_updated"}, room_ids[1])
+    websocket.send_json.assert_awaited_once()
+    sent = websocket.send_json.await_args.args[0]
+    assert sent["type"] == "room_updated"
+    assert sent["channel"] == f"room:{room_ids[1]}"
+
+    await connection.handle_frame(
+        {"action": "unsubscribe", "channel": f"room:{room_ids[0]}"}
+    )
+    assert not room_connection_manager.is_profile_connected(room_ids[0], profile_id)
+    assert room_connection_manager.is_profile_connected(room_ids[1], profile_id)
+
+    await connection.close()
+    assert room_connection_manager.get_profile_rooms(profile_id) == []
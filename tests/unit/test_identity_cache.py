@@ -0,0 +1,66 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import String, create_engine, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.db.identity_cache import identity_cache
+from app.repositories.base import Repository
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(20))
+
+
+class ItemRepository(Repository):
+    model = Item
+    cache_by_id = True
+
+
+def make_session() -> MagicMock:
+    session = MagicMock()
+    session.get = AsyncMock(side_effect=lambda model, id: Item(id=id, name="item"))
+    session.merge = AsyncMock(side_effect=lambda instance, load: instance)
+    return session
+
+
+@pytest.mark.asyncio
+async def test_get_by_id_is_shared_between_sessions_of_one_request():
+    first_session, second_session = make_session(), make_session()
+
+    with identity_cache() as cache:
+        await ItemRepository(first_session).get_by_id(1)
+        item = await ItemRepository(second_session).get_by_id(1)
+
+    assert item.name == "item"
+    second_session.get.assert_not_called()
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await ItemRepository(second_session).get_by_id(1)
+    second_session.get.assert_awaited_once()
+
+
+def test_writes_invalidate_cached_rows():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+
+    with identity_cache() as cache, Session(engine, expire_on_commit=False) as session:
+        session.add(Item(id=1, name="item"))
+        session.commit()
+
+        cache.put(Item, 1, session.get(Item, 1))
+        session.execute(update(Item).where(Item.id == 1).values(name="renamed"))
+        assert cache._rows == {}
+
+        item = session.get(Item, 1)
+        cache.put(Item, 1, item)
+        item.name = "flushed"
+        session.flush()
+        assert cache._rows == {}
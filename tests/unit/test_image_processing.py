@@ -0,0 +1,57 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.utils.image_processing import make_avatar_variants
+
+
+def make_image(path, size, format, mode="RGB", exif=None) -> str:
+    image = Image.new(mode, size, "red")
+    if exif is not None:
+        image.save(path, format=format, exif=exif)
+    else:
+        image.save(path, format=format)
+    return str(path)
+
+
+def test_variants_are_square_and_stripped_of_metadata(tmp_path):
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Orientation: поворот на 90°
+    exif[0x010F] = "Camera"
+    file_path = make_image(tmp_path / "avatar", (300, 200), "JPEG", exif=exif)
+
+    variants = make_avatar_variants(
+        file_path, [64, 256], max_pixels=10**6, webp_quality=80, jpeg_quality=85
+    )
+
+    assert set(variants) == {"64.webp", "64.jpg", "256.webp", "256.jpg"}
+    for name, (data, content_type) in variants.items():
+        size, extension = name.split(".")
+        with Image.open(BytesIO(data)) as image:
+            assert image.size == (int(size), int(size))
+            assert not image.getexif()
+            assert content_type == f"image/{'jpeg' if extension == 'jpg' else 'webp'}"
+
+
+def test_transparent_png_is_flattened_for_jpeg(tmp_path):
+    file_path = make_image(tmp_path / "avatar", (100, 100), "PNG", mode="RGBA")
+
+    variants = make_avatar_variants(
+        file_path, [64], max_pixels=10**6, webp_quality=80, jpeg_quality=85
+    )
+
+    with Image.open(BytesIO(variants["64.jpg"][0])) as image:
+        assert image.mode == "RGB"
+
+
+def test_invalid_or_oversized_images_are_rejected(tmp_path):
+    not_an_image = tmp_path / "not-an-image"
+    not_an_image.write_bytes(b"not an image")
+    oversized = make_image(tmp_path / "oversized", (2000, 2000), "PNG")
+
+    for file_path in (str(not_an_image), oversized):
+        with pytest.raises(ValueError):
+            make_avatar_variants(
+                file_path, [64], max_pixels=10**6, webp_quality=80, jpeg_quality=85
+            )
@@ -0,0 +1,79 @@
+import json
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.api.dependencies import get_interest_service
+from app.core.exceptions.interest import InterestNotFoundError
+from app.main import app
+from app.services.interest import InterestService
+from app.utils.interest_catalog import InterestCatalog
+
+
+def make_uow(interests):
+    uow = AsyncMock()
+    uow.__aenter__.return_value = uow
+    uow.interest.find_all = AsyncMock(return_value=interests)
+    return uow
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_loaded_once_and_serialized_per_language():
+    music, chess = uuid4(), uuid4()
+    uow = make_uow(
+        [
+            MagicMock(id=music, name_translations={"en": "Music", "ru": "Музыка"}),
+            MagicMock(id=chess, name_translations={"en": "Chess"}),
+        ]
+    )
+    catalog = InterestCatalog()
+
+    await catalog.load(uow)
+    await catalog.load(uow)
+
+    assert json.loads(catalog.get("en").body) == [
+        {"id": str(music), "name": "Music"},
+        {"id": str(chess), "name": "Chess"},
+    ]
+    assert json.loads(catalog.get("en").select([chess, music])) == [
+        {"id": str(music), "name": "Music"},
+        {"id": str(chess), "name": "Chess"},
+    ]
+    assert json.loads(catalog.get("ru").select([music, music])) == [
+        {"id": str(music), "name": "Музыка"}
+    ]
+    with pytest.raises(InterestNotFoundError):
+        catalog.get("ru").select([chess])
+    assert catalog.get("de").body == b"[]"
+    assert catalog.get("en").etag != catalog.get("ru").etag
+    assert uow.interest.find_all.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_interests_endpoint_answers_304_for_matching_etag():
+    uow = make_uow([MagicMock(id=uuid4(), name_translations={"en": "Music"})])
+    service = InterestService(uow, InterestCatalog())
+    app.dependency_overrides[get_interest_service] = lambda: service
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.get("/api/interests/")
+            etag = response.headers["etag"]
+            assert response.status_code == 200
+
+            cached = await client.get(
+                "/api/interests/", headers={"If-None-Match": f'"other", W/{etag}'}
+            )
+            assert cached.status_code == 304
+            assert cached.content == b""
+
+            other_language = await client.get(
+                "/api/interests/",
+                headers={"If-None-Match": etag, "Accept-Language": "ru"},
+            )
+            assert other_language.status_code == 200
+    finally:
+        del app.dependency_overrides[get_interest_service]
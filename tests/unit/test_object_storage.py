@@ -0,0 +1,119 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.utils.object_storage import S3ObjectStorageService
+
+
+@pytest.mark.asyncio
+async def test_client_is_shared_until_closed():
+    service = S3ObjectStorageService(
+        endpoint_url="http://localhost:5000",
+        access_key_id="test",
+        secret_access_key="test",
+        bucket_name="avatars",
+        max_pool_connections=4,
+    )
+
+    first = await service._get_client()
+    assert await service._get_client() is first
+    assert first.meta.config.max_pool_connections == 4
+
+    await service.close()
+    assert await service._get_client() is not first
+    await service.close()
+
+
+@pytest.mark.asyncio
+async def test_avatar_url_is_presigned_locally_and_cached_per_version():
+    service = S3ObjectStorageService(
+        endpoint_url="http://localhost:5000",
+        access_key_id="test",
+        secret_access_key="test",
+        bucket_name="avatars",
+    )
+    s3 = MagicMock(
+        generate_presigned_url=AsyncMock(side_effect=["url-v1", "url-v2"]),
+        head_object=AsyncMock(),
+    )
+    service._client = s3
+    profile_id = uuid4()
+
+    assert await service.get_avatar_url(profile_id, None) is None
+    assert await service.get_avatar_url(profile_id, 1) == "url-v1"
+    assert await service.get_avatar_url(profile_id, 1) == "url-v1"
+    assert await service.get_avatar_url(profile_id, 2) == "url-v2"
+
+    assert s3.generate_presigned_url.await_count == 2
+    s3.head_object.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_list_avatars_only_touches_requested_profiles():
+    service = S3ObjectStorageService(
+        endpoint_url="http://localhost:5000",
+        access_key_id="test",
+        secret_access_key="test",
+        bucket_name="avatars",
+    )
+    s3 = MagicMock(
+        generate_presigned_url=AsyncMock(side_effect=lambda *a, **kw: "url"),
+        list_objects_v2=AsyncMock(),
+    )
+    service._client = s3
+    with_avatar, without_avatar = uuid4(), uuid4()
+
+    urls = await service.list_avatars({with_avatar: 3, without_avatar: None})
+
+    assert urls == {with_avatar: "url", without_avatar: None}
+    s3.list_objects_v2.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_local_backend_serves_signed_urls(local_storage):
+    profile_id = uuid4()
+    await local_storage.upload_avatar(profile_id, {"256.webp": (b"webp", "image/webp")})
+    (local_storage.root / "users" / f"{profile_id}.jpg").write_bytes(b"legacy")
+
+    url = await local_storage.get_avatar_url(profile_id, 1)
+    assert url.startswith(f"/api/storage/users/{profile_id}/256.webp?")
+    assert [ids async for ids in local_storage.iter_avatar_profile_ids()] == [
+        [profile_id]
+    ]
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.content == b"webp"
+
+        query = parse_qs(urlsplit(url).query)
+        forged = await client.get(
+            f"/api/storage/users/{profile_id}.jpg",
+            params={"expires": query["expires"][0], "signature": "0" * 64},
+        )
+        assert forged.status_code == 404
+
+        await local_storage.delete_avatar(profile_id)
+        assert (await client.get(url)).status_code == 404
+
+    assert not any(local_storage.root.rglob("*.*"))
+
+
+@pytest.mark.asyncio
+async def test_local_backend_concurrent_writes_of_same_key(local_storage):
+    await asyncio.gather(
+        *(
+            local_storage._put_object("users/same.webp", bytes([i]) * 1024, "", {})
+            for i in range(20)
+        )
+    )
+
+    files = [path.name for path in local_storage.root.rglob("*") if path.is_file()]
+    assert files == ["same.webp"]
@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+
+from app.core.exceptions.base import InvalidCursorError
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at, id = datetime.now(timezone.utc), uuid4()
+
+    assert decode_cursor(encode_cursor(created_at, id)) == (created_at, id)
+
+
+def test_broken_cursor_is_rejected():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
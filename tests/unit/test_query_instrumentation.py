@@ -0,0 +1,21 @@
+from app.db.instrumentation import statement_shape, track_queries
+
+
+def test_repeated_statement_shapes_are_flagged():
+    with track_queries() as outer:
+        with track_queries() as inner:
+            for _ in range(5):
+                inner.record(
+                    "SELECT * FROM profiles WHERE profiles.id = $1::UUID", 0.001
+                )
+            inner.record("SELECT * FROM rooms WHERE rooms.id IN ($1, $2, $3)", 0.01)
+
+    assert inner.count == outer.count == 6
+    assert inner.get_repeated_shapes(5) == {
+        "SELECT * FROM profiles WHERE profiles.id = ?::UUID": 5
+    }
+    assert inner.slowest[0][0] == 0.01
+
+
+def test_in_lists_of_any_length_share_a_shape():
+    assert statement_shape("id IN ($1, $2)") == statement_shape("id IN ($1, $2, $3)")
@@ -0,0 +1,40 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from app.db.replicas import ReplicaRouter
+
+
+def make_router(replicas: int = 2) -> ReplicaRouter:
+    return ReplicaRouter(
+        [MagicMock() for _ in range(replicas)],
+        health_check_interval=10,
+        max_lag=5,
+        read_your_writes_seconds=5,
+    )
+
+
+def test_round_robin_skips_unhealthy_replicas():
+    router = make_router(3)
+    first, second, third = router._session_makers
+
+    assert [router.get_session_maker() for _ in range(3)] == [first, second, third]
+
+    router._healthy[1] = False
+    assert [router.get_session_maker() for _ in range(3)] == [first, third, first]
+
+    router._healthy = [False, False, False]
+    assert router.get_session_maker() is None
+
+
+def test_reads_go_to_primary_after_write_in_same_context():
+    router = make_router()
+
+    async def request_with_write():
+        router.mark_write()
+        return router.get_session_maker()
+
+    async def request_without_write():
+        return router.get_session_maker()
+
+    assert asyncio.run(request_with_write()) is None
+    assert asyncio.run(request_without_write()) is not None
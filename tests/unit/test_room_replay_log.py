@@ -0,0 +1,25 @@
+from uuid import uuid4
+
+from app.api.websockets.room_replay_log import RoomReplayLog
+
+
+def test_since_returns_only_missed_events():
+    log = RoomReplayLog(max_events=10)
+    room_id = uuid4()
+    seqs = [log.record(room_id, {"type": "message_sent"}) for _ in range(3)]
+
+    missed = log.since(room_id, seqs[0])
+
+    assert [event["seq"] for event in missed] == seqs[1:]
+    assert log.since(room_id, seqs[-1]) == []
+
+
+def test_since_requires_resync_when_gap_exceeds_buffer():
+    log = RoomReplayLog(max_events=2)
+    room_id = uuid4()
+    seqs = [log.record(room_id, {"type": "message_sent"}) for _ in range(5)]
+
+    assert log.since(room_id, seqs[0]) is None
+    assert [event["seq"] for event in log.since(room_id, seqs[2])] == seqs[3:]
+    assert log.since(room_id, seqs[-1] + 1) is None
+    assert log.since(uuid4(), 0) is None
@@ -0,0 +1,88 @@
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import jwt
+import pytest
+
+from app.core import auth
+from app.core.auth import create_tokens, decode_jwt, revoke_user_tokens
+from app.core.exceptions.auth import InvalidTokenError
+from app.core.exceptions.profile import ProfilePermissionError
+from app.services.profile import ProfileService
+
+
+@pytest.fixture(autouse=True)
+def token_cache():
+    cache = auth.VerifiedTokenCache(max_size=2, revocation_ttl=3600)
+    with patch.object(auth, "verified_token_cache", cache):
+        yield cache
+
+
+def test_repeated_decode_skips_signature_check(token_cache):
+    tokens = create_tokens(uuid4(), uuid4())
+
+    with patch.object(jwt, "decode", wraps=jwt.decode) as jwt_decode:
+        first = decode_jwt(tokens.access_token)
+        second = decode_jwt(tokens.access_token)
+        decode_jwt(tokens.refresh_token)
+        decode_jwt(tokens.refresh_token)
+
+    assert first == second
+    assert jwt_decode.call_count == 3
+    assert token_cache.get_stats()["hits"] == 1
+
+
+def test_cached_token_expires_at_exp(token_cache):
+    token = create_tokens(uuid4()).access_token
+    exp = decode_jwt(token)["exp"]
+
+    with patch("time.time", return_value=exp):
+        assert token_cache.get(auth._token_digest(token)) is None
+    assert token_cache.get_stats()["size"] == 0
+
+
+def test_revoked_user_tokens_are_rejected(token_cache):
+    user_id = uuid4()
+    tokens = create_tokens(user_id)
+    decode_jwt(tokens.access_token)
+
+    with patch("time.time", return_value=time.time() + 1):
+        revoke_user_tokens(user_id)
+
+    assert token_cache.get_stats()["size"] == 0
+    for token in (tokens.access_token, tokens.refresh_token):
+        with pytest.raises(InvalidTokenError):
+            decode_jwt(token)
+    decode_jwt(create_tokens(uuid4()).access_token)
+
+
+def test_token_issued_right_after_revocation_is_accepted(token_cache):
+    user_id = uuid4()
+
+    revoke_user_tokens(user_id)
+    tokens = create_tokens(user_id)
+
+    assert decode_jwt(tokens.access_token)["sub"] == str(user_id)
+    assert decode_jwt(tokens.refresh_token)["sub"] == str(user_id)
+
+
+@pytest.mark.asyncio
+async def test_profile_ownership_is_checked_against_database_once():
+    user_id, profile_id = uuid4(), uuid4()
+    cache = auth.ProfileOwnershipCache(max_size=10, ttl_seconds=60)
+    mock_uow = AsyncMock()
+    mock_uow.__aenter__.return_value = mock_uow
+    mock_uow.profile.get_by_id = AsyncMock(return_value=MagicMock(user_id=user_id))
+    service = ProfileService(mock_uow, MagicMock())
+
+    with patch("app.services.profile.profile_ownership_cache", cache):
+        await service.validate_profile_ownership(profile_id, user_id)
+        await service.validate_profile_ownership(profile_id, user_id)
+        with pytest.raises(ProfilePermissionError):
+            await service.validate_profile_ownership(profile_id, uuid4())
+
+        cache.invalidate_user(user_id)
+        await service.validate_profile_ownership(profile_id, user_id)
+
+    assert mock_uow.profile.get_by_id.await_count == 2
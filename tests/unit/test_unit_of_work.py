@@ -0,0 +1,62 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.db.unit_of_work import UnitOfWork
+from app.repositories import ProfileRepository
+
+
+@pytest.mark.asyncio
+async def test_repositories_are_created_on_first_access():
+    uow = UnitOfWork()
+    session = MagicMock(close=AsyncMock())
+    uow.session_maker = MagicMock(return_value=session)
+
+    async with uow:
+        assert "profile" not in uow.__dict__
+        profile_repository = uow.profile
+        assert isinstance(profile_repository, ProfileRepository)
+        assert profile_repository.session is session
+        assert uow.profile is profile_repository
+        assert "room" not in uow.__dict__
+
+    assert "profile" not in uow.__dict__
+    with pytest.raises(RuntimeError):
+        uow.profile
+
+
+@pytest.mark.asyncio
+async def test_read_only_unit_of_work_cannot_commit():
+    uow = UnitOfWork(read_only=True)
+    session = MagicMock(close=AsyncMock(), commit=AsyncMock())
+    uow.session_maker = MagicMock(return_value=session)
+
+    async with uow:
+        with pytest.raises(RuntimeError):
+            await uow.commit()
+
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_gather_reads_runs_reads_concurrently_in_separate_units(mocker):
+    mocker.patch(
+        "app.db.unit_of_work.read_only_session_maker",
+        side_effect=lambda: MagicMock(close=AsyncMock()),
+    )
+    running, sessions = [], []
+
+    async def read(uow, value):
+        running.append(value)
+        sessions.append(uow.session)
+        await asyncio.sleep(0)
+        assert len(running) == 2
+        return value
+
+    result = await UnitOfWork().gather_reads(
+        lambda uow: read(uow, "first"), lambda uow: read(uow, "second")
+    )
+
+    assert result == ("first", "second")
+    assert sessions[0] is not sessions[1]
@@ -0,0 +1,79 @@
+from io import BytesIO
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, Request, UploadFile
+from httpx import ASGITransport, AsyncClient
+from starlette.datastructures import Headers
+
+from app.core.exceptions.file import FileTooLargeError
+from app.core.exceptions.profile import ProfilePermissionError
+from app.core.middleware import UploadSizeLimitMiddleware
+from app.services.profile import ProfileService
+from app.utils.image_processing import avatar_processor
+from app.utils.upload import spool_upload
+
+
+@pytest.mark.asyncio
+async def test_spool_upload_reads_in_chunks_and_enforces_limit():
+    upload = UploadFile(BytesIO(b"x" * 100))
+
+    async with spool_upload(upload, max_size=100, chunk_size=16) as file_path:
+        with open(file_path, "rb") as spooled:
+            assert spooled.read() == b"x" * 100
+
+    await upload.seek(0)
+    with pytest.raises(FileTooLargeError):
+        async with spool_upload(upload, max_size=99, chunk_size=16):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_upload_size_limit_rejects_oversized_bodies():
+    app = FastAPI()
+    app.add_middleware(
+        UploadSizeLimitMiddleware, max_body_size=10, path_suffix="/avatar"
+    )
+    body_read = False
+
+    @app.post("/me/avatar")
+    async def upload(request: Request):
+        nonlocal body_read
+        await request.body()
+        body_read = True
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post("/me/avatar", content=b"x" * 11)
+        assert response.status_code == 413
+
+        async def chunks():
+            for _ in range(3):
+                yield b"xxxxx"
+
+        response = await client.post("/me/avatar", content=chunks())
+        assert response.status_code == 413
+
+    assert not body_read
+
+
+@pytest.mark.asyncio
+async def test_avatar_for_foreign_profile_is_rejected_before_processing(mocker):
+    read_uow = AsyncMock()
+    read_uow.__aenter__.return_value = read_uow
+    read_uow.profile.find_one = AsyncMock(
+        return_value=MagicMock(id=uuid4(), user_id=uuid4())
+    )
+    uow = MagicMock()
+    uow.for_reading.return_value = read_uow
+    process = mocker.patch.object(avatar_processor, "process", AsyncMock())
+    service = ProfileService(uow, MagicMock())
+    upload = UploadFile(BytesIO(b"x"), headers=Headers({"content-type": "image/png"}))
+
+    with pytest.raises(ProfilePermissionError):
+        await service.upload_avatar(upload, username="someone", user_id=uuid4())
+
+    process.assert_not_called()
+    uow.__aenter__.assert_not_called()
@@ -1,8 +1,13 @@
+import asyncio
+from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
 
 import pytest
 
-from app.schemas.user import UserCreate
+from app.core.exceptions.auth import PasswordHasherBusyError
+from app.core.security import PasswordHasher
+from app.schemas.user import UserCreate, UserLogin
 from app.services.user import UserService
 
 
@@ -15,3 +20,53 @@ async def test_create_user_already_exists():
     with pytest.raises(Exception) as exc_info:
         await service.create_user(user_create)
     assert "already exists" in str(exc_info.value)
+
+
+def make_hasher(time_cost: int, max_queue: int = 4) -> PasswordHasher:
+    return PasswordHasher(
+        workers=1,
+        max_queue=max_queue,
+        time_cost=time_cost,
+        memory_cost=64,
+        parallelism=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_authenticate_user_rehashes_outdated_password(monkeypatch):
+    old_hash = await make_hasher(time_cost=1).hash("StrongP@ss123")
+    monkeypatch.setattr("app.services.user.password_hasher", make_hasher(time_cost=2))
+
+    mock_uow = AsyncMock()
+    mock_uow.__aenter__.return_value = mock_uow
+    mock_uow.user.find_one = AsyncMock(
+        return_value=MagicMock(
+            id=uuid4(),
+            email="test@example.com",
+            password_hash=old_hash,
+            created_at=datetime.now(timezone.utc),
+            updated_at=datetime.now(timezone.utc),
+        )
+    )
+    service = UserService(mock_uow)
+
+    await service.authenticate_user(
+        UserLogin(email="test@example.com", password="StrongP@ss123")
+    )
+
+    new_hash = mock_uow.user.update.await_args.args[1]["password_hash"]
+    assert new_hash != old_hash and "t=2" in new_hash
+    mock_uow.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_queue_is_full():
+    hasher = make_hasher(time_cost=1, max_queue=0)
+
+    results = await asyncio.gather(
+        hasher.hash("first"), hasher.hash("second"), return_exceptions=True
+    )
+
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], PasswordHasherBusyError)
+    assert hasher.get_stats() == {"pending": 0, "rejected": 1}
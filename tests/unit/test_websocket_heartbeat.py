@@ -0,0 +1,43 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.api.websockets.heartbeat import WebSocketHeartbeat
+
+
+@pytest.mark.asyncio
+async def test_sweep_pings_idle_and_reaps_dead_connections():
+    heartbeat = WebSocketHeartbeat(ping_interval=30, idle_timeout=120, slots=1)
+    idle_ws, dead_ws = AsyncMock(), AsyncMock()
+    idle_ping, dead_ping = AsyncMock(), AsyncMock()
+    reaped = asyncio.Event()
+
+    async def handler(websocket, send_ping):
+        heartbeat.register(websocket, send_ping)
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            if not heartbeat.consume_reaped(websocket):
+                raise
+            reaped.set()
+        finally:
+            heartbeat.unregister(websocket)
+
+    idle_task = asyncio.create_task(handler(idle_ws, idle_ping))
+    dead_task = asyncio.create_task(handler(dead_ws, dead_ping))
+    await asyncio.sleep(0)
+
+    heartbeat._entries[id(idle_ws)].last_seen -= 60
+    heartbeat._entries[id(dead_ws)].last_seen -= 600
+
+    assert await heartbeat.sweep() == 1
+    await asyncio.wait_for(reaped.wait(), timeout=1)
+
+    idle_ping.assert_awaited_once()
+    dead_ping.assert_not_awaited()
+    dead_ws.close.assert_awaited_once()
+    assert heartbeat.get_stats() == {"connections": 1, "reaped_total": 1}
+
+    idle_task.cancel()
+    await asyncio.gather(idle_task, dead_task, return_exceptions=True)
@@ -0,0 +1,91 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+import pytest
+
+from app.db.unit_of_work import UnitOfWork, outbox_ready
+from app.utils.websocket_outbox import WebSocketOutboxDispatcher
+
+
+class FakeBroadcaster:
+    def __init__(self):
+        self.calls = []
+
+    async def broadcast_something(
+        self, room_id: UUID, data: dict, expires_at: datetime, actor_id: UUID = None
+    ):
+        self.calls.append((room_id, data, expires_at, actor_id))
+
+
+@pytest.mark.asyncio
+async def test_published_event_is_delivered_with_original_types():
+    uow = UnitOfWork()
+    session = MagicMock(close=AsyncMock(), commit=AsyncMock())
+    uow.session_maker = MagicMock(return_value=session)
+    room_id, expires_at = uuid4(), datetime.now(timezone.utc)
+
+    outbox = MagicMock(add_one=AsyncMock())
+
+    outbox_ready.clear()
+    async with uow:
+        uow.websocket_outbox = outbox
+        await uow.publish(
+            "fake", "broadcast_something", room_id, {"id": room_id}, expires_at
+        )
+        assert not outbox_ready.is_set()
+        await uow.commit()
+
+    assert outbox_ready.is_set()
+    row = outbox.add_one.await_args.args[0]
+    assert row["payload"]["args"][0] == str(room_id)
+
+    dispatcher = WebSocketOutboxDispatcher(
+        batch_size=10,
+        poll_interval=1,
+        max_attempts=3,
+        retention_seconds=60,
+        lag_warning_ms=1000,
+    )
+    broadcaster = FakeBroadcaster()
+    dispatcher.targets = {"fake": broadcaster}
+    await dispatcher._deliver(MagicMock(**row))
+
+    assert broadcaster.calls == [(room_id, {"id": str(room_id)}, expires_at, None)]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_delivered_outside_claim_transaction(mocker):
+    open_units = []
+
+    class FakeUnitOfWork:
+        async def __aenter__(self):
+            open_units.append(self)
+            self.websocket_outbox = MagicMock(
+                claim_pending=AsyncMock(
+                    return_value=[MagicMock(created_at=datetime.now(timezone.utc))]
+                ),
+                mark_dispatched=AsyncMock(),
+                mark_failed=AsyncMock(),
+            )
+            self.commit = AsyncMock()
+            return self
+
+        async def __aexit__(self, *exc_info):
+            open_units.remove(self)
+
+    async def deliver(event):
+        assert not open_units
+
+    mocker.patch("app.utils.websocket_outbox.UnitOfWork", FakeUnitOfWork)
+    dispatcher = WebSocketOutboxDispatcher(
+        batch_size=10,
+        poll_interval=1,
+        max_attempts=3,
+        retention_seconds=60,
+        lag_warning_ms=1000,
+    )
+    mocker.patch.object(dispatcher, "_deliver", deliver)
+
+    assert await dispatcher.dispatch_batch() == 1
+    assert dispatcher.get_stats()["dispatched"] == 1
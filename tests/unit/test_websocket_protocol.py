@@ -0,0 +1,87 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
+
+import msgpack
+import pytest
+
+from app.api.websockets.protocol import (
+    MSGPACK_SUBPROTOCOL,
+    BroadcastMessage,
+    JsonCodec,
+    MessagePackCodec,
+    negotiate_protocol,
+)
+from app.core.websocket.room_events import RoomEventType, RoomWebSocketMessage
+
+
+def make_message_sent_event() -> dict:
+    room_id, profile_id = uuid4(), uuid4()
+    return RoomWebSocketMessage(
+        type=RoomEventType.MESSAGE_SENT,
+        data={
+            "room_id": str(room_id),
+            "sender_profile_id": str(profile_id),
+            "message": {
+                "id": str(uuid4()),
+                "room_id": str(room_id),
+                "profile_id": str(profile_id),
+                "content": "Привет!",
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            },
+        },
+        timestamp=datetime.now(timezone.utc),
+        room_id=room_id,
+        sender_profile_id=profile_id,
+        seq=1,
+    ).to_dict()
+
+
+def test_msgpack_event_is_compact_and_lossless():
+    event = make_message_sent_event()
+
+    packed = MessagePackCodec().encode(event)
+    assert len(packed) < len(JsonCodec().encode(event)) * 0.7
+
+    decoded = msgpack.unpackb(packed, timestamp=3)
+    assert set(decoded) == {"t", "d", "ts", "q"}
+    assert decoded["t"] == "message_sent"
+    assert UUID(bytes=decoded["d"]["room_id"]) == UUID(event["room_id"])
+    assert decoded["d"]["message"]["content"] == "Привет!"
+    assert decoded["ts"] == datetime.fromisoformat(event["timestamp"])
+
+
+@pytest.mark.asyncio
+async def test_broadcast_payload_is_encoded_once(mocker):
+    packb = mocker.spy(msgpack, "packb")
+    event = make_message_sent_event()
+    sockets = []
+
+    for _ in range(3):
+        websocket = MagicMock(scope={"subprotocols": [MSGPACK_SUBPROTOCOL]})
+        websocket.send_bytes = AsyncMock()
+        sockets.append(negotiate_protocol(websocket))
+
+    envelope = BroadcastMessage(event)
+    for websocket in sockets:
+        await websocket.send_json(envelope)
+
+    assert packb.call_count == 1
+    for websocket in sockets:
+        websocket.websocket.send_bytes.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_mutated_message_is_encoded_again():
+    websocket = MagicMock(scope={"subprotocols": []})
+    websocket.send_text = AsyncMock()
+    event_websocket = negotiate_protocol(websocket)
+    event = {"type": "typing", "data": {"is_typing": True}}
+
+    await event_websocket.send_json(event)
+    event["data"]["is_typing"] = False
+    await event_websocket.send_json(event)
+
+    first, second = (call.args[0] for call in websocket.send_text.await_args_list)
+    assert '"is_typing":true' in first
+    assert '"is_typing":false' in second